@@ -28,6 +28,8 @@ class Controller:
         self.view = None
 
         self.running = True
+        # Wakes up the main program loop when there is something to do (encoder recording started, exit)
+        self.wakeup = threading.Event()
 
         self.lock_view = threading.Lock()
         self.thread_gui = threading.Thread(target=self.run_gui, daemon=True)
@@ -119,6 +121,7 @@ class Controller:
         This is executed when the user confirms the exit dialog.
         """
         self.running = False
+        self.wakeup.set()
 
     def clear_decoder(self):
         """
@@ -126,7 +129,7 @@ class Controller:
         This is called when the user presses on the Clear button.
         """
         self.view.decoder_clear()
-        self.model.decoder.clear()
+        self.model.clear_decoder()
 
     def clear_encoder_recording(self):
         """
@@ -270,14 +273,16 @@ class Controller:
     def run(self, sleep_time):
         """
         Main progam loop.
+        The decoder runs in its own worker thread (see Models/DecodeWorker.py), so only the encoder is updated here.
+        While the encoder is not recording, the loop waits until it is woken up instead of polling.
         :param sleep_time: Sleep time in seconds, this is necessary in order for the GUI not to freeze and crash at some point.
         """
-        if self.model.is_decoder_active():
-            self.model.decoder.decode()
-
         if self.model.is_encoder_recording():
             self.model.encoder.update_datalines()
-        time.sleep(sleep_time)
+            time.sleep(sleep_time)
+        else:
+            self.wakeup.wait()
+            self.wakeup.clear()
 
     def run_gui(self):
         """
@@ -352,6 +357,7 @@ class Controller:
         self.clear_encoder_recording()
 
         self.model.encoder.set_recording(True)
+        self.wakeup.set()
         self.view.encoder_started_recording()
 
     def stop_decoder(self):
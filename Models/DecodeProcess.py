@@ -0,0 +1,273 @@
+import multiprocessing
+import pickle
+import numpy as np
+
+from Utils import Logging
+from Utils.SharedArrays import SharedArrayReader, SharedArrayWriter, SharedTimeSeriesStore
+
+# Attributes of the decoder that only exist in the main process (hardware, files, callbacks) with their values in the
+# decode process, the parameters are only used by the dialogs (and may contain conversion functions)
+PARENT_ONLY = {
+    'data_available': None,
+    'decoded': None,
+    'journaling': False,
+    'journals': list,
+    'parameters': None,
+    'publishers': dict,
+    'pyramids': list,
+    'received': None,
+    'receivers': list,
+    'spill_sink': None,
+    'stores': list,
+    'timestamps': None
+}
+
+# Symbol streams that are sent back as the part that changed since the last step
+SYMBOL_STREAMS = ['symbol_intervals', 'symbol_values', 'sequence']
+
+
+def export_result(writer, decoder, key, result):
+    """
+    Prepares a result (additional dataline or landmark) of the decode process for the main process.
+    Arrays and lists are written to shared memory, timestamps of a receiver are referenced (they are shared already).
+    :param writer: Shared array writer.
+    :param decoder: Decoder.
+    :param key: Key of the result (or of the part of the result).
+    :param result: Result.
+    :return: Exported result for import_result.
+    """
+    if isinstance(result, dict):
+        return {'dict': {name: export_result(writer, decoder, key + (name,), value) for name, value in result.items()}}
+    if isinstance(result, np.ndarray):
+        for receiver_index, timestamps in enumerate(decoder.timestamps):
+            if timestamps is not None and result.ndim == 1 and len(result) <= len(timestamps) \
+                    and result.__array_interface__['data'][0] == timestamps.__array_interface__['data'][0] \
+                    and result.strides == timestamps.strides:
+                return {'timestamps': receiver_index, 'length': len(result)}
+    if isinstance(result, (np.ndarray, list)):
+        array = np.asarray(result)
+        if array.dtype != object:
+            return {'array': writer.write(key, array)}
+    return {'object': result}
+
+
+def import_result(reader, decoder, exported):
+    """
+    Restores a result of the decode process in the main process.
+    Arrays are copied out of shared memory, because the decode process overwrites the block in a later step while the
+    views (or pyqtgraph) may still use the result. Timestamps of a receiver are referenced, they are only appended to.
+    :param reader: Shared array reader.
+    :param decoder: Decoder.
+    :param exported: Exported result (see export_result).
+    :return: Result.
+    """
+    if 'dict' in exported:
+        return {name: import_result(reader, decoder, value) for name, value in exported['dict'].items()}
+    if 'timestamps' in exported:
+        return decoder.stores[exported['timestamps']].timestamps[:exported['length']]
+    if 'array' in exported:
+        return reader.read(exported['array']).copy()
+    return exported['object']
+
+
+def run(decoder_class, state, connection):
+    """
+    Main loop of the decode process.
+    :param decoder_class: Class of the decoder.
+    :param state: Pickled attributes of the decoder (without PARENT_ONLY).
+    :param connection: Connection to the main process.
+    """
+    decoder = decoder_class.__new__(decoder_class)
+    decoder.__dict__.update(pickle.loads(state))
+    decoder.__dict__.update({name: value() if callable(value) else value for name, value in PARENT_ONLY.items()})
+    decoder.received = [None] * decoder.num_receivers
+    decoder.timestamps = [None] * decoder.num_receivers
+
+    reader = SharedArrayReader()
+    writer = SharedArrayWriter()
+    store_names = [None] * decoder.num_receivers
+    sent = {name: 0 for name in SYMBOL_STREAMS}
+    sources = {name: None for name in SYMBOL_STREAMS}
+
+    while True:
+        command, data = connection.recv()
+        if command == 'decode':
+            try:
+                reply = step(decoder, data, reader, writer, store_names, sent, sources)
+            except Exception as e:
+                reply = {'error': f"{type(e).__name__}: {e}"}
+            connection.send(reply)
+        elif command == 'clear':
+            decoder.clear()
+            decoder.received = [None] * decoder.num_receivers
+            decoder.timestamps = [None] * decoder.num_receivers
+            sent = {name: 0 for name in SYMBOL_STREAMS}
+            sources = {name: None for name in SYMBOL_STREAMS}
+            connection.send(None)
+        else:
+            writer.close()
+            reader.close()
+            connection.send(None)
+            break
+
+
+def step(decoder, data, reader, writer, store_names, sent, sources):
+    """
+    Runs the stages of the decode pipeline on the shared received values.
+    :param decoder: Decoder.
+    :param data: Descriptors of the receiver stores.
+    :param reader: Shared array reader.
+    :param writer: Shared array writer.
+    :param store_names: Names of the currently mapped receiver stores.
+    :param sent: Lengths of the symbol streams that were already sent.
+    :param sources: Symbol streams that were sent last (to detect replaced streams).
+    :return: Results that changed.
+    """
+    for receiver_index, descriptor in enumerate(data['received']):
+        if store_names[receiver_index] != descriptor['name']:
+            reader.release([store_names[receiver_index]])
+            store_names[receiver_index] = descriptor['name']
+        decoder.timestamps[receiver_index], decoder.received[receiver_index] = reader.read_store(descriptor)
+        decoder.lengths[receiver_index] = descriptor['length']
+        decoder.offsets[receiver_index] = descriptor['offset']
+    decoder.min_timestamp, decoder.max_timestamp = data['min_timestamp'], data['max_timestamp']
+
+    generations = {name: value.copy() if isinstance(value, list) else value for name, value in decoder.generations.items()}
+    decoder.run_stages()
+
+    results = []
+    for name in ['additional_datalines', 'landmarks']:
+        for index, result in enumerate(getattr(decoder, name)):
+            if decoder.generations[name][index] != generations[name][index]:
+                results.append((name, index, export_result(writer, decoder, (name, index), result)))
+
+    symbol_streams = {}
+    for name in SYMBOL_STREAMS:
+        if decoder.generations[name] != generations[name]:
+            stream = getattr(decoder, name)
+            # Streams are only appended to, if one was replaced or rewritten in place (touched), it is sent completely
+            replaced = not isinstance(stream, str) and stream is not sources[name]
+            appended = not replaced and name not in decoder.touched and len(stream) >= sent[name]
+            start = sent[name] if appended else 0
+            symbol_streams[name] = (start, stream[start:])
+            sent[name] = len(stream)
+            sources[name] = stream
+    decoder.touched = set()
+
+    return {'results': results, 'symbol_streams': symbol_streams, 'released': writer.pop_released()}
+
+
+class DecodeProcess:
+    """
+    Runs the stages of the decode pipeline of a decoder in a separate process, so heavy signal processing does not
+    compete with the receiver threads and the GUI for the GIL.
+    The receivers stay in the main process, their values are stored in shared memory (SharedTimeSeriesStore) that the
+    decode process maps without copying. The decode process works on a copy of the decoder (without the PARENT_ONLY
+    attributes), additional datalines and landmarks that changed are returned in shared memory as well (the main
+    process copies them, see import_result), symbol streams are returned as the part that changed.
+    """
+    def __init__(self, decoder):
+        """
+        Initializes the decode process.
+        :param decoder: Decoder, all other attributes must be picklable.
+        """
+        self.decoder = decoder
+        self.connection = None
+        self.process = None
+        self.reader = SharedArrayReader()
+
+    def apply(self, reply):
+        """
+        Applies the results of a step of the decode process to the decoder.
+        :param reply: Reply of the decode process.
+        """
+        if 'error' in reply:
+            Logging.error(f"Decode step failed: {reply['error']}", repeat=False)
+            return
+
+        decoder = self.decoder
+        for name, index, exported in reply['results']:
+            getattr(decoder, name)[index] = import_result(self.reader, decoder, exported)
+            decoder.generations[name][index] = decoder.next_generation()
+        for name, (start, part) in reply['symbol_streams'].items():
+            stream = getattr(decoder, name)
+            if name == 'sequence' or start < len(stream):
+                # A new object, so snapshots of the old one stay valid (see ListPublisher)
+                setattr(decoder, name, stream[:start] + part)
+            else:
+                stream.extend(part)
+            decoder.generations[name] = decoder.next_generation()
+        decoder.interval_index.update(decoder.symbol_intervals, decoder.timestamps, decoder.received, decoder.lengths, decoder.offsets)
+        self.reader.release(reply['released'])
+
+    def clear(self):
+        """
+        Clears the copy of the decoder in the decode process.
+        """
+        self.connection.send(('clear', None))
+        self.connection.recv()
+
+    def parameters_edited(self, parameter_values):
+        """
+        Edits the parameters of the decoder in the main process and restarts the decode process with the edited
+        decoder, because the parameters may replace the receivers and their stores (see DecoderInterface.setup).
+        :param parameter_values: User-defined parameter values.
+        """
+        self.stop()
+        # The shared memory blocks are released as soon as the stores are replaced (or copied by start)
+        for store in self.decoder.stores:
+            store.retire()
+        self.decoder.parameters_edited(parameter_values)
+        self.start()
+
+    def decode(self):
+        """
+        Performs a decode step: the receiver buffers are emptied in the main process, the stages run in the decode
+        process. The calling thread waits for the decode process without holding the GIL.
+        """
+        decoder = self.decoder
+        decoder.empty_receiver_buffers()
+        self.connection.send(('decode', {
+            'received': [store.describe() for store in decoder.stores],
+            'min_timestamp': decoder.min_timestamp,
+            'max_timestamp': decoder.max_timestamp
+        }))
+        self.apply(self.connection.recv())
+
+    def start(self):
+        """
+        Moves the received values of the decoder to shared memory and starts the decode process.
+        """
+        decoder = self.decoder
+        state = pickle.dumps({name: value for name, value in decoder.__dict__.items() if name not in PARENT_ONLY})
+
+        for receiver_index, store in enumerate(decoder.stores):
+            shared_store = SharedTimeSeriesStore(store.chunk_length, store.num_columns)
+            if store.length > 0:
+                shared_store.extend(store.timestamps, store.values)
+            shared_store.offset = store.offset
+            decoder.stores[receiver_index] = shared_store
+            decoder.update_received(receiver_index)
+
+        # Spawn (instead of fork) to not copy the threads of the GUI and the receivers
+        context = multiprocessing.get_context('spawn')
+        self.connection, connection = context.Pipe()
+        self.process = context.Process(target=run, args=(type(decoder), state, connection), daemon=True)
+        self.process.start()
+
+    def stop(self):
+        """
+        Stops the decode process, the results stay available in the decoder.
+        """
+        if self.process is None:
+            return
+        try:
+            self.connection.send(('stop', None))
+            self.connection.recv()
+        except (EOFError, OSError):
+            pass
+        self.process.join(timeout=1.0)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process = None
+        self.connection = None
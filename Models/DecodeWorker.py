@@ -0,0 +1,128 @@
+import threading
+import time
+
+from Utils import Logging
+
+# Maximum time (in seconds) between two decode steps while no new values arrive
+IDLE_DECODE_INTERVAL = 0.1
+
+
+class DecodeWorker:
+    """
+    Runs the decode pipeline of a decoder in its own (daemon) thread, independent of the frame rate of the GUI.
+    The worker sleeps until a receiver signals new values (see DecoderInterface.data_available), values that arrive
+    in quick succession are decoded together, at most updates_per_second times per second.
+    After every decode step, the decoder values (see DecoderInterface.get_decoded) are published as a snapshot.
+    The snapshot is handed off by replacing a single reference, so readers (e.g. the views) never wait for a running
+    decode step and always get the latest finished result.
+    Everything else that modifies the decoder while the worker is running (e.g. clearing) must hold the lock.
+    Optionally, the stages of the decode pipeline run in a separate process (see DecodeProcess).
+    """
+    def __init__(self, decoder, updates_per_second, time_budget, process=None):
+        """
+        Initializes the worker.
+        :param decoder: Decoder.
+        :param updates_per_second: Maximum number of decode steps per second.
+        :param time_budget: Time (in seconds) a decode step may take, longer steps are reported.
+        :param process: Decode process, None to run the stages in the worker thread.
+        """
+        self.decoder = decoder
+        self.process = process
+        self.period = 1.0 / updates_per_second
+        self.time_budget = time_budget
+
+        self.lock = threading.Lock()
+        self.running = False
+        self.snapshot = None
+        self.thread = None
+
+    def clear(self):
+        """
+        Clears the decoder (and the decode process), a running decode step is finished first.
+        """
+        with self.lock:
+            self.decoder.clear()
+            if self.process is not None:
+                self.process.clear()
+            self.publish()
+
+    def get_snapshot(self):
+        """
+        Gets the values of the last finished decode step.
+        :return: Decoder values, None if there was no decode step yet.
+        """
+        return self.snapshot
+
+    def parameters_edited(self, parameter_values):
+        """
+        Edits the parameters of the decoder (and of the decoder in the decode process), a running decode step is
+        finished first.
+        :param parameter_values: User-defined parameter values.
+        """
+        with self.lock:
+            if self.process is not None:
+                self.process.parameters_edited(parameter_values)
+            else:
+                self.decoder.parameters_edited(parameter_values)
+            self.publish()
+
+    def publish(self):
+        """
+        Publishes the current values of the decoder.
+        Must be called while holding the lock.
+        """
+        self.snapshot = self.decoder.get_decoded()
+
+    def run(self):
+        """
+        Main loop of the worker, decodes whenever new values arrive until the worker is stopped.
+        """
+        data_available = self.decoder.data_available
+        next_time = time.time()
+        while self.running:
+            # Decode at least every IDLE_DECODE_INTERVAL seconds, e.g. for symbol intervals that depend on the time
+            data_available.wait(IDLE_DECODE_INTERVAL)
+            # Keep the maximum rate, values that arrive in the meantime are decoded in the same step
+            time.sleep(max(next_time - time.time(), 0))
+            data_available.clear()
+            if not self.running:
+                break
+
+            start_time = time.time()
+            with self.lock:
+                try:
+                    if self.process is not None:
+                        self.process.decode()
+                    else:
+                        self.decoder.decode()
+                    self.publish()
+                except Exception as e:
+                    Logging.error(f"Decode step failed: {e}", repeat=False)
+            elapsed_time = time.time() - start_time
+            if elapsed_time > self.time_budget:
+                Logging.warning(f"Decode step took {elapsed_time * 1000:.0f} ms, which exceeds the time budget of {self.time_budget * 1000:.0f} ms.", repeat=False)
+
+            next_time = start_time + self.period
+
+    def start(self):
+        """
+        Starts the worker thread (and the decode process).
+        """
+        if self.process is not None:
+            self.process.start()
+        self.running = True
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """
+        Stops the worker thread (and the decode process) and waits until the current decode step has finished.
+        """
+        self.running = False
+        # Wake up the worker thread
+        self.decoder.data_available.set()
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join()
+        self.thread = None
+        if self.process is not None:
+            self.process.stop()
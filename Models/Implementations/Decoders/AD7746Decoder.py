@@ -5,6 +5,7 @@ import serial.tools.list_ports
 from Models.Interfaces.DecoderInterface import DecoderInterface
 from Models.Implementations.Receivers.AD7746Receiver import AD7746Receiver
 from Utils import Logging
+from Utils.SymbolSynchronizer import SymbolSynchronizer
 
 NEGATIVE_DETECTION_THRESHOLD = True
 
@@ -57,17 +58,15 @@ class AD7746Decoder(DecoderInterface):
         #Clean up
         self.shutdown()
 
-        self.abs_detection_threshold = 0
-        self.first_symbol_edge = 0
+        self.synchronizer = SymbolSynchronizer(self.symbol_duration, self.threshold_factor,
+                                               negative=NEGATIVE_DETECTION_THRESHOLD, threshold_offset=0.5)
 
         receiver = AD7746Receiver(self.port, self.conversion_time, self.excitation_level, self.active_channel, self.diff_mode)
         self.receivers = [receiver]
         self.receiver_names = ["AD7746"]
 
     def clear(self):
-        self.abs_detection_threshold = 0
-        self.abs_variation = 0
-        self.first_symbol_edge = 0
+        self.synchronizer.clear()
         return super().clear()
 
     def decoder_started(self):
@@ -95,80 +94,31 @@ class AD7746Decoder(DecoderInterface):
         pass
 
     def calculate_symbol_intervals(self):
-        ref_threshold_length = 2 #seconds
-
-        if self.first_symbol_edge > 0:
-            next_edge = self.symbol_intervals[-1] + self.symbol_duration
-            if self.max_timestamp > next_edge:
-                self.symbol_intervals.append(next_edge)
-            
-            return
-        
-        if self.max_timestamp - self.min_timestamp < ref_threshold_length:
-            #We have to wait for enough samples
-            return
-        elif self.abs_detection_threshold == 0:
-            #Use start of transmission to determine a first peak threshold
-            quiet_stop = np.argmax(self.timestamps[0] > self.min_timestamp + ref_threshold_length)
-            
-            max_value = max(self.received[0][0:quiet_stop])
-            min_value = min(self.received[0][0:quiet_stop])
-            self.abs_variation = max_value - min_value
-
-            if NEGATIVE_DETECTION_THRESHOLD:
-                self.abs_detection_threshold = max_value - self.abs_variation*(self.threshold_factor + 0.5)
-            else:
-                self.abs_detection_threshold = min_value + self.abs_variation*(self.threshold_factor + 0.5)
-
-        else:
-            #find first threshold pass to detect first peak
-            threshold_pass = 0
-            if NEGATIVE_DETECTION_THRESHOLD:
-                threshold_pass = np.argmax(self.received[0] < self.abs_detection_threshold)
-            else:
-                threshold_pass = np.argmax(self.received[0] > self.abs_detection_threshold)
-
-            if threshold_pass > 0:
-                first_peak_end_limit = np.argmax(self.timestamps[0] > self.timestamps[0][threshold_pass] + self.symbol_duration)
-                if first_peak_end_limit > 0:
-                    first_peak = 0
-                    if NEGATIVE_DETECTION_THRESHOLD:
-                        first_peak = np.argmin(self.received[0][threshold_pass:first_peak_end_limit])
-                    else:
-                        first_peak = np.argmax(self.received[0][threshold_pass:first_peak_end_limit])
-
-                    #center first peak in first symbol interval
-                    self.first_symbol_edge = self.timestamps[0][threshold_pass+first_peak] - self.symbol_duration/2
-                    self.symbol_intervals = [self.first_symbol_edge]
+        if self.lengths[0] > 0:
+            self.symbol_intervals += self.synchronizer.update(self.timestamps[0], self.received[0][:, 0], self.offsets[0])
 
     def calculate_symbol_values(self):
-        
-        if len(self.symbol_intervals)-1 > len(self.symbol_values):
-            start_time = self.symbol_intervals[-2]
-            end_time = self.symbol_intervals[-1]
-
-            start_index = np.argmax(self.timestamps[0] > start_time)
-            end_index = np.argmax(self.timestamps[0] > end_time)
-
-            if start_index == 0 or start_index == end_index:
-                return
-
-            interval_data = self.received[0][start_index:end_index]
+        # All intervals that are complete are evaluated, the synchronizer may emit several intervals at once
+        for i in range(len(self.symbol_values), len(self.symbol_intervals) - 1):
+            aggregates = self.get_symbol_aggregates(0, i)
+            if aggregates is None:
+                # Wait until there are values after the interval
+                break
 
             #So far only binary CSK
-            symbol_value = self.binary_threshold_detection(interval_data)
-        
+            symbol_value = self.binary_threshold_detection(aggregates)
+
             self.symbol_values.append(symbol_value)
 
-    def binary_threshold_detection(self, interval_data):
+    def binary_threshold_detection(self, aggregates):
+        # Intervals without values (e.g. because they were lost) yield NaN, so no symbol is detected
+        variation = self.synchronizer.variation
         if NEGATIVE_DETECTION_THRESHOLD:
             #Downward symbols
-            min_index = np.argmin(interval_data)
-            if min_index > 0 and max(interval_data[0:min_index]) > interval_data[min_index] + self.abs_variation*self.threshold_factor:
+            if aggregates['max_before_min'][0] > aggregates['min'][0] + variation*self.threshold_factor:
                 return 1
         else:
-            max_index = np.argmax(interval_data)
-            if max_index > 0 and min(interval_data[0:max_index]) < interval_data[max_index] - self.abs_variation*self.threshold_factor:
+            if aggregates['min_before_max'][0] < aggregates['max'][0] - variation*self.threshold_factor:
                 return 1
         
         return 0
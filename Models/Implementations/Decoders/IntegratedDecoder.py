@@ -7,6 +7,7 @@ import numpy as np
 from Models.Interfaces.DecoderInterface import DecoderInterface
 from Models.Implementations.Receivers.IntegratedReceiver import IntegratedReceiver
 from Utils import Logging
+from Utils.SymbolSynchronizer import SymbolSynchronizer
 
 CLK_IN_MHZ = 40.0
 
@@ -103,8 +104,7 @@ class IntegratedDecoder(DecoderInterface):
         #Clean up
         self.shutdown()
 
-        self.abs_detection_threshold = 0
-        self.first_symbol_edge = 0
+        self.synchronizer = SymbolSynchronizer(self.symbol_duration, self.threshold_factor)
 
         # Define receivers list
         receiver = IntegratedReceiver(port, 
@@ -116,44 +116,14 @@ class IntegratedDecoder(DecoderInterface):
         self.receiver_names = ["Integrated Sensor"]
 
     def clear(self):
-        self.abs_detection_threshold = 0
-        self.first_symbol_edge = 0
+        self.synchronizer.clear()
         return super().clear()
 
     def calculate_symbol_intervals(self):
+        # Symbol detection is disabled for now, the synchronizer detects upward peaks like the previous detector
         return
-        ref_threshold_length = 2 #seconds
-
-        if self.first_symbol_edge > 0:
-            next_edge = self.symbol_intervals[-1] + self.symbol_duration
-            if self.max_timestamp > next_edge:
-                self.symbol_intervals.append(next_edge)
-            
-            return
-        
-        if self.max_timestamp - self.min_timestamp < ref_threshold_length:
-            #We have to wait for enough samples
-            return
-        elif self.abs_detection_threshold == 0:
-            #Use start of transmission to determine a first peak threshold
-            quiet_stop = np.argmax(self.timestamps[0] > self.min_timestamp + ref_threshold_length)
-
-            min_value = min(self.received[0][0:quiet_stop])
-            abs_variation = max(self.received[0][0:quiet_stop]) - min_value
-
-            self.abs_detection_threshold = min_value + abs_variation*self.threshold_factor
-
-        else:
-            #find first threshold pass to detect first peak
-            threshold_pass = np.argmax(self.received[0] > self.abs_detection_threshold)
-            if threshold_pass > 0:
-                first_peak_end_limit = np.argmax(self.timestamps[0] > self.timestamps[0][threshold_pass] + self.symbol_duration)
-                if first_peak_end_limit > 0:
-                    first_peak = np.argmax(self.received[0][threshold_pass:first_peak_end_limit])
-
-                    #center first peak in first symbol interval
-                    self.first_symbol_edge = self.timestamps[0][threshold_pass+first_peak] - self.symbol_duration/2
-                    self.symbol_intervals = [self.first_symbol_edge]
+        if self.lengths[0] > 0:
+            self.symbol_intervals += self.synchronizer.update(self.timestamps[0], self.received[0][:, 0], self.offsets[0])
 
     def available_ports():
         ports = serial.tools.list_ports.comports()
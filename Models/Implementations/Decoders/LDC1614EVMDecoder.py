@@ -2,7 +2,6 @@
 Author: Benjamin Schiller / Luiz Wille
 E-mail: benjamin.bs.schiller@fau.de / luiz.wille@fau.de
 """
-import scipy.ndimage
 import serial
 import serial.tools.list_ports
 import numpy as np
@@ -10,6 +9,9 @@ import numpy as np
 from Models.Interfaces.DecoderInterface import DecoderInterface
 from Models.Implementations.Receivers.LDC1614EVMReceiver import LDC1614EVMReceiver
 from Utils import Logging
+from Utils.SymbolSynchronizer import SymbolSynchronizer
+from Utils.Settings import SettingsStore
+from Utils.StreamingFilter import StreamingGaussianFilter
 
 CLK_IN_MHZ = 40.0
 
@@ -26,6 +28,7 @@ class LDC1614EVMDecoder(DecoderInterface):
         super().parameters_edited(parameter_values)
 
         self.sigma = self.parameter_values['Sigma']
+        self.filters = [StreamingGaussianFilter(self.sigma, SettingsStore.settings['DECODER_ARRAY_LENGTH']) for _ in range(4)]
         
         port = self.parameter_values['Port']
         deglitch_filter = self.parameter_values["Input Deglitch Filter Bandwidth (MHz)"]
@@ -67,8 +70,7 @@ class LDC1614EVMDecoder(DecoderInterface):
         # Clean up
         self.shutdown()
 
-        self.abs_detection_threshold = 0
-        self.first_symbol_edge = 0
+        self.synchronizer = SymbolSynchronizer(self.symbol_duration, self.threshold_factor)
 
         # Define receivers list
         if any(active for active in self.active_channels):
@@ -81,59 +83,29 @@ class LDC1614EVMDecoder(DecoderInterface):
     def calculate_additional_datalines(self):
         """
         Generates Gaussian filtered version of the datalines.
-        Note: Can be optimized by avoiding re-calculating old values every time.
+        The filters are streaming, only new values are calculated, so the filtered datalines lag the kernel radius
+        behind the datalines.
         """
-        received = self.decoded['received']
-        lengths, timestamps = received['lengths'], received['timestamps']
+        # No values available
+        if self.lengths[0] == 0:
+            return
         for idx in range(len(self.active_channels)):
             if self.active_channels[idx]:
-                sensor_values = self.get_received(0, idx)
-                # No values available
-                if sensor_values is None:
-                    return
-                sensor_filtered = scipy.ndimage.gaussian_filter1d(sensor_values, self.sigma)
-                dataline = {'length': lengths[0], 'timestamps': timestamps[0][:lengths[0]], 'values': sensor_filtered}
+                sensor_filtered = self.filters[idx].update(self.timestamps[0], self.received[0][:, idx], self.offsets[0])
+                dataline = {'length': len(sensor_filtered), 'timestamps': self.timestamps[0], 'values': sensor_filtered}
                 self.additional_datalines[idx] = dataline
 
     def clear(self):
-        self.abs_detection_threshold = 0
-        self.first_symbol_edge = 0
+        self.synchronizer.clear()
+        for sensor_filter in self.filters:
+            sensor_filter.clear()
         return super().clear()
 
     def calculate_symbol_intervals(self):
+        # Symbol detection is disabled for now, the synchronizer detects upward peaks like the previous detector
         return
-        ref_threshold_length = 2 #seconds
-
-        if self.first_symbol_edge > 0:
-            next_edge = self.symbol_intervals[-1] + self.symbol_duration
-            if self.max_timestamp > next_edge:
-                self.symbol_intervals.append(next_edge)
-            
-            return
-        
-        if self.max_timestamp - self.min_timestamp < ref_threshold_length:
-            #We have to wait for enough samples
-            return
-        elif self.abs_detection_threshold == 0:
-            #Use start of transmission to determine a first peak threshold
-            quiet_stop = np.argmax(self.timestamps[0] > self.min_timestamp + ref_threshold_length)
-
-            min_value = min(self.received[0][0:quiet_stop])
-            abs_variation = max(self.received[0][0:quiet_stop]) - min_value
-
-            self.abs_detection_threshold = min_value + abs_variation*self.threshold_factor
-
-        else:
-            #find first threshold pass to detect first peak
-            threshold_pass = np.argmax(self.received[0] > self.abs_detection_threshold)
-            if threshold_pass > 0:
-                first_peak_end_limit = np.argmax(self.timestamps[0] > self.timestamps[0][threshold_pass] + self.symbol_duration)
-                if first_peak_end_limit > 0:
-                    first_peak = np.argmax(self.received[0][threshold_pass:first_peak_end_limit])
-
-                    #center first peak in first symbol interval
-                    self.first_symbol_edge = self.timestamps[0][threshold_pass+first_peak] - self.symbol_duration/2
-                    self.symbol_intervals = [self.first_symbol_edge]
+        if self.lengths[0] > 0:
+            self.symbol_intervals += self.synchronizer.update(self.timestamps[0], self.received[0][:, 0], self.offsets[0])
 
     def available_ports():
         ports = serial.tools.list_ports.comports()
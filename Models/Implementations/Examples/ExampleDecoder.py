@@ -9,22 +9,27 @@ class ExampleDecoder(DecoderInterface):
         super().__init__(parameters, parameter_values)
 
         self.receivers = [ExampleReceiver()]
+        # One previous value is needed to detect changes at the beginning of new values
+        self.lookbacks = {'calculate_symbol_intervals': 1}
 
         super().setup()
 
     def calculate_symbol_intervals(self):
-        l = self.lengths[0]
-        if l > 0:
-            difference = self.received[0][1:l] - self.received[0][0:l-1]
+        # Only new values are searched, so intervals of values that were already evicted are kept
+        window = self.get_window(0)
+        if window is not None:
+            values = window['values']
+            difference = values[1:] - values[:-1]
             indices = list(np.nonzero(np.array(difference))[0])
-            self.symbol_intervals = [self.timestamps[0][i] for i in indices]
+            self.symbol_intervals += [window['timestamps'][i] for i in indices]
 
     def calculate_symbol_values(self):
         for i in range(len(self.symbol_values), len(self.symbol_intervals) - 1):
-            left_index = np.argmin(list(map(abs, self.timestamps[0][:self.lengths[0]] - self.symbol_intervals[i])))
-            right_index = np.argmin(list(map(abs, self.timestamps[0][:self.lengths[0]] - self.symbol_intervals[i + 1])))
+            aggregates = self.get_symbol_aggregates(0, i)
+            if aggregates is None:
+                break
 
-            max_tmp = int(np.round(np.mean(self.received[0][left_index:right_index])))
+            max_tmp = int(np.round(aggregates['mean'][0]))
             self.symbol_values += [max_tmp]
 
     def calculate_sequence(self):
@@ -3,13 +3,15 @@ import time
 
 from Models.Interfaces.DecoderInterface import DecoderInterface
 from Models.Implementations.Examples.ExampleReceiver2 import ExampleReceiver2
+from Utils.Settings import SettingsStore
+from Utils.TimeSeriesStore import TimeSeriesStore
 
 
 class ExampleDecoder2(DecoderInterface):
     def __init__(self, parameters, parameter_values):
         super().__init__(parameters, parameter_values)
         # Mandatory
-        self.receivers = [ExampleReceiver2()] * 3
+        self.receivers = [ExampleReceiver2() for _ in range(3)]
 
         # Optional
         self.additional_datalines_names = ["Mean"]
@@ -35,18 +37,27 @@ class ExampleDecoder2(DecoderInterface):
 
         super().setup()
 
+    def clear(self):
+        self.dataline_store = TimeSeriesStore(SettingsStore.settings['DECODER_ARRAY_LENGTH'], 1)
+        self.landmarks_x, self.landmarks_y = [], []
+        return super().clear()
+
     def calculate_additional_datalines(self):
+        # Only new values are processed, old values are evicted together with the received values
+        window = self.get_window(0)
+        if window is None:
+            return
+        self.dataline_store.extend(window['timestamps'], window['values'][:, :1] + 2)
+        self.dataline_store.discard(self.dataline_store.length - self.lengths[0])
         for i in range(self.num_additional_datalines):
-            length = self.lengths[0]
-            timestamps = self.timestamps[0]
-            y = [self.received[0][i, 0] + 2 for i in range(self.lengths[0])]
-            self.additional_datalines[i] = {'length': length, 'timestamps': timestamps, 'values': y}
+            self.additional_datalines[i] = {'length': self.lengths[0], 'timestamps': self.timestamps[0], 'values': self.dataline_store.column(0)}
 
     def calculate_landmarks(self):
-        x = [0.5 * (self.symbol_intervals[a] + self.symbol_intervals[a+1]) for a in range(max(0, len(self.symbol_intervals) - 1))]
-        y = [self.received[0][i, 0] for i in range(len(x))]
+        for a in range(len(self.landmarks_x), max(0, len(self.symbol_intervals) - 1)):
+            self.landmarks_x.append(0.5 * (self.symbol_intervals[a] + self.symbol_intervals[a+1]))
+            self.landmarks_y.append(self.received[0][a, 0])
         for i in range(self.num_landmarks):
-            self.landmarks[i] = {'x': x, 'y': [a/(2**i) for a in y]}
+            self.landmarks[i] = {'x': self.landmarks_x, 'y': [a/(2**i) for a in self.landmarks_y]}
 
     def calculate_sequence(self):
         length = max(0, len(self.symbol_values) - 4)
@@ -1,18 +1,28 @@
 from Models.Interfaces.ReceiverInterface import ReceiverInterface
 from Utils import Queue
 
+import queue
+
 
 class ExampleReceiver(ReceiverInterface):
+
+    TIMEOUT = 0.1 #s
+
     def __init__(self):
         super().__init__()
 
         self.num_sensors = 1
         self.sensor_names = ["Test"]
 
+        # listen_step waits for the queue
+        self.sleep_time = 0
+
         super().setup()
 
     def listen_step(self):
-        if not Queue.queue.empty():
-            values, t = Queue.queue.get()
-            values = (values,)
-            self.append_values(values, timestamp=t + 1)
\ No newline at end of file
+        try:
+            values, t = Queue.queue.get(timeout=ExampleReceiver.TIMEOUT)
+        except queue.Empty:
+            return
+        values = (values,)
+        self.append_values(values, timestamp=t + 1)
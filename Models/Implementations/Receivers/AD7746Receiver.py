@@ -1,8 +1,9 @@
 
 
 from Models.Interfaces.ReceiverInterface import ReceiverInterface
-from Utils import Logging
+from Utils import LineParser, Logging, SerialLoop
 
+import numpy as np
 import serial
 import time
 
@@ -42,6 +43,12 @@ class AD7746Receiver(ReceiverInterface):
 
         self.ms_offset = None
         self.start_rx_time = None
+        self.last_uc_time = None
+        self.uc_time_wraps = 0
+
+        # Splits the data of the serial port into lines, listen_step blocks on the serial port
+        self.line_protocol = SerialLoop.LineProtocol(self.smp, self.lines_received)
+        self.sleep_time = 0
 
         super().setup()
 
@@ -78,6 +85,7 @@ class AD7746Receiver(ReceiverInterface):
         self.smp.readline()
         
     def convert_raw_value(self, raw_value):
+        #raw_value can be an array
         #Data is 0x000000 - 0xFFFFFF with 0x800000=0
         #max value is +4.096pF, min value is -4.096pF
 
@@ -85,16 +93,23 @@ class AD7746Receiver(ReceiverInterface):
         out_val = zero_corrected*4096/8388607 #fF
         return out_val
 
-    def convert_timestamp(self, uc_time):
-        #uc_time is ms since the uc startup (will loop after about 40days)
+    def convert_timestamps(self, uc_times):
+        #uc_times are ms since the uc startup, the 32 bit counter wraps around after about 49 days
 
         if self.ms_offset == None:
             #Set initial offset
-            self.ms_offset = uc_time
+            self.ms_offset = uc_times[0]
             self.start_rx_time = time.time()
-        
-        timestamp = (uc_time-self.ms_offset)/1000 + self.start_rx_time
-        return timestamp
+            self.last_uc_time = uc_times[0]
+            self.uc_time_wraps = 0
+
+        # Unwrap the counter
+        wraps = self.uc_time_wraps + np.cumsum(np.diff(uc_times, prepend=self.last_uc_time) < -2 ** 31)
+        self.last_uc_time = uc_times[-1]
+        self.uc_time_wraps = int(wraps[-1])
+
+        timestamps = (uc_times + wraps * 2 ** 32 - self.ms_offset) / 1000 + self.start_rx_time
+        return timestamps
 
 
     def shutdown(self):
@@ -102,20 +117,23 @@ class AD7746Receiver(ReceiverInterface):
         self.smp.close()
 
 
-    def listen_step(self):
-        
-        while self.smp.in_waiting >= 24:
-            raw_set = self.smp.readline()
-            dataset = raw_set.decode("ascii")
-            elements = dataset.split(", ")
-            if len(elements) != 2:
-                Logging.warning("Unexpected receiver message: " + dataset)
-                return
+    def create_protocol(self):
+        return self.line_protocol
 
-            try:
-                uc_time = int(elements[0])
-                raw_value = int(elements[1])
-                self.append_values([self.convert_raw_value(raw_value)], self.convert_timestamp(uc_time))
-            except:
-                Logging.warning("Unexpected receiver message.")
-                return
\ No newline at end of file
+    def listen_step(self):
+        # Blocks until data arrives (or the timeout expires), afterwards everything that is waiting is read at once
+        data = self.smp.read(1)
+        data += self.smp.read(self.smp.in_waiting)
+        self.line_protocol.data_received(data)
+
+    def lines_received(self, lines):
+        """
+        Parses complete lines of the serial port and appends their values as one block.
+        :param lines: Lines (without the line feed).
+        """
+        fields = LineParser.parse(lines, 2)
+        if len(fields) == 0:
+            return
+
+        timestamps = self.convert_timestamps(fields[:, 0])
+        self.append_block(timestamps, self.convert_raw_value(fields[:, 1]))
@@ -1,8 +1,9 @@
 
 
 from Models.Interfaces.ReceiverInterface import ReceiverInterface
-from Utils import Logging
+from Utils import LineParser, Logging, SerialLoop
 
+import numpy as np
 import serial
 import time
 
@@ -53,6 +54,12 @@ class IntegratedReceiver(ReceiverInterface):
 
         self.ms_offset = None
         self.start_rx_time = None
+        self.last_uc_time = None
+        self.uc_time_wraps = 0
+
+        # Splits the data of the serial port into lines, listen_step blocks on the serial port
+        self.line_protocol = SerialLoop.LineProtocol(self.smp, self.lines_received)
+        self.sleep_time = 0
 
         super().setup()
 
@@ -126,6 +133,7 @@ class IntegratedReceiver(ReceiverInterface):
         self.smp.readline()
         
     def convert_raw_cap_value(self, raw_value):
+        #raw_value can be an array
         #Data is 0x000000 - 0xFFFFFF with 0x800000=0
         #max value is +4.096pF, min value is -4.096pF
 
@@ -133,31 +141,39 @@ class IntegratedReceiver(ReceiverInterface):
         out_val = zero_corrected*4096/8388607 #fF
         return out_val
 
-    def convert_timestamp(self, uc_time):
-        #uc_time is ms since the uc startup (will loop after about 40days)
+    def convert_timestamps(self, uc_times):
+        #uc_times are ms since the uc startup, the 32 bit counter wraps around after about 49 days
 
         if self.ms_offset == None:
             #Set initial offset
-            self.ms_offset = uc_time
+            self.ms_offset = uc_times[0]
             self.start_rx_time = time.time()
-        
-        timestamp = (uc_time-self.ms_offset)/1000 + self.start_rx_time
-        return timestamp
+            self.last_uc_time = uc_times[0]
+            self.uc_time_wraps = 0
+
+        # Unwrap the counter
+        wraps = self.uc_time_wraps + np.cumsum(np.diff(uc_times, prepend=self.last_uc_time) < -2 ** 31)
+        self.last_uc_time = uc_times[-1]
+        self.uc_time_wraps = int(wraps[-1])
+
+        timestamps = (uc_times + wraps * 2 ** 32 - self.ms_offset) / 1000 + self.start_rx_time
+        return timestamps
     
     def calculate_frequency(self, data, channel, err):
+        #data and err can be arrays, errors are reported once for all of them
 
         errStat = err & 0b00001111
 
         if channel > 0:
             errStat = (err & 0b11110000)>>4
 
-        if errStat & (1<<1) > 0:
+        if np.any(errStat & (1<<1) > 0):
             Logging.warning(f"ERR_UR/OR{channel}: Channel {channel} Conversion Under/Over-range Error", repeat=False)
-        if errStat & (1<<2) > 0:
+        if np.any(errStat & (1<<2) > 0):
             Logging.warning(f"ERR_WD{channel}: Channel {channel} Conversion Watchdog Timeout Error", repeat=False)
-        if errStat & (1<<3) > 0:
+        if np.any(errStat & (1<<3) > 0):
             Logging.warning(f"ERR_AE{channel}: Channel {channel} Conversion Amplitude Error", repeat=False)
-        if errStat & (1<<0) > 0:
+        if np.any(errStat & (1<<0) > 0):
             Logging.warning(f"ERR{channel}: Channel {channel} Conversion Error", repeat=False)
         
         # Calculate reference frequency and channel offset
@@ -177,32 +193,26 @@ class IntegratedReceiver(ReceiverInterface):
         self.smp.close()
 
 
-    def listen_step(self):
+    def create_protocol(self):
+        return self.line_protocol
 
-        t1 = time.time()
-        t3 = 0
-        t4 = 0
-        t5 = 0
-        
-        if self.smp.in_waiting > 0:
-            t4 = time.time()
-            dataset = self.smp.readline().decode("ascii")
-            t5 = time.time()
-            elements = dataset.split(", ")
-            if len(elements) != 5:
-                Logging.warning("Unexpected receiver message: " + dataset)
-                return
-
-            uc_time = int(elements[0])
-            raw_cap_value = int(elements[1])
-            raw_ind0_value = int(elements[2])
-            raw_ind1_value = int(elements[3])
-            ind_channel_errors = int(elements[4])
-            t3 = time.time()
-            ind0_val = self.calculate_frequency(raw_ind0_value, 0, ind_channel_errors)
-            ind1_val = self.calculate_frequency(raw_ind1_value, 1, ind_channel_errors)
-            self.append_values([self.convert_raw_cap_value(raw_cap_value), ind0_val, ind1_val], self.convert_timestamp(uc_time))
-
-        t2 = time.time()
-
-        print((t5-t4)*1000)
\ No newline at end of file
+    def listen_step(self):
+        # Blocks until data arrives (or the timeout expires), afterwards everything that is waiting is read at once
+        data = self.smp.read(1)
+        data += self.smp.read(self.smp.in_waiting)
+        self.line_protocol.data_received(data)
+
+    def lines_received(self, lines):
+        """
+        Parses complete lines of the serial port and appends their values as one block.
+        :param lines: Lines (without the line feed).
+        """
+        fields = LineParser.parse(lines, 5)
+        if len(fields) == 0:
+            return
+
+        timestamps = self.convert_timestamps(fields[:, 0])
+        cap_values = self.convert_raw_cap_value(fields[:, 1])
+        ind0_values = self.calculate_frequency(fields[:, 2], 0, fields[:, 4])
+        ind1_values = self.calculate_frequency(fields[:, 3], 1, fields[:, 4])
+        self.append_block(timestamps, np.column_stack([cap_values, ind0_values, ind1_values]))
@@ -4,9 +4,7 @@ import crcmod.predefined
 import numpy as np
 
 from Models.Interfaces.ReceiverInterface import ReceiverInterface
-from Utils import Logging
-
-import struct
+from Utils import Logging, SerialLoop
 
 crc8 = crcmod.predefined.mkCrcFun('crc-8')
 # LDC1614 EVM registers
@@ -44,6 +42,17 @@ START_STREAMING_COMMAND = "4C0501000601290404302AC1"
 STOP_STREAMING_COMMAND = "4C0601000101D2"
 # after set, MCU responds with 32 bytes - byte 4 is zero if command is correct
 
+# Frame that is output periodically while streaming, decoded for many frames at once with np.frombuffer
+# 'data' contains the MSB and LSB register of every channel
+STREAM_FRAME = np.dtype([('header', 'u1', (3,)), ('error_code', 'u1'), ('reserved', 'u1', (2,)),
+                         ('data', '>u2', (4, 2)), ('trailer', 'u1', (10,))])
+
+# Error bits in the MSB data registers (bit, name, description)
+DATA_ERRORS = [(15, "ERR_UR", "Conversion Under-range Error"),
+               (14, "ERR_OR", "Conversion Over-range Error"),
+               (13, "ERR_WD", "Conversion Watchdog Timeout Error"),
+               (12, "ERR_AE", "Conversion Amplitude Error")]
+
 
 class LDC1614EVMReceiver(ReceiverInterface):
     """
@@ -64,6 +73,14 @@ class LDC1614EVMReceiver(ReceiverInterface):
         self.sensor_names = ["CH" + str(i) for i in range(4)]
         self.drop_first_measurements = 10
 
+        # Number of errors per error bit (see DATA_ERRORS) and channel, and number of frames with an error code
+        self.error_counts = np.zeros((len(DATA_ERRORS), self.num_sensors), dtype=int)
+        self.stream_error_count = 0
+
+        # Partial frame, listen_step blocks on the serial port
+        self.frame_buffer = bytearray()
+        self.sleep_time = 0
+
         super().setup()
 
         self.serial_port = serial.Serial()
@@ -159,64 +176,89 @@ class LDC1614EVMReceiver(ReceiverInterface):
         else:
             self.send_command(STOP_STREAMING_COMMAND, False)
 
+    def create_protocol(self):
+        return SerialLoop.FrameProtocol(self.serial_port, self.frames_received, 32)
+
     def listen_step(self):
         """
-        Check if data ready flag is set (all channels have an unread conversion) and then read new values.
+        Wait for a frame, then read all complete frames that are waiting and append them as one block.
         """
+        # Blocks until a frame arrives (or the timeout expires)
+        self.frame_buffer += self.serial_port.read(32 - len(self.frame_buffer))
+        if len(self.frame_buffer) < 32:
+            # Timeout, the rest of the frame is read in the next step (the block time is still updated, so the
+            # timestamps of the next block are not spread over the idle time)
+            self.get_block_timestamps(0)
+            return
+
+        self.frame_buffer += self.serial_port.read(32 * (self.serial_port.in_waiting // 32))
+        count = len(self.frame_buffer) // 32
+        with memoryview(self.frame_buffer) as frame_view:
+            self.frames_received(frame_view[:32 * count])
+        del self.frame_buffer[:32 * count]
+
+    def frames_received(self, read):
+        """
+        Parses complete frames of the serial port and appends their values as one block.
+        :param read: Bytes of the frames.
+        """
+        frames = np.frombuffer(read, dtype=STREAM_FRAME)
+        timestamps = self.get_block_timestamps(len(frames))
 
-        if self.serial_port.in_waiting >= 32:
-            #ch0, ch1, ch2, ch3 = self.read_stream_line()
-            ch_vals = self.read_stream_line()
-
-            values = [0,0,0,0]
-            for idx in range(self.num_sensors):
-                if self.active_channels[idx]:
-                    values[idx] = ch_vals[idx]
+        values = self.calculate_frequencies(frames['data'][:, :, 0], frames['data'][:, :, 1], np.arange(self.num_sensors))
+        errors = frames['error_code'] != 0
+        if np.any(errors):
+            Logging.warning('Error reported from serial during streaming.', repeat=False)
+            self.stream_error_count += int(np.count_nonzero(errors))
+            values[errors] = 0
+        values[:, np.logical_not(self.active_channels)] = 0
 
-            self.append_values(values)
+        self.append_block(timestamps, values)
 
     def is_data_ready(self, channel):
         status = self.read_register(STATUS)
         return status & (1 << (3 - channel)) > 0
 
-    def read_stream_line(self):
-        read = self.serial_port.read(32)
-
-        # see https://docs.python.org/3/library/struct.html#struct.calcsize
-        # '>'=Big Endian, '3x' = 3 times pad byte (no value), 'B'=unsigned char, '2x'= 2 times pad byte, 'H'=unsigned short (2 bytes), '10x' = 10 times pad byte
-        (error_code, ch0_msb, ch0_lsb, ch1_msb, ch1_lsb, ch2_msb, ch2_lsb, ch3_msb, ch3_lsb) = struct.unpack(
-            '>3xB2xHHHHHHHH10x', read)
-        if error_code:
-            Logging.warning('Error reported from serial during streaming.', repeat=False)
-            ch0 = 0
-            ch1 = 0
-            ch2 = 0
-            ch3 = 0
-        else:
-            ch0 = self.calculate_frequency(ch0_msb, ch0_lsb, 0)
-            ch1 = self.calculate_frequency(ch1_msb, ch1_lsb, 1)
-            ch2 = self.calculate_frequency(ch2_msb, ch2_lsb, 2)
-            ch3 = self.calculate_frequency(ch3_msb, ch3_lsb, 3)
-
-        return ch0, ch1, ch2, ch3
+    def count_errors(self, data_msb, channels):
+        """
+        Counts the error bits of the MSB data registers of active channels, only the first error of every kind and channel
+        is logged.
+        :param data_msb: MSB data registers, dimensions (frames, channels).
+        :param channels: Channel of every column.
+        """
+        active = np.asarray(self.active_channels)[channels]
+        for error_index, (bit, name, description) in enumerate(DATA_ERRORS):
+            counts = np.count_nonzero((data_msb >> bit) & 1, axis=0) * active
+            for column in np.flatnonzero(counts):
+                channel = channels[column]
+                if self.error_counts[error_index, channel] == 0:
+                    Logging.warning(f"{name}{channel}: Channel {channel} {description}", repeat=False)
+            np.add.at(self.error_counts[error_index], channels, counts)
+
+    def get_error_counts(self):
+        """
+        Gets the number of errors since the receiver was created.
+        :return: Dictionary with the number of errors per channel for every error bit (see DATA_ERRORS) and the number of
+        stream frames with an error code ('stream').
+        """
+        error_counts = {name: self.error_counts[error_index].tolist() for error_index, (_, name, _) in enumerate(DATA_ERRORS)}
+        error_counts['stream'] = self.stream_error_count
+        return error_counts
 
-    def calculate_frequency(self, data_msb, data_lsb, channel):
+    def calculate_frequencies(self, data_msb, data_lsb, channels):
+        """
+        Calculates the frequencies of data registers.
+        :param data_msb: MSB data registers, dimensions (frames, channels).
+        :param data_lsb: LSB data registers, dimensions (frames, channels).
+        :param channels: Channel of every column.
+        :return: Frequencies (Hz), dimensions (frames, channels).
+        """
         # The leading 4 bits of the MSB are error bits and not part of the actual data
+        data_msb = np.asarray(data_msb, dtype=np.int64)
+        self.count_errors(data_msb, channels)
 
-        if data_msb & (1 << 15) > 0 and self.active_channels[channel]:
-            Logging.warning(f"ERR_UR{channel}: Channel {channel} Conversion Under-range Error", repeat=False)
-        if data_msb & (1 << 14) > 0 and self.active_channels[channel]:
-            Logging.warning(f"ERR_OR{channel}: Channel {channel} Conversion Over-range Error", repeat=False)
-        if data_msb & (1 << 13) > 0 and self.active_channels[channel]:
-            Logging.warning(f"ERR_WD{channel}: Channel {channel} Conversion Watchdog Timeout Error", repeat=False)
-        if data_msb & (1 << 12) > 0 and self.active_channels[channel]:
-            Logging.warning(f"ERR_AE{channel}: Channel {channel} Conversion Amplitude Error", repeat=False)
-
-        # Clear error bits for value calculation
-        data_msb &= 0b0000111111111111
-
-        # Combine values from MSB and LSB to final value
-        data = (data_msb << 16) + data_lsb
+        # Clear error bits for value calculation and combine values from MSB and LSB to final value
+        data = ((data_msb & 0b0000111111111111) << 16) + data_lsb
 
         # Calculate reference frequency and channel offset (see page 39 of the data sheet)
         offset = 0  # we currently do not use an offset or dividers
@@ -229,6 +271,9 @@ class LDC1614EVMReceiver(ReceiverInterface):
         frequency = input_divider * reference_frequency * ((data / 2 ** 28) + channel_freq_offset)
         return frequency
 
+    def calculate_frequency(self, data_msb, data_lsb, channel):
+        return float(self.calculate_frequencies([[data_msb]], [[data_lsb]], [channel])[0, 0])
+
     def get_channel_frequency(self, channel):
         """
         Reads the data registers and calculates the frequency for a given channel.
@@ -1,11 +1,10 @@
 
 
 from Models.Interfaces.ReceiverInterface import ReceiverInterface
-from Utils import Logging
+from Utils import LineParser, Logging, SerialLoop
 
+import numpy as np
 import serial
-import time
-import re
 
 class PocketLoCReceiver(ReceiverInterface):
 
@@ -13,6 +12,10 @@ class PocketLoCReceiver(ReceiverInterface):
     DEVICE_ID = "PocketLoCSensor"
     BAUDRATE = 115200
     TIMEOUT = 0.1 #s
+    # Every frame is a line of 14 comma separated values (including the line terminator): 6 values and a saturation flag
+    # for each of the two sensors
+    FRAME_LENGTH = 188 #bytes
+    NUM_FIELDS = 14
 
     def __init__(self, port, active_sensor_channels):
         super().__init__()
@@ -38,8 +41,14 @@ class PocketLoCReceiver(ReceiverInterface):
 
         self.set_mux(active_sensor_channels)
 
-        global error_flag
-        error_flag = False
+        # Saturation of the two sensors in the last frame and number of saturated frames
+        self.saturated = np.zeros(2, dtype=bool)
+        self.saturation_counts = np.zeros(2, dtype=int)
+        self.corrupted_frame_count = 0
+
+        # Splits the data of the serial port into frames, listen_step blocks on the serial port
+        self.line_protocol = SerialLoop.LineProtocol(self.smp, self.frames_received)
+        self.sleep_time = 0
 
         super().setup()
 
@@ -91,40 +100,6 @@ class PocketLoCReceiver(ReceiverInterface):
         self.send_command(time_command)
         self.read_response(1)
 
-    def read_values(self):
-        # Get a line of data from the serial connection and parse it
-        raw = self.smp.read(188).decode('utf-8')
-        raw_items = re.split(",", raw)
-        
-        sensor0_vals = [0,0,0,0,0,0]
-        sensor1_vals = [0,0,0,0,0,0]
-        saturation_error = False
-        timestamp = time.time()
-        
-        try:
-            values = [float(x) for x in raw_items[0:14]]
-            sensor0_vals = values[0:6]
-            sensor1_vals = values[7:13]
-            saturation_error = values[6] > 0 or values[13] > 0
-        except Exception:
-            Logging.warning("Error parsing values:")
-            Logging.warning(raw)
-            return None, None, None, None
-        
-        global error_flag
-        
-        if saturation_error:
-            #Saturation error - only report if new
-            if not error_flag:
-                error_flag = True
-                Logging.warning("Sensor saturation error! You should probably reduce the gain.")
-        else:
-            error_flag = False
-
-        
-        return sensor0_vals, sensor1_vals, saturation_error, timestamp
-
-    
     def set_status(self, on):
         write_cmd = "STOP"
         if on:
@@ -138,11 +113,41 @@ class PocketLoCReceiver(ReceiverInterface):
         self.smp.close()
 
 
-    def listen_step(self):
-        
-        while self.smp.in_waiting >= 188:
-            sensor0, sensor1, sat_err, timestamp = self.read_values()
-            if sensor0 is None:
-                return
+    def create_protocol(self):
+        return self.line_protocol
 
-            self.append_values(sensor0 + sensor1, timestamp)
\ No newline at end of file
+    def listen_step(self):
+        # Blocks until data arrives (or the timeout expires), afterwards everything that is waiting is read at once
+        data = self.smp.read(1)
+        data += self.smp.read(self.smp.in_waiting)
+        if len(data) == 0:
+            # Timeout, the block time is still updated, so the timestamps of the next block are not spread over the idle time
+            self.get_block_timestamps(0)
+            return
+        self.line_protocol.data_received(data)
+
+    def frames_received(self, lines):
+        """
+        Parses complete frames of the serial port and appends their values as one block.
+        Frames are separated by line terminators, so after lost or corrupted bytes the alignment is restored with the next
+        frame. Lines that do not have the length of a frame are dropped.
+        :param lines: Lines (without the line feed).
+        """
+        frames = [line for line in lines if len(line) == PocketLoCReceiver.FRAME_LENGTH - 1]
+        if len(frames) < len(lines):
+            self.corrupted_frame_count += len(lines) - len(frames)
+            Logging.warning("Corrupted frames received, they are dropped.", repeat=False)
+
+        fields = LineParser.parse(frames, PocketLoCReceiver.NUM_FIELDS, dtype=float)
+        timestamps = self.get_block_timestamps(len(fields))
+        if len(fields) == 0:
+            return
+
+        saturated = fields[:, [6, 13]] > 0
+        self.saturation_counts += np.count_nonzero(saturated, axis=0)
+        if np.any(saturated & np.logical_not(np.vstack([self.saturated, saturated[:-1]]))):
+            # Saturation error - only report if new
+            Logging.warning("Sensor saturation error! You should probably reduce the gain.")
+        self.saturated = saturated[-1]
+
+        self.append_block(timestamps, np.hstack([fields[:, 0:6], fields[:, 7:13]]))
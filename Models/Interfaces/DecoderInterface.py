@@ -6,7 +6,16 @@ import xlsxwriter
 from xlsxwriter.exceptions import FileCreateError
 
 from Utils import Logging
+from Utils.CaptureJournal import CaptureJournal
+from Utils.IntervalIndex import IntervalIndex
+from Utils.ListPublisher import ListPublisher
+from Utils.MinMaxPyramid import MinMaxPyramid
 from Utils.Settings import SettingsStore
+from Utils.TimeSeriesStore import TimeSeriesStore
+
+# Stages of the decode pipeline, every stage has its own watermarks
+STAGES = ['pre_processing', 'calculate_additional_datalines', 'calculate_landmarks', 'calculate_symbol_intervals',
+          'calculate_symbol_values', 'calculate_sequence']
 
 
 class DecoderInterface:
@@ -28,10 +37,19 @@ class DecoderInterface:
         self.active = False
         self.additional_datalines = []
         self.additional_datalines_names = None
+        # Set by the receivers when new measurements are in their buffers (see ReceiverInterface.data_available)
+        self.data_available = threading.Event()
         self.decoded = None
+        self.fingerprints = {}
+        self.generation = 0
+        self.generations = {}
         self.info = None
+        self.interval_index = None
+        self.journaling = False
+        self.journals = []
         self.landmarks = []
         self.landmark_names = None
+        self.lookbacks = {}
         self.landmark_symbols = None
         self.lengths = []
         self.min_timestamp = time.time()
@@ -39,14 +57,25 @@ class DecoderInterface:
         self.num_additional_datalines = 0
         self.num_landmarks = 0
         self.num_receivers = 0
+        self.offsets = []
+        self.overflow_counts = []
         self.plot_settings = {}
+        self.publishers = {}
+        self.pyramids = []
         self.received = []
         self.receivers = []
         self.receiver_names = None
+        self.retention_samples = 0
+        self.retention_seconds = 0
         self.sequence = ""
+        self.spill_sink = None
+        self.stage = None
+        self.stores = []
         self.symbol_intervals = []
         self.symbol_values = []
         self.timestamps = []
+        self.touched = set()
+        self.watermarks = {}
 
         self.parameters_edited(parameter_values)
 
@@ -56,6 +85,9 @@ class DecoderInterface:
         This method is called at the end of the initialization of the conrete decoder implementation.
         """
         self.num_receivers = len(self.receivers)
+        self.overflow_counts = [0] * self.num_receivers
+        for receiver in self.receivers:
+            receiver.data_available = self.data_available
 
         if self.receiver_names is None:
             Logging.info("No receiver names provided, automatically generating them.")
@@ -89,12 +121,15 @@ class DecoderInterface:
             }
         }
 
+        self.stores = [TimeSeriesStore(SettingsStore.settings['DECODER_ARRAY_LENGTH'], receiver.num_sensors) for receiver in self.receivers]
+        self.pyramids = [MinMaxPyramid(SettingsStore.settings['DECODER_ARRAY_LENGTH'], receiver.num_sensors) for receiver in self.receivers]
+        self.interval_index = IntervalIndex(self.num_receivers)
+        self.retention_samples = SettingsStore.settings['DECODER_RETENTION_SAMPLES']
+        self.retention_seconds = SettingsStore.settings['DECODER_RETENTION_SECONDS']
+
         self.clear()
 
         for receiver_index in range(self.num_receivers):
-            self.timestamps.append(None)
-            self.received.append(None)
-            self.lengths.append(0)
             self.info['receivers']['sensor_names'].append(self.receivers[receiver_index].sensor_names)
 
         self.additional_datalines = [None] * self.num_additional_datalines
@@ -107,32 +142,49 @@ class DecoderInterface:
         :param timestamp: New timestamp.
         :param values: New measurement values.
         """
-        if self.lengths[receiver_index] == 0:
-            self.timestamps[receiver_index] = np.empty((SettingsStore.settings['DECODER_ARRAY_LENGTH'],))
-            self.timestamps[receiver_index][0] = timestamp
-            self.received[receiver_index] = np.empty((SettingsStore.settings['DECODER_ARRAY_LENGTH'], len(values)))
-            self.received[receiver_index][0] = np.array(values)
-        else:
-            if self.lengths[receiver_index] == len(self.timestamps[receiver_index]):
-                self.timestamps[receiver_index] = np.concatenate((self.timestamps[receiver_index], np.empty((SettingsStore.settings['DECODER_ARRAY_LENGTH'],))))
-                self.received[receiver_index] = np.vstack((self.received[receiver_index], np.empty((SettingsStore.settings['DECODER_ARRAY_LENGTH'], len(values)))))
-
-            self.timestamps[receiver_index][self.lengths[receiver_index]] = timestamp
-            self.received[receiver_index][self.lengths[receiver_index]] = values
-
-        min_timestamp = None
-        max_timestamp = None
-        for i in range(len(self.timestamps)):
-            if self.lengths[i] > 0:
-                min_tmp = np.min(self.timestamps[i][:self.lengths[i]])
-                max_tmp = np.max(self.timestamps[i][:self.lengths[i]])
-                if min_timestamp is None or min_tmp < min_timestamp:
-                    min_timestamp = min_tmp
-                if max_timestamp is None or max_tmp > max_timestamp:
-                    max_timestamp = max_tmp
-
-        self.min_timestamp = min_timestamp if min_timestamp is not None else time.time()
-        self.max_timestamp = max_timestamp if max_timestamp is not None else time.time()
+        self.stores[receiver_index].append(timestamp, values)
+        self.pyramids[receiver_index].extend(np.array([timestamp]), np.reshape(values, (1, -1)))
+        self.write_journal(receiver_index, np.array([timestamp]), np.reshape(values, (1, -1)))
+        self.apply_retention(receiver_index)
+        self.update_received(receiver_index)
+
+    def append_block(self, receiver_index, timestamps, values):
+        """
+        Appends a block of new timestamps for a given receiver.
+        :param receiver_index: Receiver index.
+        :param timestamps: New timestamps, dimensions (k).
+        :param values: New measurement values, dimensions (k, sensors).
+        """
+        self.stores[receiver_index].extend(timestamps, values)
+        self.pyramids[receiver_index].extend(timestamps, values)
+        self.write_journal(receiver_index, timestamps, values)
+        self.apply_retention(receiver_index)
+        self.update_received(receiver_index)
+
+    def apply_retention(self, receiver_index):
+        """
+        Evicts the oldest values of a receiver that are outside of the retention window (see DECODER_RETENTION_SECONDS
+        and DECODER_RETENTION_SAMPLES in the settings).
+        Values are evicted in batches of at least a quarter of the stored values, so every value is moved only a few
+        times. If a spill sink is set, it is called with the evicted values before they are discarded.
+        Symbol intervals are timestamps, so they stay valid, indices can be made absolute with offsets.
+        :param receiver_index: Receiver index.
+        """
+        store = self.stores[receiver_index]
+        count = 0
+        if self.retention_samples > 0:
+            count = store.length - self.retention_samples
+        if self.retention_seconds > 0 and store.length > 0:
+            count = max(count, np.searchsorted(store.timestamps, store.max_timestamp - self.retention_seconds))
+
+        if count <= 0 or count < store.length // 4:
+            return
+
+        if self.spill_sink is not None:
+            # Views are only valid during the call, the sink has to copy them if needed
+            self.spill_sink(receiver_index, store.timestamps[:count], store.values[:count])
+        store.discard(count)
+        self.pyramids[receiver_index].discard(store.offset)
 
     def calculate_additional_datalines(self):
         """
@@ -198,20 +250,60 @@ class DecoderInterface:
         This is called when the user presses the clear button for the decoder.
         """
         # Clear received
+        for store in self.stores:
+            store.clear()
+        for pyramid in self.pyramids:
+            pyramid.clear()
         self.additional_datalines = [None] * self.num_additional_datalines
         self.lengths = [0] * self.num_receivers
+        self.offsets = [0] * self.num_receivers
         self.received = [None] * self.num_receivers
         self.timestamps = [None] * self.num_receivers
         self.symbol_intervals = []
         self.symbol_values = []
         self.sequence = ""
         self.landmarks = [None] * self.num_landmarks
+        self.interval_index.clear()
+        self.publishers = {
+            'symbol_intervals': ListPublisher(),
+            'symbol_values': ListPublisher(),
+            'symbol_aggregates': [ListPublisher() for _ in range(self.num_receivers)],
+            'symbol_boundaries': [ListPublisher() for _ in range(self.num_receivers)]
+        }
+        self.touched = set()
 
         self.min_timestamp = time.time()
         self.max_timestamp = time.time()
 
+        # Everything is new after clearing, generations are never reused so consumers cannot mistake new data for old
+        generation = self.next_generation()
+        self.fingerprints = {}
+        self.generations = {
+            'received': [generation] * self.num_receivers,
+            'additional_datalines': [generation] * self.num_additional_datalines,
+            'landmarks': [generation] * self.num_landmarks,
+            'symbol_intervals': generation,
+            'symbol_values': generation,
+            'sequence': generation
+        }
+        self.watermarks = {stage: [0] * self.num_receivers for stage in STAGES}
+
         for receiver in self.receivers:
-            receiver.buffer = []
+            receiver.clear_buffer()
+
+        # A new capture is written to new journal files
+        self.close_journals()
+
+    def close_journals(self):
+        """
+        Closes the journal files of the current capture.
+        """
+        for journal in self.journals:
+            try:
+                journal.close()
+            except OSError as e:
+                Logging.error(f"Failed to close journal {journal.path}: {e}")
+        self.journals = []
 
     def decode(self):
         """
@@ -222,26 +314,23 @@ class DecoderInterface:
             - Optionally calculate additional datalines (derivatives, etc.).
             - Optionally calculate landmarks (edges, peaks, etc.).
             - Optionally calculate symbol intervals.
+            - Map the symbol intervals to sample indices and aggregate closed intervals (see get_symbol_range and
+              get_symbol_aggregates).
             - Optionally assign value to each symbol interval.
-            - Optionally the sequence from the symbol values.
+            - Optionally calculate the sequence from the symbol values.
+            - Update the generations of the results that changed.
             - If the debug flag is set, perform some error checks.
+        Every stage can get the values it has not processed yet with get_window.
         """
         self.empty_receiver_buffers()
-        self.pre_processing()
-        self.calculate_additional_datalines()
-        self.calculate_landmarks()
-        self.calculate_symbol_intervals()
-        self.calculate_symbol_values()
-        self.calculate_sequence()
-
-        if __debug__:
-            self.check()
+        self.run_stages()
 
     def decoder_removed(self):
         """
         Do stuff when decoder is removed.
         Can be implemented in the decoder implementation.
         """
+        self.close_journals()
         self.shutdown()
         pass
 
@@ -269,14 +358,20 @@ class DecoderInterface:
     def empty_receiver_buffers(self):
         """
         Checks if there is new measurement data in the receiver buffers and possibly stores them in timestamps/values.
+        All pending measurements of a receiver are taken at once and stored with a single block append.
+        A warning is shown if measurements were dropped because a receiver buffer overflowed.
         """
         for receiver_index in range(len(self.receivers)):
-            available_count = self.receivers[receiver_index].get_available()
-            for available in range(available_count):
-                measurement = self.receivers[receiver_index].get(0)
-                timestamp, values = measurement['timestamp'], measurement['values']
-                self.append(receiver_index, timestamp, values)
-                self.lengths[receiver_index] += 1
+            receiver = self.receivers[receiver_index]
+            timestamps, values = receiver.get_block()
+            if timestamps is not None:
+                self.append_block(receiver_index, timestamps, values)
+
+            overflow_count = receiver.get_overflow_count()
+            if overflow_count > self.overflow_counts[receiver_index]:
+                dropped = overflow_count - self.overflow_counts[receiver_index]
+                Logging.warning(f"Buffer of receiver {self.receiver_names[receiver_index]} overflowed, {dropped} measurements were dropped.")
+                self.overflow_counts[receiver_index] = overflow_count
 
     def export_custom(self, workbook, directory, time_format_system=True, dataset_additional_name=None):
         """
@@ -378,27 +473,108 @@ class DecoderInterface:
                 symbol_values_str = symbol_values_str.replace("[", "").replace("]", "").replace("'", "").replace(" ", "")
                 file.write(symbol_values_str)
 
+    @staticmethod
+    def fingerprint(data):
+        """
+        Cheap summary of a result that is used to detect changes: the length and the last element of sequences.
+        Results usually grow at the end, changes in the middle without a change of the length or the last element are
+        not detected, stages that modify results in place have to call touch.
+        :param data: Result, e.g. an additional dataline, a landmark or a symbol stream.
+        :return: Fingerprint that can be compared with ==.
+        """
+        if isinstance(data, dict):
+            return tuple((key, DecoderInterface.fingerprint(value)) for key, value in data.items())
+        if data is None or (np.isscalar(data) and not isinstance(data, str)):
+            return data
+        length = len(data)
+        if length == 0:
+            return 0, None
+        last = data[-1]
+        if isinstance(last, np.ndarray):
+            last = last.tobytes()
+        elif isinstance(last, (list, tuple)):
+            last = DecoderInterface.fingerprint(last)
+        return length, last
+
     def get_decoded(self):
         """
         Returns current decoder values.
         :return: Current decoder values.
         """
+        # The lists are copied (the arrays are views), so they stay consistent with each other while the decoder
+        # continues, e.g. the symbol boundaries with the offsets. The symbol lists are published as snapshots that
+        # only copy the new elements (see ListPublisher), streams that were rewritten in place have to be touched.
+        touched, self.touched = self.touched, set()
+        publishers, interval_index = self.publishers, self.interval_index
         self.decoded = {
             'received': {
-                'lengths': self.lengths,
-                'timestamps': self.timestamps,
-                'values': self.received
+                'lengths': self.lengths.copy(),
+                'offsets': self.offsets.copy(),
+                'pyramids': [pyramid.snapshot() for pyramid in self.pyramids],
+                'timestamps': self.timestamps.copy(),
+                'values': self.received.copy()
             },
-            'additional_datalines': self.additional_datalines,
-            'landmarks': self.landmarks,
+            'additional_datalines': self.additional_datalines.copy(),
+            'landmarks': self.landmarks.copy(),
             'min_timestamp': self.min_timestamp,
             'max_timestamp': self.max_timestamp,
-            'symbol_intervals': self.symbol_intervals,
-            'symbol_values': self.symbol_values,
-            'sequence': self.sequence
+            'symbol_intervals': publishers['symbol_intervals'].publish(self.symbol_intervals, rewritten='symbol_intervals' in touched),
+            'symbol_aggregates': [publisher.publish(aggregates) for publisher, aggregates in zip(publishers['symbol_aggregates'], interval_index.aggregates)],
+            # Only resolved boundaries are final (see IntervalIndex)
+            'symbol_boundaries': [publisher.publish(boundaries, stable=resolved) for publisher, boundaries, resolved in zip(publishers['symbol_boundaries'], interval_index.boundaries, interval_index.resolved)],
+            'symbol_values': publishers['symbol_values'].publish(self.symbol_values, rewritten='symbol_values' in touched),
+            'sequence': self.sequence,
+            'generations': {key: value.copy() if isinstance(value, list) else value for key, value in self.generations.items()}
         }
         return self.decoded
 
+    def get_symbol_aggregates(self, receiver_index, interval_index):
+        """
+        Gets aggregates (min, max, mean, argmin, argmax, count, ...) of the values of a receiver in a symbol interval.
+        They are computed once when the interval is closed, i.e., when the receiver has values after its end edge.
+        Only available after calculate_symbol_intervals.
+        :param receiver_index: Index of desired receiver.
+        :param interval_index: Index of the symbol interval.
+        :return: Dictionary with the aggregates per sensor (see IntervalIndex.aggregate), None if the interval is not
+        closed yet.
+        """
+        return self.interval_index.get_aggregates(receiver_index, interval_index)
+
+    def get_symbol_range(self, receiver_index, interval_index):
+        """
+        Gets the values of a receiver that belong to a symbol interval, i.e., the values after the start edge up to
+        (including) the end edge. Only available after calculate_symbol_intervals.
+        :param receiver_index: Index of desired receiver.
+        :param interval_index: Index of the symbol interval.
+        :return: Start and stop index (exclusive) in the received arrays.
+        """
+        return self.interval_index.get_range(receiver_index, interval_index)
+
+    def get_window(self, receiver_index, lookback=None):
+        """
+        Gets the values of a receiver that the currently running stage has not processed yet, together with some
+        look-back values before them (e.g. for filters or differences).
+        The look-back of a stage can be configured in lookbacks, e.g. {'calculate_symbol_intervals': 1}.
+        After the stage has finished, all values of this step count as processed (see run_stage).
+        :param receiver_index: Index of desired receiver.
+        :param lookback: Number of look-back values, if None, the configured look-back of the stage is used.
+        :return: Dictionary with the index of the first window value in the received arrays ('start'), the index of the
+        first new value in the window ('new'), timestamps and values, or None if there are no new values.
+        """
+        if lookback is None:
+            lookback = self.lookbacks.get(self.stage, 0)
+        length = self.lengths[receiver_index]
+        new_start = max(self.watermarks[self.stage][receiver_index] - self.offsets[receiver_index], 0)
+        if new_start >= length:
+            return None
+        start = max(new_start - lookback, 0)
+        return {
+            'start': start,
+            'new': new_start - start,
+            'timestamps': self.timestamps[receiver_index][start:length],
+            'values': self.received[receiver_index][start:length]
+        }
+
     def get_received(self, receiver_index, sensor_index=-1):
         """
         Gets receiver values.
@@ -412,6 +588,66 @@ class DecoderInterface:
             return None
         return values[receiver_index][:lengths[receiver_index], :] if sensor_index == -1 else values[receiver_index][:lengths[receiver_index], sensor_index]
 
+    def update_received(self, receiver_index):
+        """
+        Updates length and views of the received data of a given receiver after new values have been stored.
+        :param receiver_index: Receiver index.
+        """
+        store = self.stores[receiver_index]
+        self.lengths[receiver_index] = store.length
+        self.offsets[receiver_index] = store.offset
+        self.timestamps[receiver_index] = store.timestamps
+        self.received[receiver_index] = store.values
+        self.generations['received'][receiver_index] = self.next_generation()
+
+        # The stores track their own timestamp extrema, so no data has to be scanned here
+        filled = [store for store in self.stores if store.length > 0]
+        self.min_timestamp = min(store.min_timestamp for store in filled) if filled else time.time()
+        self.max_timestamp = max(store.max_timestamp for store in filled) if filled else time.time()
+
+    def is_changed(self, key, data):
+        """
+        Checks whether a result changed since the last call by comparing its fingerprint.
+        :param key: Key of the result.
+        :param data: Result.
+        :return: True if the result changed.
+        """
+        fingerprint = DecoderInterface.fingerprint(data)
+        if key in self.fingerprints and self.fingerprints[key] == fingerprint:
+            return False
+        self.fingerprints[key] = fingerprint
+        return True
+
+    def next_generation(self):
+        """
+        Generates a new (unique) generation number.
+        :return: Generation number.
+        """
+        self.generation += 1
+        return self.generation
+
+    def open_journals(self):
+        """
+        Creates a journal file for every receiver in JOURNAL_DIRECTORY, the decoder info and parameter values are
+        stored in the header of the journals.
+        If the files cannot be created, journaling is disabled until the decoder is started again.
+        """
+        directory = SettingsStore.settings['JOURNAL_DIRECTORY']
+        name = time.strftime("%Y-%m-%d_%H-%M-%S")
+        info = dict(self.info, parameter_values=self.parameter_values, start_time=time.time())
+        try:
+            os.makedirs(directory, exist_ok=True)
+            for receiver_index in range(self.num_receivers):
+                path = os.path.join(directory, f"{name}_{receiver_index}_{self.receiver_names[receiver_index]}.journal")
+                journal_info = dict(info, receiver_index=receiver_index)
+                self.journals.append(CaptureJournal(path, self.receivers[receiver_index].num_sensors, journal_info, SettingsStore.settings['JOURNAL_CHUNK_LENGTH']))
+        except OSError as e:
+            Logging.error(f"Failed to create journal files: {e}")
+            self.close_journals()
+            self.journaling = False
+            return
+        Logging.info(f"Writing journal files to {os.path.abspath(directory)}.")
+
     def parameters_edited(self, parameter_values):
         """
         Do stuff when the parameters are edited by the user.
@@ -429,12 +665,12 @@ class DecoderInterface:
     def start(self):
         """
         Starts the decoder.
-        Runs the listen function of the receiver in a new (daemon) thread.
+        The receivers start listening (see ReceiverInterface.start_listen).
         """
+        self.journaling = SettingsStore.settings['JOURNAL_ENABLED']
         self.decoder_started()
-        for receiver_index in range(self.num_receivers):
-            thread = threading.Thread(target=self.receivers[receiver_index].listen, daemon=True)
-            thread.start()
+        for receiver in self.receivers:
+            receiver.start_listen()
         self.active = True
 
     def stop(self):
@@ -445,3 +681,79 @@ class DecoderInterface:
         for receiver in self.receivers:
             receiver.stop_listen()
         self.decoder_stopped()
+        self.journaling = False
+        self.close_journals()
+
+    def run_stages(self):
+        """
+        Runs all stages of the decode pipeline on the current values (see decode).
+        This is separate from emptying the receiver buffers, so the stages can also run in another process (see
+        Models/DecodeProcess.py).
+        """
+        for stage in STAGES:
+            self.run_stage(stage)
+            if stage == 'calculate_symbol_intervals':
+                self.interval_index.update(self.symbol_intervals, self.timestamps, self.received, self.lengths, self.offsets)
+        self.update_generations()
+
+        if __debug__:
+            self.check()
+
+    def run_stage(self, stage):
+        """
+        Runs a stage of the decode pipeline and afterwards marks all current values as processed by this stage.
+        The watermarks are absolute indices, so they stay valid when old values are evicted.
+        :param stage: Name of the stage, see STAGES.
+        """
+        self.stage = stage
+        getattr(self, stage)()
+        self.stage = None
+        for receiver_index in range(self.num_receivers):
+            self.watermarks[stage][receiver_index] = self.offsets[receiver_index] + self.lengths[receiver_index]
+
+    def touch(self, name, index=None):
+        """
+        Assigns a new generation to a result, e.g. after a stage modified a result in place in a way the fingerprint
+        does not detect (see update_generations). Symbol streams that were touched are published completely again
+        (see get_decoded).
+        :param name: Name of the result, e.g. 'landmarks'.
+        :param index: Index of the additional dataline or landmark, None for the symbol streams.
+        """
+        if index is None:
+            self.generations[name] = self.next_generation()
+            self.touched.add(name)
+        else:
+            self.generations[name][index] = self.next_generation()
+
+    def update_generations(self):
+        """
+        Assigns a new generation to every additional dataline, landmark and symbol stream that changed in this step.
+        Consumers such as the views can compare generations to skip unchanged parts.
+        All results are compared by their fingerprint (length and last element), so every step costs O(1) per result
+        and appended elements are detected. Changes in the middle have to be reported with touch.
+        The generations of the received values are updated whenever new values are stored.
+        """
+        for name in ['additional_datalines', 'landmarks']:
+            results = getattr(self, name)
+            for index in range(len(results)):
+                if self.is_changed((name, index), results[index]):
+                    self.generations[name][index] = self.next_generation()
+        for name in ['symbol_intervals', 'symbol_values', 'sequence']:
+            if self.is_changed((name,), getattr(self, name)):
+                self.generations[name] = self.next_generation()
+
+    def write_journal(self, receiver_index, timestamps, values):
+        """
+        Writes new values of a receiver to its journal file (if journaling is enabled).
+        The journal files are created with the first values of a capture.
+        :param receiver_index: Receiver index.
+        :param timestamps: New timestamps, dimensions (k).
+        :param values: New measurement values, dimensions (k, sensors).
+        """
+        if not self.journaling:
+            return
+        if not self.journals:
+            self.open_journals()
+            if not self.journals:
+                return
+        self.journals[receiver_index].append(timestamps, values)
@@ -1,10 +1,10 @@
-import sys
 import numpy as np
 import threading
 import time, datetime
 
 from Utils import Logging
 from Utils.Settings import SettingsStore
+from Utils.TimeSeriesStore import TimeSeriesStore
 
 LOOP_DELAY_MS = 10
 
@@ -32,6 +32,9 @@ class EncoderInterface:
         self.recording = False
         self.plot_settings = {}
 
+        self.generation = 0
+        self.generations = []
+        self.stores = []
         self.timestamps = []
         self.transmitted = []
         self.lengths = []
@@ -57,6 +60,8 @@ class EncoderInterface:
         }
 
         for transmitter_index in range(self.num_transmitters):
+            self.stores.append(TimeSeriesStore(SettingsStore.settings['ENCODER_ARRAY_LENGTH']))
+            self.generations.append(self.next_generation())
             self.timestamps.append(None)
             self.transmitted.append(None)
             self.lengths.append(0)
@@ -69,35 +74,17 @@ class EncoderInterface:
         :param timestamp: New timestamp.
         :param values: New measurement values.
         """
-        dataset_length = self.lengths[transmitter_index]
-        if dataset_length == 0:
-            self.timestamps[transmitter_index] = np.empty((SettingsStore.settings['ENCODER_ARRAY_LENGTH'],))
-            self.timestamps[transmitter_index][0] = timestamp
-            self.transmitted[transmitter_index] = np.empty(
-                (SettingsStore.settings['ENCODER_ARRAY_LENGTH'], len(values)))
-            self.transmitted[transmitter_index][0] = np.array(values)
-        else:
-            if dataset_length == len(self.timestamps[transmitter_index]):  # maximum size reached -> allocate more
-                self.timestamps[transmitter_index] = np.concatenate((self.timestamps[transmitter_index], np.empty(
-                    (SettingsStore.settings['ENCODER_ARRAY_LENGTH'],))))
-                self.transmitted[transmitter_index] = np.vstack((self.transmitted[transmitter_index], np.empty(
-                    (SettingsStore.settings['ENCODER_ARRAY_LENGTH'], len(values)))))
-
-            self.timestamps[transmitter_index][dataset_length] = timestamp
-            self.transmitted[transmitter_index][dataset_length] = values
-
-        self.lengths[transmitter_index] += 1
-
-        min_timestamp = sys.float_info.max  # init with maximum value
-        max_timestamp = 0  # init with minimum value
-        for t_idx in range(len(self.timestamps)):
-            if self.lengths[t_idx] > 0:
-                min_tmp = np.min(self.timestamps[t_idx][:self.lengths[t_idx]])
-                max_tmp = np.max(self.timestamps[t_idx][:self.lengths[t_idx]])
-                if min_tmp < min_timestamp:
-                    min_timestamp = min_tmp
-                if max_tmp > max_timestamp:
-                    max_timestamp = max_tmp
+        store = self.stores[transmitter_index]
+        store.append(timestamp, values)
+        self.lengths[transmitter_index] = store.length
+        self.timestamps[transmitter_index] = store.timestamps
+        self.transmitted[transmitter_index] = store.values
+        self.generations[transmitter_index] = self.next_generation()
+
+        # The stores track their own timestamp extrema, so no data has to be scanned here
+        filled = [store for store in self.stores if store.length > 0]
+        min_timestamp = min(store.min_timestamp for store in filled)
+        max_timestamp = max(store.max_timestamp for store in filled)
 
         now = time.time()
         self.min_timestamp = min(min_timestamp, now)
@@ -122,9 +109,13 @@ class EncoderInterface:
         Clears all data from the encoder recording.
         """
         # Clear received
+        for store in self.stores:
+            store.clear()
         self.lengths = [0] * self.num_transmitters
         self.transmitted = [None] * self.num_transmitters
         self.timestamps = [None] * self.num_transmitters
+        # Generations are never reused so consumers cannot mistake new data for old
+        self.generations = [self.next_generation()] * self.num_transmitters
 
         self.min_timestamp = time.time()
         self.max_timestamp = time.time()
@@ -197,6 +188,14 @@ class EncoderInterface:
         """
         return self.recording
 
+    def next_generation(self):
+        """
+        Generates a new (unique) generation number.
+        :return: Generation number.
+        """
+        self.generation += 1
+        return self.generation
+
     def set_recording(self, active):
         """
         set the recording mode of the encoder.
@@ -341,6 +340,9 @@ class EncoderInterface:
                 'values': self.transmitted
             },
             'min_timestamp': self.min_timestamp,
-            'max_timestamp': self.max_timestamp
+            'max_timestamp': self.max_timestamp,
+            'generations': {
+                'transmitted': self.generations.copy()
+            }
         }
         return self.encoded
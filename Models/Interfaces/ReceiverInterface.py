@@ -1,5 +1,9 @@
+import threading
 import time
-from Utils import Logging
+import numpy as np
+
+from Utils import Logging, SerialLoop
+from Utils.RingBuffer import RingBuffer
 from Utils.Settings import SettingsStore
 
 
@@ -16,9 +20,14 @@ class ReceiverInterface:
         """
         self.decoder = decoder
 
-        self.buffer = []
+        self.buffer = None
+        # Set whenever new measurements are in the buffer, the decoder shares one event between all its receivers
+        self.data_available = threading.Event()
         self.drop_first_measurements = 0
+        self.last_block_time = None
         self.num_sensors = None
+        # Protocol while the serial port is serviced by the serial event loop (see Utils/SerialLoop.py)
+        self.protocol = None
         self.running = False
         self.sensor_names = None
         self.sleep_time = 0.001
@@ -35,37 +44,124 @@ class ReceiverInterface:
             Logging.warning("Sensor names do not match number of sensors!")
             self.sensor_names = ["Sensor" + str(i + 1) for i in range(self.num_sensors)]
 
+        self.buffer = RingBuffer(self.num_sensors, SettingsStore.settings['RECEIVER_BUFFER_LENGTH'],
+                                 SettingsStore.settings['RECEIVER_BUFFER_OVERFLOW_POLICY'])
+
+    def create_protocol(self):
+        """
+        Creates a protocol (see Utils/SerialLoop.py) that passes the data of the serial port of the receiver to it, so
+        the serial event loop can service the port instead of a listen thread.
+        Can be overridden in receivers that read from a serial port.
+        :return: Protocol, None if not supported by the receiver.
+        """
+        return None
+
+    def start_listen(self):
+        """
+        Starts checking for new measurement values.
+        If enabled (SERIAL_BACKEND) and supported by the receiver, the serial event loop services the port, otherwise
+        listen runs in a new (daemon) thread.
+        """
+        if SettingsStore.settings['SERIAL_BACKEND'] == 'asyncio':
+            protocol = self.create_protocol()
+            if protocol is not None and SerialLoop.attach(protocol):
+                self.protocol = protocol
+                self.running = True
+                return
+        threading.Thread(target=self.listen, daemon=True).start()
+
     def listen(self):
         """
         Runs an infinite loop of calling listen_step to check for new measurement values.
+        Receivers whose listen_step blocks until data arrives (e.g. serial reads with a timeout) should set sleep_time
+        to 0, otherwise sleep_time is waited between the calls.
         """
         self.running = True
         while self.running:
             self.listen_step()
-            time.sleep(self.sleep_time)
+            if self.sleep_time > 0:
+                time.sleep(self.sleep_time)
 
     def listen_step(self):
         """
         Check for new measurement values.
         This function will be executed periodically.
         Should be overridden in the concrete receiver implementation.
+        It should wait for new values with a timeout (in the order of 0.1 seconds) instead of returning immediately, so
+        the receiver does not poll while idle and stop_listen still takes effect.
         """
         Logging.warning("listen_step not implemented in your receiver!", repeat=False)
 
+    def clear_buffer(self):
+        """
+        Discards all measurements in the buffer.
+        """
+        self.buffer.clear()
+
     def get_available(self):
         """
         Get how many measurements are available in the buffer.
         :return: length of the buffer.
         """
-        return len(self.buffer)
+        return self.buffer.get_available()
 
-    def get(self, idx):
+    def get(self, idx=0):
         """
-        Removes and returns a measurement of the buffer.
-        :param idx: index of the measurement to be removed from the buffer.
-        :return: removed measurement.
+        Removes and returns the oldest measurement of the buffer.
+        :param idx: only the oldest measurement (idx=0) can be removed from the ring buffer.
+        :return: removed measurement, None if the buffer is empty.
+        """
+        if idx != 0:
+            Logging.warning("Measurements can only be removed from the buffer in order, returning the oldest one.", repeat=False)
+        timestamp, values = self.buffer.get()
+        if timestamp is None:
+            return None
+        return {'timestamp': timestamp, 'values': values}
+
+    def get_block(self):
         """
-        return self.buffer.pop(idx)
+        Removes and returns all measurements that are currently available in the buffer.
+        :return: Timestamps, dimensions (k), and values, dimensions (k, sensors), or (None, None) if the buffer is empty.
+        """
+        return self.buffer.get_block()
+
+    def get_block_timestamps(self, count):
+        """
+        Generates timestamps for measurements that arrived since the last call, they are spread evenly between the time
+        of the last call and now.
+        Should be called in every listen_step of receivers that read several measurements at once.
+        :param count: number of measurements.
+        :return: timestamps, dimensions (count).
+        """
+        now = time.time()
+        start = now if self.last_block_time is None else self.last_block_time
+        self.last_block_time = now
+        return np.linspace(start, now, count + 1)[1:]
+
+    def get_overflow_count(self):
+        """
+        Get how many measurements were dropped because the buffer was full.
+        :return: number of dropped measurements.
+        """
+        return self.buffer.overflow_count
+
+    def append_block(self, timestamps, values):
+        """
+        Appends a block of measurements to the buffer.
+        :param timestamps: timestamps when the values were measured, dimensions (k).
+        :param values: values to be appended, dimensions (k, sensors).
+        """
+        timestamps = np.asarray(timestamps, dtype=float)
+        values = np.asarray(values, dtype=float).reshape(len(timestamps), -1)
+
+        if self.drop_first_measurements > 0:
+            dropped = min(self.drop_first_measurements, len(timestamps))
+            self.drop_first_measurements -= dropped
+            timestamps, values = timestamps[dropped:], values[dropped:]
+
+        if len(timestamps) > 0:
+            self.buffer.put_block(timestamps, values)
+            self.data_available.set()
 
     def append_values(self, values, timestamp=None):
         """
@@ -83,7 +179,8 @@ class ReceiverInterface:
 
         if timestamp is None:
             timestamp = time.time()
-        self.buffer.append({'timestamp': timestamp, 'values': values})
+        self.buffer.put(timestamp, values)
+        self.data_available.set()
 
     def shutdown(self):
         #Allow for any closing stuff
@@ -94,3 +191,6 @@ class ReceiverInterface:
         Terminates the infinite loop of calling listen_step to check for new measurement values.
         """
         self.running = False
+        if self.protocol is not None:
+            SerialLoop.detach(self.protocol)
+            self.protocol = None
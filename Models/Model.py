@@ -1,7 +1,10 @@
 import importlib
 import os
 
+from Models.DecodeProcess import DecodeProcess
+from Models.DecodeWorker import DecodeWorker
 from Utils import Logging
+from Utils.Settings import SettingsStore
 
 
 class Model:
@@ -15,6 +18,7 @@ class Model:
         """
         self.encoder = None
         self.decoder = None
+        self.decode_worker = None
 
     def add_decoder(self, decoder_type, parameters, parameter_values):
         """
@@ -76,13 +80,25 @@ class Model:
         names = [name_extension[0] for name_extension in names_extensions]
         return names
 
+    def clear_decoder(self):
+        """
+        Clears the decoder, a running decode step is finished first.
+        """
+        if self.decode_worker is not None:
+            self.decode_worker.clear()
+        else:
+            self.decoder.clear()
+
     def get_decoded(self):
         """
         Gets value updates from the decoder.
+        While the decoder is running, the values of the last finished decode step are returned.
         Note: Do not use is_decoder_available, since get_decoded also gets executed when the plot is not active (stopped).
         :return: Decoder value updates if it is available, else None.
         """
-        if self.decoder is not None:
+        if self.decode_worker is not None and self.decode_worker.get_snapshot() is not None:
+            return self.decode_worker.get_snapshot()
+        elif self.decoder is not None:
             return self.decoder.get_decoded()
         else:
             return None
@@ -186,17 +202,37 @@ class Model:
         """
         Removes the decoder.
         """
+        self.stop_decode_worker()
         self.decoder.decoder_removed()
         self.decoder = None
 
     def start_decoder(self):
         """
-        Starts the decoder.
+        Starts the decoder and a worker that runs the decode pipeline (in a thread or a separate process, see
+        DECODER_BACKEND in the settings).
         """
         self.decoder.start()
+        process = DecodeProcess(self.decoder) if SettingsStore.settings['DECODER_BACKEND'] == 'process' else None
+        self.decode_worker = DecodeWorker(self.decoder, SettingsStore.settings['DECODER_UPDATES_PER_SECOND'], SettingsStore.settings['DECODER_TIME_BUDGET'], process)
+        try:
+            self.decode_worker.start()
+        except Exception as e:
+            # E.g. the decoder cannot be copied to another process
+            Logging.error(f"Failed to start decode process ({e}), decoding in a thread instead.")
+            self.decode_worker = DecodeWorker(self.decoder, SettingsStore.settings['DECODER_UPDATES_PER_SECOND'], SettingsStore.settings['DECODER_TIME_BUDGET'])
+            self.decode_worker.start()
+
+    def stop_decode_worker(self):
+        """
+        Stops the decode worker (if it is running).
+        """
+        if self.decode_worker is not None:
+            self.decode_worker.stop()
+            self.decode_worker = None
 
     def stop_decoder(self):
         """
-        Stops the decoder.
+        Stops the decode worker and the decoder.
         """
+        self.stop_decode_worker()
         self.decoder.stop()
@@ -17,4 +17,6 @@ class ExampleReceiver(ReceiverInterface):
 
     def listen_step(self):
         # Implement: Listen for new measurement values
+        # Wait for them with a timeout (e.g. serial read) and set self.sleep_time = 0 in __init__, so the receiver does
+        # not poll while idle
         pass
\ No newline at end of file
@@ -1,8 +1,14 @@
 import unittest
 import os
 import importlib
+import importlib.util
 import sys
 
+import numpy as np
+
+# The views can only be tested if PyQt5 and pyqtgraph are installed
+HAS_QT = importlib.util.find_spec('PyQt5') is not None and importlib.util.find_spec('pyqtgraph') is not None
+
 
 def is_same_shape2(l1, l2):
     return len(l1) == len(l2) and all([len(l1[i]) == len(l2[i]) for i in range(len(l1))])
@@ -12,6 +18,12 @@ def message(msg, mod):
     return msg + " [Module: " + str(mod) + "]."
 
 
+def get_application():
+    from PyQt5.QtWidgets import QApplication
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    return QApplication.instance() or QApplication([])
+
+
 class TestDecoders(unittest.TestCase):
     SINGLE_FILE = None
 
@@ -107,6 +119,972 @@ class TestTransmitters(unittest.TestCase):
     pass
 
 
+class TestTimeSeriesStore(unittest.TestCase):
+    def test_growth(self):
+        from Utils.TimeSeriesStore import TimeSeriesStore
+        store = TimeSeriesStore(4)
+        for i in range(100):
+            store.append(float(i), [i, -i])
+        self.assertEqual(store.length, 100)
+        self.assertGreaterEqual(store.capacity, 100)
+        self.assertTrue(np.array_equal(store.timestamps, np.arange(100)))
+        self.assertTrue(np.array_equal(store.values[:, 1], -np.arange(100)))
+        self.assertTrue(store.column(0).flags['C_CONTIGUOUS'])
+
+    def test_discard(self):
+        from Utils.TimeSeriesStore import TimeSeriesStore
+        store = TimeSeriesStore(4)
+        store.extend(np.arange(10.0), np.arange(10.0).reshape(-1, 1))
+        old_timestamps = store.timestamps
+        store.discard(6)
+        self.assertEqual(store.offset, 6)
+        self.assertTrue(np.array_equal(store.timestamps, np.arange(6, 10)))
+        self.assertEqual(store.min_timestamp, 6)
+        self.assertTrue(np.array_equal(old_timestamps, np.arange(10)))
+
+    def test_timestamp_range(self):
+        from Utils.TimeSeriesStore import TimeSeriesStore
+        store = TimeSeriesStore(4, 1)
+        self.assertIsNone(store.min_timestamp)
+        self.assertIsNone(store.max_timestamp)
+        store.append(5.0, [0])
+        store.append(3.0, [0])
+        store.extend(np.array([7.0, 1.0, 4.0]), np.zeros((3, 1)))
+        store.append(6.0, [0])
+        self.assertEqual((store.min_timestamp, store.max_timestamp), (1.0, 7.0))
+        store.clear()
+        self.assertIsNone(store.min_timestamp)
+        self.assertIsNone(store.max_timestamp)
+        store.extend(np.array([10.0, 9.0]), np.zeros((2, 1)))
+        self.assertEqual((store.min_timestamp, store.max_timestamp), (9.0, 10.0))
+
+
+class TestRingBuffer(unittest.TestCase):
+    def test_overflow(self):
+        from Utils.RingBuffer import RingBuffer
+        buffer = RingBuffer(2, 8, policy='drop_oldest')
+        for i in range(20):
+            buffer.put(float(i), [i, -i])
+        timestamps, values = buffer.get_block()
+        self.assertTrue(np.array_equal(timestamps, np.arange(12, 20)))
+        self.assertTrue(np.array_equal(values[:, 1], -np.arange(12, 20)))
+        self.assertEqual(buffer.overflow_count, 12)
+
+        buffer = RingBuffer(2, 8, policy='drop_newest')
+        for i in range(20):
+            buffer.put(float(i), [i, -i])
+        timestamp, values = buffer.get()
+        self.assertEqual(timestamp, 0.0)
+        timestamps, values = buffer.get_block()
+        self.assertTrue(np.array_equal(timestamps, np.arange(1, 8)))
+        self.assertEqual(buffer.overflow_count, 12)
+        self.assertEqual(buffer.get_available(), 0)
+
+    def test_put_block(self):
+        from Utils.RingBuffer import RingBuffer
+        buffer = RingBuffer(1, 8, policy='drop_oldest')
+        buffer.put_block(np.arange(5.0), np.arange(5.0).reshape(-1, 1))
+        buffer.get_block(3)
+        buffer.put_block(np.arange(5.0, 10.0), np.arange(5.0, 10.0).reshape(-1, 1))
+        timestamps, values = buffer.get_block()
+        self.assertTrue(np.array_equal(timestamps, np.arange(3, 10)))
+        self.assertTrue(np.array_equal(values[:, 0], timestamps))
+
+        buffer.put_block(np.arange(20.0), np.arange(20.0).reshape(-1, 1))
+        timestamps, values = buffer.get_block()
+        self.assertTrue(np.array_equal(timestamps, np.arange(12, 20)))
+        self.assertEqual(buffer.overflow_count, 12)
+
+    def test_concurrent_put_block(self):
+        from Utils.RingBuffer import RingBuffer
+
+        class InterleavedRingBuffer(RingBuffer):
+            # The consumer reads as soon as the producer moves the write counter
+            consumer = None
+
+            def __setattr__(self, name, value):
+                super().__setattr__(name, value)
+                if name == '_write' and self.consumer is not None:
+                    consumer, self.consumer = self.consumer, None
+                    self.read_during_write = consumer()
+
+        buffer = InterleavedRingBuffer(1, 8, policy='drop_oldest')
+        buffer.put_block(np.arange(6.0), np.arange(6.0).reshape(-1, 1))
+        buffer.consumer = buffer.get_block
+        buffer.put_block(np.arange(100.0, 120.0), np.arange(100.0, 120.0).reshape(-1, 1))
+        # Only the new measurements are returned, not the old contents of the slots
+        timestamps, values = buffer.read_during_write
+        self.assertTrue(np.array_equal(timestamps, np.arange(112.0, 120.0)))
+        self.assertTrue(np.array_equal(values[:, 0], timestamps))
+        self.assertEqual(buffer.get_block(), (None, None))
+        # The unread measurements and the skipped part of the block
+        self.assertEqual(buffer.overflow_count, 6 + 12)
+
+
+class TestCaptureJournal(unittest.TestCase):
+    def test_round_trip(self):
+        import tempfile
+        from Utils.CaptureJournal import CaptureJournal
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'test.journal')
+            journal = CaptureJournal(path, 2, {'names': ['A', 'B']}, 7)
+            timestamps = np.arange(20.0)
+            journal.append(timestamps, np.stack([timestamps, -timestamps], axis=1))
+            # Readable before the journal is closed
+            info, read_timestamps, read_values = CaptureJournal.read(path)
+            self.assertEqual(info['names'], ['A', 'B'])
+            self.assertTrue(np.array_equal(read_timestamps, timestamps))
+            self.assertTrue(np.array_equal(read_values[:, 1], -timestamps))
+            del read_timestamps, read_values
+            journal.close()
+            self.assertEqual(len(CaptureJournal.read(path)[1]), 20)
+
+    def test_commit_order(self):
+        import tempfile
+        from types import SimpleNamespace
+        from Utils.CaptureJournal import CaptureJournal
+        with tempfile.TemporaryDirectory() as directory:
+            journal = CaptureJournal(os.path.join(directory, 'test.journal'), 1, {}, 100)
+            journal.append(np.arange(10.0), np.zeros((10, 1)))
+            # The samples are flushed before the new length is written to the header
+            calls = []
+            file = journal._file
+            flush = journal.flush
+            journal.flush = lambda: (calls.append('flush'), flush())
+            journal._file = SimpleNamespace(seek=file.seek, flush=file.flush,
+                                            write=lambda data: (calls.append('write'), file.write(data))[1])
+            journal.append(np.arange(10.0, 20.0), np.zeros((10, 1)))
+            self.assertEqual(calls, ['flush', 'write'])
+            journal._file = file
+            journal.close()
+
+
+class TestStreamingFilter(unittest.TestCase):
+    def test_gaussian(self):
+        import scipy.ndimage
+        from Utils.StreamingFilter import StreamingGaussianFilter
+        signal = np.cumsum(np.random.default_rng(0).normal(size=1000))
+        timestamps = np.arange(1000.0)
+        streaming_filter = StreamingGaussianFilter(3.0, 16)
+        radius = streaming_filter.radius
+        previous, previous_values = None, None
+        for length in range(1, 1000, 37):
+            filtered = streaming_filter.update(timestamps[:length], signal[:length])
+            self.assertEqual(len(filtered), max(length - radius, 0))
+            self.assertTrue(np.array_equal(filtered, scipy.ndimage.gaussian_filter1d(signal[:length], 3.0)[:len(filtered)]))
+            # Filtered values that were returned before are not changed
+            if previous is not None:
+                self.assertTrue(np.array_equal(previous, previous_values))
+            previous, previous_values = filtered, filtered.copy()
+
+    def test_offset(self):
+        import scipy.ndimage
+        from Utils.StreamingFilter import StreamingGaussianFilter
+        signal = np.cumsum(np.random.default_rng(1).normal(size=1000))
+        timestamps = np.arange(1000.0)
+        # E.g. a filter that is created after values were evicted
+        streaming_filter = StreamingGaussianFilter(2.0, 16)
+        for length in [400, 600, 800]:
+            filtered = streaming_filter.update(timestamps[300:length], signal[300:length], 300)
+            self.assertEqual(streaming_filter.output.offset, 300)
+            expected = scipy.ndimage.gaussian_filter1d(signal[300:length], 2.0)[:length - 300 - streaming_filter.radius]
+            self.assertTrue(np.array_equal(filtered, expected))
+            self.assertTrue(np.array_equal(streaming_filter.output.timestamps, timestamps[300:300 + len(filtered)]))
+
+        # Evicted values are discarded from the filtered signal as well
+        filtered = streaming_filter.update(timestamps[500:900], signal[500:900], 500)
+        self.assertEqual(streaming_filter.output.offset, 500)
+        self.assertEqual(len(filtered), 400 - streaming_filter.radius)
+        self.assertTrue(np.array_equal(streaming_filter.output.timestamps, timestamps[500:500 + len(filtered)]))
+        self.assertTrue(np.array_equal(filtered[:290], expected[200:490]))
+
+
+class TestSymbolSynchronizer(unittest.TestCase):
+    @staticmethod
+    def reference_tick(state, timestamps, signal, symbol_duration, threshold_factor):
+        # Previous (non-incremental) detection of the decoders, called once per decoder tick
+        if state['first_symbol_edge'] > 0:
+            next_edge = state['intervals'][-1] + symbol_duration
+            if timestamps[-1] > next_edge:
+                state['intervals'].append(next_edge)
+        elif timestamps[-1] - timestamps[0] < 2:
+            return
+        elif state['threshold'] == 0:
+            quiet_stop = np.argmax(timestamps > timestamps[0] + 2)
+            min_value = min(signal[0:quiet_stop])
+            state['threshold'] = min_value + (max(signal[0:quiet_stop]) - min_value) * threshold_factor
+        else:
+            threshold_pass = np.argmax(signal > state['threshold'])
+            if threshold_pass > 0:
+                first_peak_end_limit = np.argmax(timestamps > timestamps[threshold_pass] + symbol_duration)
+                if first_peak_end_limit > 0:
+                    first_peak = np.argmax(signal[threshold_pass:first_peak_end_limit])
+                    state['first_symbol_edge'] = timestamps[threshold_pass + first_peak] - symbol_duration / 2
+                    state['intervals'] = [state['first_symbol_edge']]
+
+    def test_reference(self):
+        from Utils.SymbolSynchronizer import SymbolSynchronizer
+        timestamps = np.arange(0, 20, 0.013)
+        signal = np.random.default_rng(0).normal(scale=0.1, size=len(timestamps))
+        signal += 5 * np.exp(-((timestamps - 3.3) / 0.1) ** 2)
+
+        state = {'threshold': 0, 'first_symbol_edge': 0, 'intervals': []}
+        synchronizer = SymbolSynchronizer(1.0, 3.0)
+        intervals = []
+        for length in range(1, len(timestamps) + 1):
+            self.reference_tick(state, timestamps[:length], signal[:length], 1.0, 3.0)
+            intervals += synchronizer.update(timestamps[:length], signal[:length])
+        self.assertGreater(len(intervals), 10)
+        self.assertEqual(intervals, state['intervals'])
+
+        # Same edges for large blocks and evicted values
+        synchronizer.clear()
+        intervals = []
+        for length in range(500, len(timestamps) + 1, 500):
+            offset = max(length - 600, 0)
+            intervals += synchronizer.update(timestamps[offset:length], signal[offset:length], offset)
+        self.assertEqual(intervals, state['intervals'][:len(intervals)])
+        self.assertGreaterEqual(len(intervals), len(state['intervals']) - 1)
+
+
+class TestIntervalIndex(unittest.TestCase):
+    def test_incremental(self):
+        from Utils.IntervalIndex import IntervalIndex
+        timestamps = np.arange(100.0)
+        values = timestamps.reshape(-1, 1)
+        symbol_intervals = [2.5, 10.0, 30.5, 99.5, 150.0]
+        interval_index = IntervalIndex(1)
+        for length in list(range(0, 100, 9)) + [100]:
+            offset = max(length - 40, 0)
+            interval_index.update(symbol_intervals, [timestamps[offset:length]], [values[offset:length]], [length - offset], [offset])
+        self.assertEqual(interval_index.boundaries[0], list(np.searchsorted(timestamps, symbol_intervals, side='right')))
+        self.assertEqual(interval_index.resolved[0], 3)
+        self.assertEqual(interval_index.get_range(0, 2), (0, 40))
+        self.assertEqual(interval_index.get_range(0, 3), (40, 40))
+
+    def test_aggregates(self):
+        from Utils.IntervalIndex import IntervalIndex
+        timestamps = np.arange(20.0)
+        values = np.stack([np.sin(timestamps), -timestamps], axis=1)
+        interval_index = IntervalIndex(1)
+        interval_index.update([-0.5, 4.5, 4.7, 12.5, 30.0], [timestamps], [values], [20], [0])
+        self.assertEqual(len(interval_index.aggregates[0]), 3)
+        self.assertEqual(interval_index.get_aggregates(0, 1)['count'], 0)
+        aggregates = interval_index.get_aggregates(0, 2)
+        data = values[5:13]
+        self.assertEqual(aggregates['count'], 8)
+        self.assertTrue(np.array_equal(aggregates['max'], np.max(data, axis=0)))
+        self.assertTrue(np.array_equal(aggregates['argmin'], np.argmin(data, axis=0) + 5))
+        self.assertEqual(aggregates['max_before_min'][0], np.max(data[:np.argmin(data[:, 0]), 0]))
+        self.assertTrue(np.isnan(aggregates['min_before_max'][1]))
+
+    def test_replaced(self):
+        from Utils.IntervalIndex import IntervalIndex
+        timestamps = np.arange(100.0)
+        values = timestamps.reshape(-1, 1)
+        interval_index = IntervalIndex(1)
+        interval_index.update([2.5, 10.5, 30.5], [timestamps], [values], [100], [0])
+        boundaries = interval_index.boundaries[0]
+        # Replaced by intervals of the same length and by longer ones, the old lists are not modified
+        for symbol_intervals in [[5.5, 20.5, 40.5], [1.5, 7.5, 20.5, 60.5, 80.5]]:
+            interval_index.update(symbol_intervals, [timestamps], [values], [100], [0])
+            self.assertEqual(interval_index.boundaries[0], list(np.searchsorted(timestamps, symbol_intervals, side='right')))
+            self.assertEqual([a['count'] for a in interval_index.aggregates[0]], list(np.diff(interval_index.boundaries[0])))
+        self.assertEqual(boundaries, [3, 11, 31])
+
+
+class TestDecodePipeline(unittest.TestCase):
+    def test_incremental(self):
+        from Models.Implementations.Examples.ExampleDecoder import ExampleDecoder
+        symbol_intervals = []
+        for chunk_length in [3000, 7]:
+            decoder = ExampleDecoder(None, None)
+            for i in range(3000):
+                decoder.receivers[0].append_values((1 if (i // 50) % 2 else 2,), timestamp=1000.0 + i * 0.01)
+                if (i + 1) % chunk_length == 0:
+                    decoder.decode()
+            decoder.decode()
+            symbol_intervals.append(decoder.symbol_intervals)
+            self.assertEqual(decoder.watermarks['calculate_symbol_intervals'], [3000])
+        self.assertEqual(len(symbol_intervals[0]), 59)
+        self.assertEqual(symbol_intervals[0], symbol_intervals[1])
+
+    def test_drain(self):
+        from Models.Implementations.Examples.ExampleDecoder import ExampleDecoder
+        decoder = ExampleDecoder(None, None)
+        receiver = decoder.receivers[0]
+        self.assertEqual(receiver.get_block(), (None, None))
+
+        blocks = []
+        append_block = decoder.append_block
+        decoder.append_block = lambda *args: (blocks.append(args), append_block(*args))
+        for i in range(500):
+            receiver.append_values((1 if (i // 50) % 2 else 2,), timestamp=1000.0 + i * 0.01)
+        decoder.decode()
+        # All pending values are taken in a single block
+        self.assertEqual(len(blocks), 1)
+        receiver_index, timestamps, values = blocks[0]
+        self.assertEqual(receiver_index, 0)
+        self.assertTrue(np.allclose(timestamps, 1000.0 + np.arange(500) * 0.01))
+        self.assertTrue(np.array_equal(values[:, 0], np.where((np.arange(500) // 50) % 2, 1, 2)))
+        self.assertEqual(decoder.lengths, [500])
+        self.assertEqual(receiver.get_block(), (None, None))
+
+        # Nothing new, nothing appended
+        decoder.decode()
+        self.assertEqual(len(blocks), 1)
+
+    def test_generations(self):
+        from Models.Implementations.Examples.ExampleDecoder import ExampleDecoder
+        decoder = ExampleDecoder(None, None)
+        for i in range(1000):
+            decoder.receivers[0].append_values((1 if (i // 50) % 2 else 2,), timestamp=1000.0 + i * 0.01)
+        decoder.decode()
+        generations = decoder.get_decoded()['generations']
+        decoder.decode()
+        self.assertEqual(decoder.get_decoded()['generations'], generations)
+
+        # Symbol values that are rewritten in place have to be touched
+        decoder.symbol_values[0] = 5
+        decoder.decode()
+        self.assertEqual(decoder.get_decoded()['generations'], generations)
+        decoder.touch('symbol_values')
+        changed = decoder.get_decoded()['generations']
+        self.assertNotEqual(changed['symbol_values'], generations['symbol_values'])
+        self.assertEqual(changed['symbol_intervals'], generations['symbol_intervals'])
+        self.assertEqual(changed['received'], generations['received'])
+
+        # Appended symbols are detected
+        decoder.symbol_values.append(7)
+        decoder.decode()
+        self.assertNotEqual(decoder.get_decoded()['generations']['symbol_values'], changed['symbol_values'])
+
+    def test_snapshots(self):
+        from Models.Implementations.Examples.ExampleDecoder import ExampleDecoder
+        decoder = ExampleDecoder(None, None)
+        for i in range(1000):
+            decoder.receivers[0].append_values((1 if (i // 50) % 2 else 2,), timestamp=1000.0 + i * 0.01)
+        decoder.decode()
+        first = decoder.get_decoded()
+        intervals, values = list(first['symbol_intervals']), list(first['symbol_values'])
+        self.assertEqual(intervals, decoder.symbol_intervals)
+        self.assertEqual(list(first['symbol_boundaries'][0]), decoder.interval_index.boundaries[0])
+
+        for i in range(1000, 2000):
+            decoder.receivers[0].append_values((1 if (i // 50) % 2 else 2,), timestamp=1000.0 + i * 0.01)
+        decoder.decode()
+        second = decoder.get_decoded()
+        self.assertGreater(len(second['symbol_intervals']), len(intervals))
+        # Only the new symbols were copied, the earlier snapshot is unchanged
+        self.assertIs(second['symbol_intervals'].items, first['symbol_intervals'].items)
+        self.assertEqual(list(first['symbol_intervals']), intervals)
+        self.assertEqual(list(second['symbol_intervals']), decoder.symbol_intervals)
+        self.assertIs(second['symbol_aggregates'][0][-1], decoder.interval_index.aggregates[0][-1])
+
+        # A touched stream is published again, the earlier snapshots keep the old values
+        decoder.symbol_values[0] = 5
+        decoder.touch('symbol_values')
+        third = decoder.get_decoded()
+        self.assertEqual(third['symbol_values'][0], 5)
+        self.assertEqual(list(first['symbol_values']), values)
+        self.assertEqual(second['symbol_values'][0], values[0])
+
+        decoder.clear()
+        self.assertEqual(len(decoder.get_decoded()['symbol_intervals']), 0)
+        self.assertEqual(list(second['symbol_intervals'][:len(intervals)]), intervals)
+
+    def test_retention(self):
+        from Models.Implementations.Examples.ExampleDecoder import ExampleDecoder
+        timestamps = 1000.0 + np.arange(5000) * 0.01
+        levels = np.where((np.arange(5000) // 50) % 2, 1, 2)
+        reference = ExampleDecoder(None, None)
+        for i in range(5000):
+            reference.receivers[0].append_values((levels[i],), timestamp=timestamps[i])
+        reference.decode()
+
+        for retention in [{'retention_samples': 1000}, {'retention_seconds': 10.0}]:
+            decoder = ExampleDecoder(None, None)
+            for name, value in retention.items():
+                setattr(decoder, name, value)
+            spilled = []
+            decoder.spill_sink = lambda r, t, v: spilled.append((r, t.copy(), v.copy()))
+            windows = []
+            calculate_symbol_intervals = decoder.calculate_symbol_intervals
+            decoder.calculate_symbol_intervals = lambda: (windows.append(decoder.get_window(0)), calculate_symbol_intervals())
+            for i in range(5000):
+                decoder.receivers[0].append_values((levels[i],), timestamp=timestamps[i])
+                if (i + 1) % 100 == 0:
+                    length_before = decoder.lengths[0] + 100
+                    spill_count = len(spilled)
+                    decoder.decode()
+                    if len(spilled) > spill_count:
+                        # Batched eviction: at least a quarter of the stored values at once
+                        self.assertGreaterEqual(len(spilled[-1][1]), length_before // 4)
+                    self.assertLessEqual(decoder.lengths[0], 1334)
+                    self.assertGreaterEqual(decoder.lengths[0], min(i + 1, 1000))
+
+            # The spilled values are exactly the evicted ones, in order
+            offset = decoder.offsets[0]
+            self.assertGreater(offset, 0)
+            self.assertEqual(offset + decoder.lengths[0], 5000)
+            self.assertTrue(all(r == 0 for r, _, _ in spilled))
+            self.assertTrue(np.array_equal(np.concatenate([t for _, t, _ in spilled]), timestamps[:offset]))
+            self.assertTrue(np.array_equal(np.concatenate([v for _, _, v in spilled])[:, 0], levels[:offset]))
+            self.assertTrue(np.array_equal(decoder.timestamps[0], timestamps[offset:]))
+
+            # The pyramid only keeps buckets of retained values
+            for level in decoder.pyramids[0].snapshot():
+                self.assertGreaterEqual(level['timestamps'][0], timestamps[offset])
+                self.assertEqual(level['end'], 5000 // level['bucket_length'] * level['bucket_length'])
+
+            # Every window continues after the previous one and starts with its look-back value
+            new_timestamps = np.concatenate([w['timestamps'][w['new']:] for w in windows])
+            self.assertTrue(np.array_equal(new_timestamps, timestamps))
+            for previous, window in zip(windows, windows[1:]):
+                self.assertEqual(window['new'], 1)
+                self.assertEqual(window['timestamps'][0], previous['timestamps'][-1])
+
+            # Symbols are the same as without retention, the ranges of retained symbols are still valid
+            self.assertEqual(decoder.symbol_intervals, reference.symbol_intervals)
+            self.assertEqual(decoder.symbol_values, reference.symbol_values)
+            for i in range(len(decoder.symbol_intervals) - 1):
+                if decoder.symbol_intervals[i] < timestamps[offset]:
+                    continue
+                start, stop = decoder.get_symbol_range(0, i)
+                self.assertEqual(decoder.timestamps[0][start - 1], decoder.symbol_intervals[i])
+                self.assertEqual(decoder.timestamps[0][stop - 1], decoder.symbol_intervals[i + 1])
+
+    @unittest.skipUnless(HAS_QT, "PyQt5/pyqtgraph not installed")
+    def test_is_outdated(self):
+        from types import SimpleNamespace
+        from Views.PlotWidgetView import PlotWidgetView
+        view = SimpleNamespace(drawn={}, bucket_duration=None, visible_window=None,
+                               plot_view=SimpleNamespace(settings_general={'step_size': 1}))
+        self.assertTrue(PlotWidgetView.is_outdated(view, 'line', 1))
+        self.assertFalse(PlotWidgetView.is_outdated(view, 'line', 1))
+        self.assertTrue(PlotWidgetView.is_outdated(view, 'line', 2))
+        view.visible_window = (0.0, 1.0)
+        self.assertTrue(PlotWidgetView.is_outdated(view, 'line', 2))
+        view.plot_view.settings_general['step_size'] = 2
+        self.assertTrue(PlotWidgetView.is_outdated(view, 'line', 2))
+        # Unknown generations are always drawn
+        self.assertTrue(PlotWidgetView.is_outdated(view, 'line', None))
+        self.assertTrue(PlotWidgetView.is_outdated(view, 'line', None))
+
+
+class TestDecodeWorker(unittest.TestCase):
+    def test_snapshot(self):
+        import time
+        from Models.DecodeWorker import DecodeWorker
+        from Models.Implementations.Examples.ExampleDecoder import ExampleDecoder
+        decoder = ExampleDecoder(None, None)
+        for i in range(3000):
+            decoder.receivers[0].append_values((1 if (i // 50) % 2 else 2,), timestamp=1000.0 + i * 0.01)
+        worker = DecodeWorker(decoder, 1000, 1.0)
+        self.assertIsNone(worker.get_snapshot())
+        worker.start()
+        deadline = time.time() + 5
+        while (worker.get_snapshot() is None or worker.get_snapshot()['received']['lengths'] != [3000]) and time.time() < deadline:
+            time.sleep(0.01)
+        worker.stop()
+        snapshot = worker.get_snapshot()
+        self.assertEqual(snapshot['received']['lengths'], [3000])
+        self.assertEqual(len(snapshot['symbol_intervals']), 59)
+        self.assertIsNone(worker.thread)
+
+    def test_wakeup(self):
+        import time
+        from Models.DecodeWorker import DecodeWorker
+        from Models.Implementations.Examples.ExampleDecoder import ExampleDecoder
+        decoder = ExampleDecoder(None, None)
+        self.assertIs(decoder.receivers[0].data_available, decoder.data_available)
+        self.assertFalse(decoder.data_available.is_set())
+        decoder.receivers[0].append_values((1,), timestamp=1000.0)
+        self.assertTrue(decoder.data_available.is_set())
+
+        worker = DecodeWorker(decoder, 1000, 1.0)
+        worker.start()
+        deadline = time.time() + 5
+        while (worker.get_snapshot() is None or worker.get_snapshot()['received']['lengths'] != [1]) and time.time() < deadline:
+            time.sleep(0.001)
+        self.assertEqual(worker.get_snapshot()['received']['lengths'], [1])
+        decoder.receivers[0].append_values((2,), timestamp=1000.01)
+        while worker.get_snapshot()['received']['lengths'] != [2] and time.time() < deadline:
+            time.sleep(0.001)
+        worker.stop()
+        self.assertEqual(worker.get_snapshot()['received']['lengths'], [2])
+
+    def test_concurrent_snapshot(self):
+        import threading
+        import time
+        from Models.DecodeWorker import DecodeWorker
+        from Models.Implementations.Examples.ExampleDecoder import ExampleDecoder
+        decoder = ExampleDecoder(None, None)
+        worker = DecodeWorker(decoder, 1000, 1.0)
+        worker.start()
+
+        def feed():
+            for i in range(6000):
+                decoder.receivers[0].append_values((1 if (i // 50) % 2 else 2,), timestamp=1000.0 + i * 0.01)
+                if i % 100 == 0:
+                    time.sleep(0.001)
+        feeder = threading.Thread(target=feed)
+        feeder.start()
+        checked = 0
+        while feeder.is_alive() or checked == 0:
+            snapshot = worker.get_snapshot()
+            if snapshot is None:
+                continue
+            intervals, boundaries = snapshot['symbol_intervals'], snapshot['symbol_boundaries'][0]
+            lengths = (len(intervals), len(snapshot['symbol_values']), len(boundaries), len(snapshot['symbol_aggregates'][0]))
+            self.assertIsNot(intervals, decoder.symbol_intervals)
+            self.assertIsNot(boundaries, decoder.interval_index.boundaries[0])
+            # The published containers do not change while the decoder continues
+            time.sleep(0.002)
+            self.assertEqual(lengths, (len(intervals), len(snapshot['symbol_values']), len(boundaries), len(snapshot['symbol_aggregates'][0])))
+            offset = snapshot['received']['offsets'][0]
+            for i in range(len(boundaries) - 1):
+                self.assertLessEqual(boundaries[i] - offset, snapshot['received']['lengths'][0])
+            checked += 1
+        feeder.join()
+        worker.stop()
+        self.assertGreater(checked, 0)
+
+
+class TestDecodeProcess(unittest.TestCase):
+    def test_results(self):
+        from Models.DecodeProcess import DecodeProcess
+        from Models.Implementations.Examples.ExampleDecoder2 import ExampleDecoder2
+        decoders = [ExampleDecoder2(None, None), ExampleDecoder2(None, None)]
+        process = DecodeProcess(decoders[1])
+        process.start()
+        try:
+            for i in range(1000):
+                for decoder in decoders:
+                    for receiver in decoder.receivers:
+                        receiver.append_values((np.sin(i / 10),), timestamp=1000.0 + i * 0.01)
+                if (i + 1) % 250 == 0:
+                    decoders[0].decode()
+                    process.decode()
+            reference, decoder = decoders
+            self.assertEqual(decoder.lengths, [1000] * 3)
+            self.assertTrue(np.array_equal(decoder.additional_datalines[0]['values'], reference.additional_datalines[0]['values']))
+            self.assertTrue(np.array_equal(decoder.additional_datalines[0]['timestamps'], reference.additional_datalines[0]['timestamps']))
+
+            process.clear()
+            decoder.clear()
+            process.decode()
+            self.assertIsNone(decoder.additional_datalines[0])
+        finally:
+            process.stop()
+            decoders[1].clear()
+
+    def test_conversion_function(self):
+        from Models.DecodeProcess import DecodeProcess
+        from Models.Implementations.Decoders.LDC1614EVMDecoder import LDC1614EVMDecoder
+        # The receivers cannot connect, but the values can be appended
+        parameters = [{'description': "Sigma", 'dtype': 'float', 'default': 2.0, 'conversion_function': lambda x: str(x * 2) + "s"}]
+        parameter_values = {'Port': '', 'Activate channel 0': True, 'Activate channel 1': True,
+                            'Activate channel 2': False, 'Activate channel 3': False,
+                            'Input Deglitch Filter Bandwidth (MHz)': '3.3', 'Settle Count': 1024,
+                            'Reference Count': 65535, 'Detection threshold factor': 5.0, 'Symbol duration [s]': 1.0,
+                            'Sigma': 2.0}
+        decoders = [LDC1614EVMDecoder(parameters, dict(parameter_values)) for _ in range(2)]
+        process = DecodeProcess(decoders[1])
+        process.start()
+        try:
+            for sigma in [2.0, 5.0]:
+                if sigma != parameter_values['Sigma']:
+                    # The edited parameters are used by the decode process as well
+                    parameter_values['Sigma'] = sigma
+                    decoders[0].parameters_edited(dict(parameter_values))
+                    process.parameters_edited(dict(parameter_values))
+                for i in range(600):
+                    for decoder in decoders:
+                        decoder.receivers[0].append_values((np.sin(i / 10), np.cos(i / 10), 0, 0), timestamp=1000.0 + i * 0.01)
+                    if (i + 1) % 200 == 0:
+                        decoders[0].decode()
+                        process.decode()
+                reference, decoder = decoders
+                self.assertEqual(decoder.sigma, sigma)
+                for idx in range(2):
+                    self.assertTrue(np.array_equal(decoder.additional_datalines[idx]['values'], reference.additional_datalines[idx]['values']))
+        finally:
+            process.stop()
+            decoders[1].clear()
+
+    def test_overwritten_blocks(self):
+        from Models.DecodeProcess import export_result, import_result
+        from Models.Implementations.Examples.ExampleDecoder2 import ExampleDecoder2
+        from Utils.SharedArrays import SharedArrayReader, SharedArrayWriter
+        decoder = ExampleDecoder2(None, None)
+        writer, reader = SharedArrayWriter(), SharedArrayReader()
+        try:
+            results = []
+            for step in range(3):
+                exported = export_result(writer, decoder, ('additional_datalines', 0), {'values': np.full(10, float(step))})
+                results.append(import_result(reader, decoder, exported))
+                reader.release(writer.pop_released())
+            for step, result in enumerate(results):
+                self.assertTrue(np.array_equal(result['values'], np.full(10, float(step))))
+        finally:
+            writer.close()
+            reader.close()
+
+
+class TestSerialLoop(unittest.TestCase):
+    def test_frames(self):
+        from Utils import SerialLoop
+        received = []
+        protocol = SerialLoop.FrameProtocol(None, received.append, 4)
+        protocol.data_received(b"abcdef")
+        protocol.data_received(b"gh")
+        protocol.data_received(b"i")
+        self.assertEqual(received, [b"abcd", b"efgh"])
+        self.assertEqual(protocol.buffer, b"i")
+
+    @unittest.skipUnless(os.name == 'posix', "requires a pseudo terminal")
+    def test_lines(self):
+        import serial
+        import time
+        from Utils import SerialLoop
+        controller, device = os.openpty()
+        port = serial.Serial(os.ttyname(device), timeout=0.1)
+        received = []
+        protocol = SerialLoop.LineProtocol(port, received.extend)
+        try:
+            self.assertTrue(SerialLoop.attach(protocol))
+            os.write(controller, b"1, 2\r\n3, ")
+            os.write(controller, b"4\r\n5")
+            deadline = time.time() + 5
+            while len(received) < 2 and time.time() < deadline:
+                time.sleep(0.01)
+            SerialLoop.detach(protocol)
+            self.assertEqual(received, [b"1, 2\r", b"3, 4\r"])
+            self.assertIsNone(protocol.fileno)
+        finally:
+            port.close()
+            os.close(controller)
+            os.close(device)
+
+
+class TestLineParser(unittest.TestCase):
+    def test_parse(self):
+        from Utils import LineParser
+        fields = LineParser.parse([b"1, 8388608\r", b"2, 8388609\r"], 2)
+        self.assertEqual(fields.tolist(), [[1, 8388608], [2, 8388609]])
+        fields = LineParser.parse([b"1, 2\r", b"3, x\r", b"4\r", b"", b"5, 6"], 2)
+        self.assertEqual(fields.tolist(), [[1, 2], [5, 6]])
+        self.assertEqual(LineParser.parse([], 5).shape, (0, 5))
+
+    def test_timestamps(self):
+        from Models.Implementations.Receivers.AD7746Receiver import AD7746Receiver
+        receiver = AD7746Receiver.__new__(AD7746Receiver)
+        receiver.ms_offset = None
+        first = receiver.convert_timestamps(np.array([2 ** 32 - 2000, 2 ** 32 - 1000]))
+        second = receiver.convert_timestamps(np.array([0, 1000]))
+        self.assertTrue(np.allclose(np.diff(np.concatenate([first, second])), 1.0))
+
+
+class TestLDC1614EVMReceiver(unittest.TestCase):
+    def test_frames(self):
+        import struct
+        from Models.Implementations.Receivers.LDC1614EVMReceiver import LDC1614EVMReceiver
+        from Models.Interfaces.ReceiverInterface import ReceiverInterface
+        receiver = LDC1614EVMReceiver.__new__(LDC1614EVMReceiver)
+        ReceiverInterface.__init__(receiver)
+        receiver.num_sensors = 4
+        receiver.active_channels = [True, True, True, False]
+        receiver.clk_in_mhz = 40
+        receiver.error_counts = np.zeros((4, 4), dtype=int)
+        receiver.stream_error_count = 0
+        receiver.setup()
+
+        registers = [(0x0123, 0x4567), (0x1123, 0x4567), (0x0FFF, 0xFFFF), (0x8000, 0x0001)]
+        frame = struct.pack('>3xB2xHHHHHHHH10x', 0, *[value for register in registers for value in register])
+        error_frame = struct.pack('>3xB2xHHHHHHHH10x', 1, *[0] * 8)
+        buffer = bytearray(frame * 2 + error_frame)
+        with memoryview(buffer) as frame_view:
+            receiver.frames_received(frame_view)
+        del buffer[:]
+
+        timestamps, values = receiver.get_block()
+        self.assertEqual(values.shape, (3, 4))
+        expected = [40e6 * (((msb & 0x0FFF) << 16) + lsb) / 2 ** 28 for msb, lsb in registers[:3]]
+        self.assertTrue(np.allclose(values[0, :3], expected))
+        self.assertEqual(values[0, 3], 0)
+        self.assertTrue(np.all(values[2] == 0))
+        counts = receiver.get_error_counts()
+        self.assertEqual(counts['ERR_AE'], [0, 2, 0, 0])
+        self.assertEqual(counts['ERR_UR'], [0, 0, 0, 0])
+        self.assertEqual(counts['stream'], 1)
+        self.assertAlmostEqual(receiver.calculate_frequency(0x0123, 0x4567, 0), expected[0])
+
+
+class TestPocketLoCReceiver(unittest.TestCase):
+    def test_resync(self):
+        from Models.Implementations.Receivers.PocketLoCReceiver import PocketLoCReceiver
+        from Models.Interfaces.ReceiverInterface import ReceiverInterface
+        from Utils import SerialLoop
+        receiver = PocketLoCReceiver.__new__(PocketLoCReceiver)
+        ReceiverInterface.__init__(receiver)
+        receiver.num_sensors = 12
+        receiver.saturated = np.zeros(2, dtype=bool)
+        receiver.saturation_counts = np.zeros(2, dtype=int)
+        receiver.corrupted_frame_count = 0
+        receiver.setup()
+
+        def frame(value, saturated=0):
+            fields = [f"{value:013.3f}"] * 6 + [f"{saturated:08d}"] + [f"{value + 0.5:013.3f}"] * 6 + [f"{0:09d}"]
+            return (",".join(fields) + "\r\n").encode()
+
+        self.assertEqual(len(frame(1)), PocketLoCReceiver.FRAME_LENGTH)
+        data = frame(1) + frame(2)[5:] + frame(3, saturated=1) + frame(4)
+        protocol = SerialLoop.LineProtocol(None, receiver.frames_received)
+        for i in range(0, len(data), 100):
+            protocol.data_received(data[i:i + 100])
+
+        timestamps, values = receiver.get_block()
+        self.assertEqual(values.shape, (3, 12))
+        self.assertEqual(values[:, 0].tolist(), [1, 3, 4])
+        self.assertEqual(values[:, 6].tolist(), [1.5, 3.5, 4.5])
+        self.assertEqual(receiver.corrupted_frame_count, 1)
+        self.assertEqual(receiver.saturation_counts.tolist(), [1, 0])
+        self.assertFalse(np.any(receiver.saturated))
+
+
+class TestDecimation(unittest.TestCase):
+    def test_min_max(self):
+        from Utils import Decimation
+        x = np.arange(10001, dtype=float)
+        y = np.sin(x / 1000)
+        y[5003] = 10
+        y[7777] = -10
+        x_decimated, y_decimated = Decimation.min_max(x, y, 100)
+        self.assertLessEqual(len(y_decimated), 2 * 100 + 2)
+        self.assertTrue(np.all(np.diff(x_decimated) > 0))
+        self.assertEqual(y_decimated.max(), 10)
+        self.assertEqual(y_decimated.min(), -10)
+        self.assertTrue(np.array_equal(y[x_decimated.astype(int)], y_decimated))
+        x_decimated, y_decimated = Decimation.min_max(x[:150], y[:150], 100)
+        self.assertEqual(len(y_decimated), 150)
+
+    def test_min_max_lines(self):
+        from Utils import Decimation
+        x = np.arange(1003, dtype=float)
+        y = np.random.default_rng(0).normal(size=(1003, 3))
+        x_decimated, y_decimated = Decimation.min_max(x, y, 50)
+        self.assertEqual(x_decimated.shape, y_decimated.shape)
+        for column_index in range(3):
+            x_line, y_line = Decimation.min_max(x, y[:, column_index], 50)
+            self.assertTrue(np.array_equal(x_decimated[:, column_index], x_line))
+            self.assertTrue(np.array_equal(y_decimated[:, column_index], y_line))
+
+    def test_window(self):
+        from Utils import Decimation
+        self.assertEqual(Decimation.get_window(100.0, 120.0, 0.05), (99.0, 121.0))
+        self.assertIsNone(Decimation.get_window(100.0, 100.0, 0.05))
+
+        x = np.arange(10.0, 20.0)
+        # One point on either side of the window
+        self.assertEqual(Decimation.get_slice(x, 12.5, 15.5), (2, 7))
+        self.assertEqual(Decimation.get_slice(x, 12.0, 15.0), (1, 7))
+        self.assertEqual(Decimation.get_slice(x, *Decimation.get_window(12.0, 15.0, 0.5)), (0, 8))
+        self.assertEqual(Decimation.get_slice(x), (0, 10))
+        # Window between two points
+        self.assertEqual(Decimation.get_slice(x, 12.2, 12.8), (2, 4))
+        # Window before or after the retained data
+        self.assertEqual(Decimation.get_slice(x, 0.0, 5.0), (0, 1))
+        self.assertEqual(Decimation.get_slice(x, 25.0, 30.0), (9, 10))
+        # No data
+        start, end = Decimation.get_slice(np.empty((0,)), 0.0, 5.0)
+        self.assertEqual(end - start, 0)
+
+
+class TestMinMaxPyramid(unittest.TestCase):
+    def test_levels(self):
+        from Utils.MinMaxPyramid import MinMaxPyramid
+        rng = np.random.default_rng(0)
+        timestamps = np.arange(5000, dtype=float)
+        values = rng.normal(size=(5000, 2))
+        pyramid = MinMaxPyramid(64, 2)
+        start = 0
+        for block_length in rng.integers(1, 300, size=100):
+            pyramid.extend(timestamps[start:start + block_length], values[start:start + block_length])
+            start = min(start + block_length, 5000)
+            if start >= 5000:
+                break
+        offset = 1000
+        pyramid.discard(offset)
+        for level in pyramid.snapshot():
+            bucket_length = level['bucket_length']
+            first = -(-offset // bucket_length) * bucket_length
+            buckets = values[first:level['end']].reshape(-1, bucket_length, 2)
+            self.assertTrue(np.array_equal(level['timestamps'], timestamps[first:level['end']:bucket_length]))
+            self.assertTrue(np.array_equal(level['min'], buckets.min(axis=1)))
+            self.assertTrue(np.array_equal(level['max'], buckets.max(axis=1)))
+            self.assertLess(start - level['end'], bucket_length)
+
+    def test_line(self):
+        from Utils import MinMaxPyramid
+        pyramid = MinMaxPyramid.MinMaxPyramid(64, 1)
+        values = np.zeros((4096, 1))
+        values[2049] = 5
+        pyramid.extend(np.arange(4096, dtype=float), values)
+        x, y, level = MinMaxPyramid.get_line(pyramid.snapshot(), 100, 0, 1000.0, 3000.0)
+        self.assertEqual(level['bucket_length'], 64)
+        self.assertEqual(y.max(), 5)
+        self.assertLessEqual(x[0], 1000)
+        self.assertGreaterEqual(x[-1], 3000 - 64)
+        self.assertLess(len(x), 2 * 2000 / 64 + 8)
+        self.assertIsNone(MinMaxPyramid.get_line(pyramid.snapshot(), 4, 0))
+
+
+@unittest.skipUnless(HAS_QT, "PyQt5/pyqtgraph not installed")
+class TestSymbolItems(unittest.TestCase):
+    def setUp(self):
+        import pyqtgraph as pg
+        self.app = get_application()
+        self.plot = pg.PlotWidget()
+        self.plot.resize(400, 300)
+        self.plot.setXRange(0, 10, padding=0)
+        self.plot.setYRange(0, 1, padding=0)
+        self.app.processEvents()
+
+    def tearDown(self):
+        self.plot.close()
+        self.plot.deleteLater()
+        self.app.processEvents()
+
+    def test_intervals(self):
+        from types import SimpleNamespace
+        import pyqtgraph as pg
+        from Views.PlotWidgetView import PlotWidgetView
+        from Views.SymbolIntervalsItem import SymbolIntervalsItem
+        item = SymbolIntervalsItem(pg.mkPen())
+        self.plot.addItem(item, ignoreBounds=True)
+        item.append(np.arange(0.0, 20.0))
+        item.append(np.arange(20.0, 30.0))
+        self.assertEqual(len(item), 30)
+        # The lines span the visible range, not the data
+        rect = item.boundingRect()
+        self.assertAlmostEqual(rect.left(), 0, places=3)
+        self.assertAlmostEqual(rect.right(), 10, places=3)
+        self.assertFalse(self.plot.grab().isNull())
+
+        # A shorter list (the decoder was cleared) replaces the symbol intervals
+        view = SimpleNamespace(plot_view=SimpleNamespace(settings_decoder={'symbol_intervals': True}),
+                               symbol_intervals_item=item)
+        PlotWidgetView.update_symbol_intervals(view, [1.0, 2.0])
+        self.assertEqual(len(item), 2)
+        self.assertTrue(np.array_equal(item.timestamps, [1.0, 2.0]))
+        PlotWidgetView.update_symbol_intervals(view, [1.0, 2.0, 3.0])
+        self.assertEqual(len(item), 3)
+        item.clear()
+        self.assertEqual(len(item), 0)
+        self.assertFalse(self.plot.grab().isNull())
+
+    def test_values(self):
+        from types import SimpleNamespace
+        from PyQt5.QtGui import QFont
+        from Views.PlotWidgetView import PlotWidgetView
+        from Views.SymbolValuesItem import SymbolValuesItem
+        item = SymbolValuesItem(QFont())
+        self.plot.addItem(item, ignoreBounds=True)
+        item.append(np.arange(0.0, 100.0), np.full(100, 0.5), [str(i) for i in range(100)])
+        self.assertEqual(len(item), 100)
+        self.assertEqual(len(item.widths), 100)
+        self.assertTrue(np.all(item.widths > 0))
+        rect = item.boundingRect()
+        self.assertAlmostEqual(rect.left(), 0, places=3)
+        self.assertAlmostEqual(rect.right(), 10, places=3)
+        self.assertFalse(self.plot.grab().isNull())
+
+        settings = {'symbol_values': True, 'symbol_values_position': 'Fixed', 'symbol_values_fixed_height': 0.5}
+        view = SimpleNamespace(plot_view=SimpleNamespace(settings_decoder=settings), symbol_values_item=item)
+        # A shorter list (the decoder was cleared) replaces the symbol values
+        PlotWidgetView.update_symbol_values(view, None, [0.0, 1.0, 2.0, 3.0], [7, 8, 9])
+        self.assertEqual(item.texts, ['7', '8', '9'])
+        self.assertTrue(np.array_equal(item.x, [0.5, 1.5, 2.5]))
+        PlotWidgetView.update_symbol_values(view, None, [0.0, 1.0, 2.0, 3.0, 4.0], [7, 8, 9, 10])
+        self.assertEqual(len(item), 4)
+        item.clear()
+        self.assertEqual(len(item), 0)
+        self.assertEqual(len(item.widths), 0)
+        self.assertFalse(self.plot.grab().isNull())
+
+    def test_select_labels(self):
+        from Views.SymbolValuesItem import select_labels, LABEL_SPACING
+        indices = np.arange(10, 20)
+        # Enough space, all labels
+        self.assertTrue(np.all(select_labels(indices, indices * 50.0, np.full(10, 20.0))))
+        # Labels twice as wide as their distance, every third label (aligned to the index)
+        visible = select_labels(indices, indices * 10.0, np.full(10, 20.0 - LABEL_SPACING + 1))
+        self.assertTrue(np.array_equal(indices[visible], [12, 15, 18]))
+        # The shown labels do not depend on the first visible label
+        visible = select_labels(indices[1:], indices[1:] * 10.0, np.full(9, 20.0 - LABEL_SPACING + 1))
+        self.assertTrue(np.array_equal(indices[1:][visible], [12, 15, 18]))
+        self.assertEqual(len(select_labels(np.arange(1), [5.0], [100.0])), 1)
+        self.assertEqual(len(select_labels(np.arange(0), np.empty((0,)), np.empty((0,)))), 0)
+
+
+@unittest.skipUnless(HAS_QT, "PyQt5/pyqtgraph not installed")
+class TestMultiLineItem(unittest.TestCase):
+    def setUp(self):
+        import pyqtgraph as pg
+        self.app = get_application()
+        self.plot = pg.PlotWidget()
+        self.plot.resize(400, 300)
+        self.app.processEvents()
+
+    def tearDown(self):
+        self.plot.close()
+        self.plot.deleteLater()
+        self.app.processEvents()
+
+    def test_lines(self):
+        import pyqtgraph as pg
+        from Views.MultiLineItem import MultiLineItem
+        datalines = [self.plot.plot(pen=pen) for pen in ['r', 'g', 'r']]
+        item = MultiLineItem(datalines)
+        self.plot.addItem(item)
+        x = np.arange(10.0)
+        y = np.stack([x, -x, x * 2], axis=1)
+        item.setData(x, y, [0, 1, 2])
+        self.assertEqual(item.dataBounds(0), (0.0, 9.0))
+        self.assertEqual(item.dataBounds(1), (-9.0, 18.0))
+        self.assertEqual(item.boundingRect().height(), 27.0)
+
+        # Lines with the same pen share a path that is broken between them
+        self.assertFalse(self.plot.grab().isNull())
+        self.assertEqual(set(item.paths), {(0, 2), (1,)})
+        self.assertEqual(len(item.paths[(0, 2)].toSubpathPolygons()), 2)
+        self.assertEqual(len(item.paths[(1,)].toSubpathPolygons()), 1)
+
+        # Changed pens regroup the lines
+        datalines[1].setPen(pg.mkPen('r'))
+        item.update()
+        self.assertFalse(self.plot.grab().isNull())
+        self.assertIn((0, 1, 2), item.paths)
+        self.assertEqual(len(item.paths[(0, 1, 2)].toSubpathPolygons()), 3)
+
+        # Separate x values per line
+        item.setData(np.stack([x, x + 10], axis=1), y[:, :2], [0, 2])
+        self.assertEqual(item.dataBounds(0), (0.0, 19.0))
+        self.assertEqual(item.paths, {})
+        self.assertFalse(self.plot.grab().isNull())
+        self.assertEqual(list(item.paths), [(0, 1)])
+
+        item.setData(np.empty((0,)), np.empty((0, 2)), [0, 2])
+        self.assertEqual(item.dataBounds(0), (None, None))
+        self.assertTrue(item.boundingRect().isNull())
+        item.setData(x, y, [0, 1, 2])
+        item.clear()
+        self.assertEqual(item.channels, [])
+        self.assertEqual(item.dataBounds(1), (None, None))
+        self.assertFalse(self.plot.grab().isNull())
+
+
 if __name__ == '__main__':
     if len(sys.argv) == 3:
         file = sys.argv.pop()
@@ -0,0 +1,135 @@
+import json
+import numpy as np
+
+MAGIC = b'UGJRNL01'
+# Magic, number of columns, length and length of the info
+HEADER_LENGTH = 32
+# The data starts at a multiple of this value, so chunks are page-aligned
+DATA_ALIGNMENT = 4096
+
+
+class CaptureJournal:
+    """
+    Append-only on-disk journal for the timestamps and values of a single receiver.
+    File layout:
+        - Magic (8 bytes), number of value columns, number of samples, length of the info (uint64 each).
+        - Info (JSON, e.g. the decoder info with sensor names, receiver names and parameter values).
+        - Samples as float64 rows (timestamp, values...), starting at a multiple of DATA_ALIGNMENT.
+    The file grows chunk by chunk and only the current chunk is memory-mapped, so memory usage stays flat for
+    captures that are larger than the available memory.
+    The number of samples in the header is updated after the samples have been written, therefore a journal that was
+    not closed properly (crash, os._exit) can still be read up to the last complete block.
+    """
+    def __init__(self, path, num_columns, info, chunk_length):
+        """
+        Creates a new journal file.
+        :param path: Path of the journal file.
+        :param num_columns: Number of values per sample.
+        :param info: Information describing the journal, must be JSON serializable (other objects are stored as str).
+        :param chunk_length: Number of samples per chunk.
+        """
+        self.path = path
+        self.num_columns = num_columns
+        self.chunk_length = max(int(chunk_length), 1)
+        self.length = 0
+
+        info_bytes = json.dumps(info, default=str).encode('utf-8')
+        self.data_offset = -(-(HEADER_LENGTH + len(info_bytes)) // DATA_ALIGNMENT) * DATA_ALIGNMENT
+        self.row_bytes = (1 + num_columns) * np.dtype(float).itemsize
+
+        self._chunk = None
+        self._chunk_index = -1
+        self._file = open(path, 'w+b')
+        self._file.write(MAGIC)
+        self._file.write(np.array([num_columns, 0, len(info_bytes)], dtype=np.uint64).tobytes())
+        self._file.write(info_bytes)
+        self._file.truncate(self.data_offset)
+        self._file.flush()
+
+    def append(self, timestamps, values):
+        """
+        Appends a block of samples.
+        :param timestamps: Timestamps of the samples, dimensions (k).
+        :param values: Values of the samples, dimensions (k, columns).
+        """
+        count = len(timestamps)
+        written = 0
+        while written < count:
+            chunk_index, row = divmod(self.length, self.chunk_length)
+            if chunk_index != self._chunk_index:
+                self.map_chunk(chunk_index)
+            n = min(count - written, self.chunk_length - row)
+            self._chunk[row:row + n, 0] = timestamps[written:written + n]
+            self._chunk[row:row + n, 1:] = values[written:written + n]
+            written += n
+            self.length += n
+
+        # Commit the new length only after the samples have been written
+        self.write_length()
+
+    def close(self):
+        """
+        Flushes the journal and trims the preallocated part of the last chunk.
+        """
+        if self._file is None:
+            return
+        self.release_chunk()
+        self._file.truncate(self.data_offset + self.length * self.row_bytes)
+        self.write_length()
+        self._file.close()
+        self._file = None
+
+    def flush(self):
+        """
+        Writes the mapped chunk to disk.
+        """
+        if self._chunk is not None:
+            self._chunk.flush()
+
+    def map_chunk(self, chunk_index):
+        """
+        Extends the file by a chunk and maps it, the previously mapped chunk is released.
+        :param chunk_index: Index of the chunk.
+        """
+        self.release_chunk()
+        offset = self.data_offset + chunk_index * self.chunk_length * self.row_bytes
+        self._file.truncate(offset + self.chunk_length * self.row_bytes)
+        self._chunk = np.memmap(self._file, dtype=float, mode='r+', offset=offset, shape=(self.chunk_length, 1 + self.num_columns))
+        self._chunk_index = chunk_index
+
+    def release_chunk(self):
+        """
+        Flushes and unmaps the current chunk.
+        """
+        self.flush()
+        self._chunk = None
+        self._chunk_index = -1
+
+    def write_length(self):
+        """
+        Writes the number of samples to the header, the mapped chunk is flushed first, so the header never counts
+        samples that are not on disk yet.
+        """
+        self.flush()
+        self._file.seek(len(MAGIC) + 8)
+        self._file.write(np.array([self.length], dtype=np.uint64).tobytes())
+        self._file.flush()
+
+    @staticmethod
+    def read(path):
+        """
+        Opens a journal file (read-only, memory-mapped).
+        :param path: Path of the journal file.
+        :return: Info, timestamps, dimensions (length), and values, dimensions (length, columns).
+        """
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a capture journal.")
+            num_columns, length, info_length = (int(x) for x in np.frombuffer(f.read(HEADER_LENGTH - len(MAGIC)), dtype=np.uint64))
+            info = json.loads(f.read(info_length).decode('utf-8'))
+
+        if length == 0:
+            return info, np.empty((0,)), np.empty((0, num_columns))
+        data_offset = -(-(HEADER_LENGTH + info_length) // DATA_ALIGNMENT) * DATA_ALIGNMENT
+        data = np.memmap(path, dtype=float, mode='r', offset=data_offset, shape=(length, 1 + num_columns))
+        return info, data[:, 0], data[:, 1:]
@@ -0,0 +1,74 @@
+import numpy as np
+
+"""
+This module reduces the number of points of a line before it is plotted, e.g. to the number of pixels of the plot.
+"""
+
+
+def min_max(x, y, num_buckets):
+    """
+    Decimates a line by splitting it into buckets of consecutive points and keeping only the minimum and maximum of
+    every bucket (in their original order).
+    Unlike taking every n-th point, narrow peaks survive, so the decimated line looks the same as the complete line if
+    a bucket is not wider than a pixel.
+    Several lines with the same x values can be decimated at once, every line keeps its own minima and maxima.
+    :param x: X values (e.g. timestamps), dimensions (points).
+    :param y: Y values, dimensions (points) or (points, lines).
+    :param num_buckets: Number of buckets, the decimated line has at most 2 * num_buckets points.
+    :return: Decimated x and y values, the line itself if it does not have more points. For several lines, x has the
+    dimensions of y.
+    """
+    length = len(y)
+    if num_buckets <= 0 or length <= 2 * num_buckets:
+        return x, y
+
+    bucket_length = int(np.ceil(length / num_buckets))
+    num_buckets = length // bucket_length
+    buckets = np.asarray(y[:num_buckets * bucket_length]).reshape(num_buckets, bucket_length, *y.shape[1:])
+    starts = (np.arange(num_buckets) * bucket_length).reshape(-1, *[1] * (y.ndim - 1))
+    argmin, argmax = np.argmin(buckets, axis=1), np.argmax(buckets, axis=1)
+    indices = [starts + np.minimum(argmin, argmax), starts + np.maximum(argmin, argmax)]
+
+    # Last bucket (shorter than the others)
+    start = num_buckets * bucket_length
+    if start < length:
+        argmin, argmax = np.argmin(y[start:], axis=0), np.argmax(y[start:], axis=0)
+        indices[0] = np.concatenate((indices[0], [start + np.minimum(argmin, argmax)]))
+        indices[1] = np.concatenate((indices[1], [start + np.maximum(argmin, argmax)]))
+
+    indices = np.stack(indices, axis=1).reshape(-1, *y.shape[1:])
+    if y.ndim == 1:
+        return x[indices], y[indices]
+    return x[indices], np.take_along_axis(np.asarray(y), indices, axis=0)
+
+
+def get_window(x_min, x_max, margin):
+    """
+    Gets the time span of a line that is drawn for a visible X range.
+    :param x_min: Start of the visible X range.
+    :param x_max: End of the visible X range.
+    :param margin: Part of the line outside of the X range that is still drawn, relative to its width (on either side).
+    :return: Start and end of the window, None if the X range is empty.
+    """
+    if x_max <= x_min:
+        return None
+    margin *= x_max - x_min
+    return x_min - margin, x_max + margin
+
+
+def get_slice(x, start_time=None, end_time=None):
+    """
+    Gets the part of a line within a window, including the first point on either side so the line reaches the edges
+    of the window.
+    A window before (after) all points only gets the first (last) point.
+    :param x: X values (ascending).
+    :param start_time: Start of the window (None -> from the beginning).
+    :param end_time: End of the window (None -> up to the end).
+    :return: Start and end index of the part.
+    """
+    start, end = 0, len(x)
+    if start_time is not None:
+        start = max(int(np.searchsorted(x, start_time, side='left')) - 1, 0)
+    if end_time is not None:
+        end = min(int(np.searchsorted(x, end_time, side='right')) + 1, len(x))
+    return start, end
@@ -0,0 +1,124 @@
+import numpy as np
+
+
+class IntervalIndex:
+    """
+    Maps symbol interval edges to sample indices of every receiver.
+    The sample index of an edge is the index of the first sample after the edge (np.searchsorted with side 'right'),
+    so symbol interval i contains the samples boundaries[i] to boundaries[i+1] (exclusive).
+    The indices are absolute, i.e., they stay valid when old values are evicted (see DecoderInterface.offsets).
+    An edge is resolved once a receiver has a sample after it, afterwards it never changes because the timestamps only
+    grow. Therefore, every update only has to search the new edges and the (few) edges that are not resolved yet.
+    If the last resolved edge is missing or has another timestamp, the symbol intervals were replaced and the index is
+    rebuilt.
+    When both edges of a symbol interval are resolved, the interval is closed and its aggregates (see aggregate) are
+    computed once, so decoders and views do not have to reduce the same samples again.
+    """
+    def __init__(self, num_receivers):
+        """
+        Initializes the interval index.
+        :param num_receivers: Number of receivers.
+        """
+        self.num_receivers = num_receivers
+        self.clear()
+
+    def clear(self):
+        """
+        Resets the interval index.
+        """
+        self.aggregates = [[] for _ in range(self.num_receivers)]
+        self.boundaries = [[] for _ in range(self.num_receivers)]
+        self.offsets = [0] * self.num_receivers
+        self.resolved = [0] * self.num_receivers
+        # Timestamp of the last resolved edge, to detect replaced symbol intervals
+        self.last_resolved = [None] * self.num_receivers
+
+    @staticmethod
+    def aggregate(data, start):
+        """
+        Reduces the samples of a symbol interval.
+        :param data: Values of the interval, dimensions (time, sensors).
+        :param start: Absolute index of the first value.
+        :return: Dictionary with the number of samples ('count') and, for every sensor, 'min', 'max', 'mean', the absolute
+        indices 'argmin' and 'argmax', the maximum before the minimum ('max_before_min') and the minimum before the
+        maximum ('min_before_max'), NaN (or -1 for indices) if there are no such samples.
+        """
+        count, num_sensors = data.shape
+        if count == 0:
+            empty = np.full((num_sensors,), np.nan)
+            return {'count': 0, 'min': empty, 'max': empty, 'mean': empty, 'argmin': np.full((num_sensors,), -1),
+                    'argmax': np.full((num_sensors,), -1), 'max_before_min': empty, 'min_before_max': empty}
+
+        argmin = np.argmin(data, axis=0)
+        argmax = np.argmax(data, axis=0)
+        columns = np.arange(num_sensors)
+        positions = np.arange(count).reshape(-1, 1)
+        max_before_min = np.max(np.where(positions < argmin, data, -np.inf), axis=0)
+        min_before_max = np.min(np.where(positions < argmax, data, np.inf), axis=0)
+        return {
+            'count': count,
+            'min': data[argmin, columns],
+            'max': data[argmax, columns],
+            'mean': np.mean(data, axis=0),
+            'argmin': argmin + start,
+            'argmax': argmax + start,
+            'max_before_min': np.where(argmin > 0, max_before_min, np.nan),
+            'min_before_max': np.where(argmax > 0, min_before_max, np.nan)
+        }
+
+    def get_aggregates(self, receiver_index, interval_index):
+        """
+        Gets the aggregates of a symbol interval.
+        :param receiver_index: Receiver index.
+        :param interval_index: Index of the symbol interval.
+        :return: Aggregates (see aggregate), None if the interval is not closed yet.
+        """
+        aggregates = self.aggregates[receiver_index]
+        return aggregates[interval_index] if interval_index < len(aggregates) else None
+
+    def get_range(self, receiver_index, interval_index):
+        """
+        Gets the samples of a symbol interval.
+        :param receiver_index: Receiver index.
+        :param interval_index: Index of the symbol interval.
+        :return: Start and stop index (exclusive) in the (retained) received arrays, evicted samples are excluded.
+        """
+        boundaries, offset = self.boundaries[receiver_index], self.offsets[receiver_index]
+        return max(boundaries[interval_index] - offset, 0), max(boundaries[interval_index + 1] - offset, 0)
+
+    def update(self, symbol_intervals, timestamps, values, lengths, offsets):
+        """
+        Updates the sample indices of new and unresolved symbol interval edges and aggregates closed intervals.
+        :param symbol_intervals: Symbol interval edges, must be sorted.
+        :param timestamps: Timestamps of the receivers.
+        :param values: Values of the receivers.
+        :param lengths: Number of (retained) values of the receivers.
+        :param offsets: Absolute index of the first retained value of the receivers.
+        """
+        for receiver_index in range(self.num_receivers):
+            boundaries, resolved = self.boundaries[receiver_index], self.resolved[receiver_index]
+            if resolved > 0 and (len(symbol_intervals) < resolved or symbol_intervals[resolved - 1] != self.last_resolved[receiver_index]):
+                # The symbol intervals were replaced, new lists so snapshots of the old ones stay valid
+                boundaries = self.boundaries[receiver_index] = []
+                self.aggregates[receiver_index] = []
+                self.resolved[receiver_index] = 0
+
+            resolved, length, offset = self.resolved[receiver_index], lengths[receiver_index], offsets[receiver_index]
+            self.offsets[receiver_index] = offset
+            del boundaries[resolved:]
+            if resolved == len(symbol_intervals):
+                continue
+            if length == 0:
+                boundaries.extend([offset] * (len(symbol_intervals) - resolved))
+                continue
+
+            indices = np.searchsorted(timestamps[receiver_index][:length], symbol_intervals[resolved:], side='right')
+            boundaries.extend((indices + offset).tolist())
+            self.resolved[receiver_index] = resolved + int(np.searchsorted(indices, length))
+            if self.resolved[receiver_index] > 0:
+                self.last_resolved[receiver_index] = symbol_intervals[self.resolved[receiver_index] - 1]
+
+            aggregates = self.aggregates[receiver_index]
+            for interval_index in range(len(aggregates), self.resolved[receiver_index] - 1):
+                start, stop = self.get_range(receiver_index, interval_index)
+                aggregates.append(IntervalIndex.aggregate(values[receiver_index][start:stop], start + offset))
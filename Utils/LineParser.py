@@ -0,0 +1,42 @@
+import numpy as np
+
+from Utils import Logging
+
+"""
+This module parses the ASCII lines that serial devices send, e.g. b"1234, 8388608\r", for many lines at once.
+"""
+
+
+def parse(lines, num_fields, dtype=np.int64):
+    """
+    Parses lines of comma separated numbers.
+    Lines that do not consist of num_fields numbers are skipped with a warning.
+    :param lines: Lines (bytes, without the line feed).
+    :param num_fields: Number of numbers per line.
+    :param dtype: Type of the numbers, integer or float.
+    :return: Array of numbers, dimensions (lines, num_fields).
+    """
+    lines = [line for line in lines if len(line.strip()) > 0]
+    if len(lines) == 0:
+        return np.zeros((0, num_fields), dtype=dtype)
+
+    try:
+        fields = np.loadtxt(lines, delimiter=',', dtype=dtype, ndmin=2)
+        if fields.shape[1] == num_fields:
+            return fields
+    except ValueError:
+        pass
+
+    # At least one line is corrupted, parse them one by one to only skip those
+    convert = int if np.issubdtype(dtype, np.integer) else float
+    fields = []
+    for line in lines:
+        try:
+            values = [convert(element) for element in line.split(b",")]
+        except ValueError:
+            values = []
+        if len(values) == num_fields:
+            fields.append(values)
+        else:
+            Logging.warning("Unexpected receiver message: " + line.decode("ascii", errors="replace"))
+    return np.array(fields, dtype=dtype).reshape(-1, num_fields)
@@ -0,0 +1,34 @@
+from Utils.SnapshotList import SnapshotList
+
+
+class ListPublisher:
+    """
+    Publishes a list of the decoder (e.g. the symbol intervals) as read-only snapshots (see SnapshotList) for other
+    threads.
+    The published elements are mirrored in a list that is only appended to, every publish only copies the elements
+    that were appended since the last one. The mirror is rebuilt when the list was replaced (another object), got
+    shorter or was rewritten in place (see DecoderInterface.touch), snapshots that were published before keep the old
+    mirror.
+    """
+    def __init__(self):
+        """
+        Initializes the publisher.
+        """
+        self.source = None
+        self.mirror = []
+
+    def publish(self, items, stable=None, rewritten=False):
+        """
+        Publishes the current elements of a list.
+        :param items: List.
+        :param stable: Number of leading elements that do not change anymore, the elements after them are copied
+        into the snapshot (None -> all elements are stable).
+        :param rewritten: True if elements of the list were changed in place since the last publish.
+        :return: Snapshot of the list.
+        """
+        stable = len(items) if stable is None else stable
+        if items is not self.source or rewritten or stable < len(self.mirror):
+            self.source = items
+            self.mirror = []
+        self.mirror.extend(items[len(self.mirror):stable])
+        return SnapshotList(self.mirror, len(self.mirror), items[stable:])
@@ -0,0 +1,158 @@
+import numpy as np
+
+from Utils import Decimation
+from Utils.TimeSeriesStore import TimeSeriesStore
+
+
+class MinMaxPyramid:
+    """
+    Multi-resolution summary of the values of a single receiver for plotting long captures.
+    Level i splits the samples into buckets of 2 ** (BASE_LEVEL + i) consecutive samples and stores the timestamp of
+    the first sample, the minimum and the maximum of every column per bucket. The buckets are aligned to absolute
+    sample indices, so they stay valid when old samples are discarded.
+    The levels are built incrementally: new samples only complete the newest buckets of every level and every level is
+    built from the level below it, so appending n samples costs O(n) in total.
+    Every level is a TimeSeriesStore with 2 * columns columns (the minima followed by the maxima).
+    """
+    BASE_LEVEL = 3
+
+    def __init__(self, chunk_length, num_columns):
+        """
+        Initializes the pyramid.
+        :param chunk_length: Initial capacity (number of samples), the levels get the corresponding number of buckets.
+        :param num_columns: Number of values per sample.
+        """
+        self.chunk_length = max(int(chunk_length) >> MinMaxPyramid.BASE_LEVEL, 1)
+        self.num_columns = num_columns
+        self.clear()
+
+    def clear(self):
+        """
+        Removes all samples and levels.
+        """
+        self.count = 0
+        self.levels = []
+        self.pending_timestamps = np.empty((0,))
+        self.pending_values = np.empty((0, self.num_columns))
+
+    def add_level(self, offset):
+        """
+        Adds a new (coarsest) level.
+        :param offset: Absolute index of its first bucket.
+        :return: New level.
+        """
+        level = TimeSeriesStore(self.chunk_length, 2 * self.num_columns)
+        level.offset = offset
+        self.levels.append(level)
+        return level
+
+    def discard(self, offset):
+        """
+        Removes the buckets that contain discarded samples.
+        :param offset: Absolute index of the first retained sample.
+        """
+        for level_index, level in enumerate(self.levels):
+            bucket_length = 2 ** (MinMaxPyramid.BASE_LEVEL + level_index)
+            count = -(-offset // bucket_length) - level.offset
+            if count >= level.length:
+                # Keep the position of the next bucket, it is built as soon as it is complete
+                level.offset += level.length
+                level.length = 0
+            elif count > 0:
+                level.discard(count)
+
+    def extend(self, timestamps, values):
+        """
+        Appends a block of samples, the samples of an incomplete base bucket are kept until it is complete.
+        :param timestamps: Timestamps of the samples, dimensions (k).
+        :param values: Values of the samples, dimensions (k, columns).
+        """
+        if len(timestamps) == 0:
+            return
+        self.count += len(timestamps)
+        timestamps = np.concatenate((self.pending_timestamps, timestamps))
+        values = np.concatenate((self.pending_values, values))
+        bucket_length = 2 ** MinMaxPyramid.BASE_LEVEL
+        num_buckets = len(timestamps) // bucket_length
+        end = num_buckets * bucket_length
+        self.pending_timestamps, self.pending_values = timestamps[end:], values[end:]
+        if num_buckets == 0:
+            return
+
+        buckets = values[:end].reshape(num_buckets, bucket_length, self.num_columns)
+        if len(self.levels) == 0:
+            self.add_level((self.count - len(timestamps)) // bucket_length)
+        self.levels[0].extend(timestamps[:end:bucket_length], np.hstack((buckets.min(axis=1), buckets.max(axis=1))))
+
+        # Merge pairs of buckets into the next level, as long as there are new complete pairs
+        level_index = 0
+        while True:
+            source = self.levels[level_index]
+            if level_index + 1 == len(self.levels):
+                if source.length < 2:
+                    break
+                self.add_level(-(-source.offset // 2))
+            target = self.levels[level_index + 1]
+            start = 2 * (target.offset + target.length) - source.offset
+            if start < 0:
+                # The target is empty and its next bucket was (partly) discarded from the source already
+                target.offset += (1 - start) // 2
+                start = 2 * target.offset - source.offset
+            num_pairs = (source.length - start) // 2
+            if num_pairs <= 0:
+                break
+            pairs = source.values[start:start + 2 * num_pairs].reshape(num_pairs, 2, 2 * self.num_columns)
+            minima = pairs[:, :, :self.num_columns].min(axis=1)
+            maxima = pairs[:, :, self.num_columns:].max(axis=1)
+            target.extend(source.timestamps[start:start + 2 * num_pairs:2], np.hstack((minima, maxima)))
+            level_index += 1
+
+    def snapshot(self):
+        """
+        Gets views of the filled part of all levels, they stay valid while the pyramid continues.
+        :return: List of levels (finest first), each a dictionary with the number of samples per bucket
+        ('bucket_length'), the absolute index of the first sample after the last bucket ('end'), the timestamps of the
+        first samples ('timestamps'), the minima ('min') and the maxima ('max'), dimensions (buckets, columns).
+        """
+        levels = []
+        for level_index, level in enumerate(self.levels):
+            if level.length == 0:
+                continue
+            bucket_length = 2 ** (MinMaxPyramid.BASE_LEVEL + level_index)
+            values = level.values
+            levels.append({
+                'bucket_length': bucket_length,
+                'end': (level.offset + level.length) * bucket_length,
+                'timestamps': level.timestamps,
+                'min': values[:, :self.num_columns],
+                'max': values[:, self.num_columns:]
+            })
+        return levels
+
+
+def get_line(levels, samples_per_bucket, column_index, start_time=None, end_time=None):
+    """
+    Gets a min/max line from the coarsest level whose buckets do not contain more than samples_per_bucket samples.
+    Every bucket becomes two points (minimum and maximum at the timestamp of its first sample).
+    The samples after the last complete bucket (see 'end' in MinMaxPyramid.snapshot) are not part of the line.
+    :param levels: Levels of a pyramid (see MinMaxPyramid.snapshot).
+    :param samples_per_bucket: Maximum number of samples per bucket, e.g. the number of samples per pixel.
+    :param column_index: Index of the column, or list of column indices for several lines with the same timestamps.
+    :param start_time: Buckets before are left out, except for the last one (None -> from the beginning).
+    :param end_time: Buckets after are left out, except for the first one (None -> up to the end).
+    :return: Timestamps and values of the line (dimensions (points) or (points, columns)) and the level, None if no
+    level is coarse enough to be worth it.
+    """
+    level = None
+    for candidate in levels:
+        if candidate['bucket_length'] <= samples_per_bucket:
+            level = candidate
+    if level is None:
+        return None
+
+    timestamps = level['timestamps']
+    start, end = Decimation.get_slice(timestamps, start_time, end_time)
+    x = np.repeat(timestamps[start:end], 2)
+    minima, maxima = level['min'][start:end, column_index], level['max'][start:end, column_index]
+    y = np.stack((minima, maxima), axis=1).reshape(-1, *minima.shape[1:])
+    return x, y, level
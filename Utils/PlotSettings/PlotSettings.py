@@ -253,6 +253,16 @@ class PlotSettings:
         else:
             settings['step_size'] = 1
 
+        if 'batched_datalines' in list(plot_settings.keys()):
+            settings['batched_datalines'] = plot_settings['batched_datalines']
+        else:
+            settings['batched_datalines'] = False
+
+        if 'decimation' in list(plot_settings.keys()):
+            settings['decimation'] = plot_settings['decimation']
+        else:
+            settings['decimation'] = True
+
         if 'show_grid' in list(plot_settings.keys()):
             settings['show_grid'] = plot_settings['show_grid']
         else:
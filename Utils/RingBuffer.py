@@ -0,0 +1,203 @@
+import time
+import numpy as np
+
+DROP_OLDEST = 'drop_oldest'
+DROP_NEWEST = 'drop_newest'
+BLOCK = 'block'
+POLICIES = [DROP_OLDEST, DROP_NEWEST, BLOCK]
+
+# Time the producer sleeps while waiting for free space with the blocking policy
+BLOCK_SLEEP_TIME = 0.001  # s
+
+
+class RingBuffer:
+    """
+    Preallocated single-producer/single-consumer ring buffer for timestamped measurement values.
+    It is used to pass measurements from the listen thread of a receiver (producer) to the decoder (consumer)
+    without locks: the producer only ever writes the write counter and the consumer only ever writes the read counter.
+    Both counters increase monotonically. Before a slot is filled, the producer claims it (claim counter), afterwards the
+    slot is published by incrementing the write counter. The consumer uses the claim counter to detect slots that were
+    overwritten while it was copying them.
+    If the consumer falls behind, the overflow policy decides what happens:
+        - drop_oldest: The producer overwrites the oldest measurements, the consumer skips them when reading.
+        - drop_newest: New measurements are discarded until there is free space again.
+        - block: The producer waits for free space (at most block_timeout seconds, then the measurement is dropped).
+    Every dropped measurement is counted in overflow_count.
+    """
+    def __init__(self, num_columns, capacity, policy=DROP_OLDEST, block_timeout=1.0):
+        """
+        Initializes the ring buffer.
+        :param num_columns: Number of values per measurement.
+        :param capacity: Maximum number of measurements in the buffer.
+        :param policy: Overflow policy, one of POLICIES.
+        :param block_timeout: Maximum time (in seconds) the producer waits for free space with the blocking policy.
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown overflow policy {policy}, must be one of {POLICIES}.")
+
+        self.capacity = int(capacity)
+        self.num_columns = num_columns
+        self.policy = policy
+        self.block_timeout = block_timeout
+
+        self.overflow_count = 0
+
+        self._timestamps = np.empty((self.capacity,))
+        self._values = np.empty((self.capacity, num_columns))
+        self._claim = 0
+        self._read = 0
+        self._write = 0
+
+    def clear(self):
+        """
+        Discards all measurements in the buffer.
+        Must be called from the consumer side.
+        """
+        self._read = self._write
+
+    def get(self):
+        """
+        Removes and returns the oldest measurement of the buffer.
+        :return: Timestamp and values of the measurement, (None, None) if the buffer is empty.
+        """
+        timestamps, values = self.get_block(1)
+        if timestamps is None:
+            return None, None
+        return timestamps[0], values[0]
+
+    def get_available(self):
+        """
+        Get how many measurements are available in the buffer.
+        :return: Number of measurements.
+        """
+        return min(self._write - self._read, self.capacity)
+
+    def get_block(self, max_count=None):
+        """
+        Removes and returns the oldest measurements of the buffer.
+        :param max_count: Maximum number of measurements, None to get all available measurements.
+        :return: Copies of the timestamps, dimensions (k), and values, dimensions (k, columns), or (None, None) if the
+        buffer is empty.
+        """
+        read, write = self._read, self._write
+        if write - read > self.capacity:
+            # The producer has overwritten measurements that were never read
+            self.overflow_count += write - read - self.capacity
+            read = write - self.capacity
+
+        count = write - read if max_count is None else min(write - read, max_count)
+        if count <= 0:
+            return None, None
+
+        start = read % self.capacity
+        stop = start + count
+        if stop <= self.capacity:
+            timestamps = self._timestamps[start:stop].copy()
+            values = self._values[start:stop].copy()
+        else:
+            stop -= self.capacity
+            timestamps = np.concatenate((self._timestamps[start:], self._timestamps[:stop]))
+            values = np.concatenate((self._values[start:], self._values[:stop]))
+
+        if self.policy == DROP_OLDEST:
+            # Slots might have been overwritten while copying (including the slot that is currently being written)
+            overwritten = min(self._claim - self.capacity - read, count)
+            if overwritten > 0:
+                self.overflow_count += overwritten
+                timestamps, values = timestamps[overwritten:], values[overwritten:]
+
+        self._read = read + count
+        if len(timestamps) == 0:
+            return None, None
+        return timestamps, values
+
+    def put(self, timestamp, values):
+        """
+        Adds a measurement to the buffer.
+        Must only be called by the (single) producer.
+        :param timestamp: Timestamp of the measurement.
+        :param values: Values of the measurement.
+        :return: True if the measurement was stored, False if it was dropped.
+        """
+        if not self.wait_for_space(1):
+            self.overflow_count += 1
+            return False
+
+        self._claim = self._write + 1
+        index = self._write % self.capacity
+        self._timestamps[index] = timestamp
+        self._values[index] = values
+        self._write = self._claim
+        return True
+
+    def write_slots(self, timestamps, values, skipped=0):
+        """
+        Writes measurements to the slots following the write counter and publishes them.
+        The slots are claimed before they are written and the write counter only moves afterwards, so a concurrent
+        consumer never takes a slot that is being written for a new measurement.
+        The number of measurements must not exceed the capacity.
+        :param timestamps: Timestamps of the measurements, dimensions (k).
+        :param values: Values of the measurements, dimensions (k, columns).
+        :param skipped: Number of measurements before them that are skipped (counted as overwritten by the consumer).
+        """
+        count = len(timestamps)
+        position = self._write + skipped
+        self._claim = position + count
+        start = position % self.capacity
+        first = min(count, self.capacity - start)
+        self._timestamps[start:start + first] = timestamps[:first]
+        self._values[start:start + first] = values[:first]
+        if first < count:
+            self._timestamps[:count - first] = timestamps[first:]
+            self._values[:count - first] = values[first:]
+        self._write = self._claim
+
+    def put_block(self, timestamps, values):
+        """
+        Adds a block of measurements to the buffer with (at most two) slice assignments.
+        Must only be called by the (single) producer.
+        :param timestamps: Timestamps of the measurements, dimensions (k).
+        :param values: Values of the measurements, dimensions (k, columns).
+        :return: Number of measurements that were stored.
+        """
+        count = len(timestamps)
+        if self.policy == DROP_OLDEST and count > self.capacity:
+            # Only the newest measurements fit, skip the others as if they had been overwritten
+            skipped = count - self.capacity
+            self.write_slots(timestamps[skipped:], values[skipped:], skipped)
+            return self.capacity
+
+        stored = 0
+        while stored < count:
+            block_count = min(count - stored, self.capacity)
+            if self.policy == DROP_NEWEST:
+                block_count = min(block_count, self.capacity - (self._write - self._read))
+            if block_count <= 0 or not self.wait_for_space(block_count):
+                break
+            self.write_slots(timestamps[stored:stored + block_count], values[stored:stored + block_count])
+            stored += block_count
+
+        if stored < count:
+            self.overflow_count += count - stored
+        return stored
+
+    def wait_for_space(self, count):
+        """
+        Checks whether count measurements can be stored according to the overflow policy.
+        :param count: Number of measurements.
+        :return: True if there is enough space (or old measurements may be overwritten), otherwise False.
+        """
+        if self.policy == DROP_OLDEST:
+            return True
+
+        if self.capacity - (self._write - self._read) >= count:
+            return True
+        elif self.policy == DROP_NEWEST:
+            return False
+
+        deadline = time.time() + self.block_timeout
+        while self.capacity - (self._write - self._read) < count:
+            if time.time() > deadline:
+                return False
+            time.sleep(BLOCK_SLEEP_TIME)
+        return True
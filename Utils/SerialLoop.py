@@ -0,0 +1,159 @@
+import asyncio
+import os
+import threading
+
+from Utils import Logging
+
+"""
+This module implements an asyncio event loop that services the serial ports of all receivers in a single (daemon)
+thread, instead of one listen thread per receiver.
+A port is serviced by a protocol: the event loop is notified when the port becomes readable, the protocol reads
+everything that is waiting and passes complete lines or frames to the receiver.
+This relies on the event loop watching file descriptors, which is only supported on Linux/macOS.
+"""
+
+loop = None
+lock = threading.Lock()
+
+
+class SerialProtocol:
+    """
+    Reads a serial port whenever it becomes readable and passes complete messages to a callback.
+    Concrete protocols define what a complete message is (see data_received).
+    """
+    def __init__(self, port, callback):
+        """
+        Initializes the protocol.
+        :param port: Serial port (pyserial), must be open.
+        :param callback: Function that is called with the complete messages, runs in the event loop thread.
+        """
+        self.port = port
+        self.callback = callback
+        self.buffer = b""
+        # File descriptor of the port while it is serviced by the event loop
+        self.fileno = None
+
+    def data_received(self, data):
+        """
+        Processes new data of the serial port.
+        Should be overridden in the concrete protocol.
+        :param data: New bytes.
+        """
+        Logging.warning("data_received is not implemented in your selected protocol, the data is discarded.", repeat=False)
+
+    def read_ready(self):
+        """
+        Reads everything that is waiting, this is called by the event loop when the port is readable.
+        """
+        try:
+            data = self.port.read(self.port.in_waiting)
+        except Exception as e:
+            Logging.error(f"Reading serial port {self.port.port} failed: {e}", repeat=False)
+            loop.remove_reader(self.fileno)
+            return
+        if len(data) > 0:
+            try:
+                self.data_received(data)
+            except Exception as e:
+                Logging.error(f"Processing data of serial port {self.port.port} failed: {e}", repeat=False)
+
+
+class LineProtocol(SerialProtocol):
+    """
+    Protocol for devices that send one measurement per line.
+    The callback gets a list of complete lines (without the line feed), a partial line is kept until it is complete.
+    """
+    def data_received(self, data):
+        """
+        Processes new data of the serial port.
+        :param data: New bytes.
+        """
+        self.buffer += data
+        end = self.buffer.rfind(b"\n")
+        if end < 0:
+            return
+        lines = self.buffer[:end].split(b"\n")
+        self.buffer = self.buffer[end + 1:]
+        self.callback(lines)
+
+
+class FrameProtocol(SerialProtocol):
+    """
+    Protocol for devices that send frames of a fixed length.
+    The callback gets the bytes of all complete frames, a partial frame is kept until it is complete.
+    """
+    def __init__(self, port, callback, frame_length):
+        """
+        Initializes the protocol.
+        :param port: Serial port (pyserial), must be open.
+        :param callback: Function that is called with the complete frames, runs in the event loop thread.
+        :param frame_length: Number of bytes per frame.
+        """
+        super().__init__(port, callback)
+        self.frame_length = frame_length
+
+    def data_received(self, data):
+        """
+        Processes new data of the serial port.
+        :param data: New bytes.
+        """
+        self.buffer += data
+        end = len(self.buffer) - len(self.buffer) % self.frame_length
+        if end == 0:
+            return
+        frames, self.buffer = self.buffer[:end], self.buffer[end:]
+        self.callback(frames)
+
+
+def get_loop():
+    """
+    Gets the event loop, it is started in a new (daemon) thread on first use.
+    :return: Event loop.
+    """
+    global loop
+    with lock:
+        if loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, daemon=True).start()
+    return loop
+
+
+def run(function, *args):
+    """
+    Runs a function in the event loop thread and waits for it.
+    :param function: Function.
+    :param args: Arguments of the function.
+    :return: Return value of the function.
+    """
+    async def call():
+        return function(*args)
+    return asyncio.run_coroutine_threadsafe(call(), get_loop()).result()
+
+
+def attach(protocol):
+    """
+    Lets the event loop service the serial port of a protocol.
+    :param protocol: Protocol.
+    :return: True if successful, False if the event loop cannot watch serial ports on this platform.
+    """
+    if os.name != 'posix':
+        Logging.warning("Serial ports can only be serviced by the event loop on Linux/macOS, using listen threads instead.", repeat=False)
+        return False
+    try:
+        protocol.fileno = protocol.port.fileno()
+        run(get_loop().add_reader, protocol.fileno, protocol.read_ready)
+    except (AttributeError, NotImplementedError, OSError, ValueError) as e:
+        Logging.warning(f"Serial port cannot be serviced by the event loop ({e}), using a listen thread instead.", repeat=False)
+        protocol.fileno = None
+        return False
+    return True
+
+
+def detach(protocol):
+    """
+    Stops servicing the serial port of a protocol, a read that is running is finished first.
+    :param protocol: Protocol.
+    """
+    if protocol.fileno is not None:
+        run(get_loop().remove_reader, protocol.fileno)
+        protocol.fileno = None
@@ -0,0 +1,213 @@
+import numpy as np
+from multiprocessing import shared_memory
+
+from Utils.TimeSeriesStore import TimeSeriesStore
+
+# Minimum size of shared memory blocks for results
+MIN_BLOCK_SIZE = 4096  # bytes
+
+# Blocks that could not be closed yet because arrays still use them
+retired = []
+
+
+def release(segments):
+    """
+    Closes shared memory blocks that are not used anymore.
+    Blocks can only be closed after all arrays that use them are gone, those blocks are kept and closed by a later call.
+    :param segments: Shared memory blocks.
+    """
+    global retired
+    in_use = []
+    for segment in retired + list(segments):
+        try:
+            segment.close()
+        except BufferError:
+            in_use.append(segment)
+    retired = in_use
+
+
+class SharedArrayReader:
+    """
+    Maps arrays that another process has written to shared memory (see SharedArrayWriter and SharedTimeSeriesStore).
+    Blocks are attached once and kept until the writer reports that they are not used anymore.
+    """
+    def __init__(self):
+        """
+        Initializes the reader.
+        """
+        self.segments = {}
+
+    def attach(self, name):
+        """
+        Gets a shared memory block by its name.
+        :param name: Name of the block.
+        :return: Shared memory block.
+        """
+        if name not in self.segments:
+            self.segments[name] = shared_memory.SharedMemory(name=name)
+        return self.segments[name]
+
+    def close(self):
+        """
+        Releases all blocks.
+        """
+        self.release(list(self.segments.keys()))
+
+    def read(self, descriptor):
+        """
+        Maps an array written by SharedArrayWriter.write.
+        :param descriptor: Descriptor of the array.
+        :return: Array (view of the shared memory block, no copy).
+        """
+        segment = self.attach(descriptor['name'])
+        return np.ndarray(descriptor['shape'], dtype=descriptor['dtype'], buffer=segment.buf)
+
+    def read_store(self, descriptor):
+        """
+        Maps the filled part of a SharedTimeSeriesStore.
+        :param descriptor: Descriptor of the store (see SharedTimeSeriesStore.describe).
+        :return: Timestamps and values (views of the shared memory block, no copy), None if the store is empty.
+        """
+        if descriptor['name'] is None or descriptor['length'] == 0:
+            return None, None
+        segment = self.attach(descriptor['name'])
+        timestamps, values = SharedTimeSeriesStore.view(segment, descriptor['capacity'], descriptor['num_columns'])
+        return timestamps[:descriptor['length']], values[:descriptor['length']]
+
+    def release(self, names):
+        """
+        Releases blocks that are not used by the writer anymore.
+        :param names: Names of the blocks.
+        """
+        release([self.segments.pop(name) for name in names if name in self.segments])
+
+
+class SharedArrayWriter:
+    """
+    Writes arrays to shared memory, so another process can map them (see SharedArrayReader).
+    Every key has one block that is overwritten by the next write of the key, so the reader has to copy an array before
+    it requests the next write (see DecodeProcess.import_result). Blocks grow geometrically.
+    """
+    def __init__(self):
+        """
+        Initializes the writer.
+        """
+        self.blocks = {}
+        self.released = []
+
+    def close(self):
+        """
+        Unlinks all blocks.
+        """
+        for segment in self.blocks.values():
+            self.retire(segment)
+        self.blocks = {}
+
+    def pop_released(self):
+        """
+        Gets the names of the blocks that were replaced since the last call, the reader can release them.
+        :return: List of names.
+        """
+        released, self.released = self.released, []
+        return released
+
+    def retire(self, segment):
+        """
+        Unlinks a block, it is closed as soon as it is not used anymore.
+        :param segment: Shared memory block.
+        """
+        self.released.append(segment.name)
+        segment.unlink()
+        release([segment])
+
+    def write(self, key, array):
+        """
+        Writes an array to the block of a key.
+        :param key: Key of the array, e.g. the name and index of a result.
+        :param array: Array.
+        :return: Descriptor of the array for SharedArrayReader.read.
+        """
+        array = np.ascontiguousarray(array)
+        segment = self.blocks.get(key)
+        if segment is None or segment.size < array.nbytes:
+            if segment is not None:
+                self.retire(segment)
+            size = MIN_BLOCK_SIZE if segment is None else segment.size
+            while size < array.nbytes:
+                size *= 2
+            segment = shared_memory.SharedMemory(create=True, size=size)
+            self.blocks[key] = segment
+        np.ndarray(array.shape, dtype=array.dtype, buffer=segment.buf)[...] = array
+        return {'name': segment.name, 'shape': array.shape, 'dtype': array.dtype.str}
+
+
+class SharedTimeSeriesStore(TimeSeriesStore):
+    """
+    TimeSeriesStore whose arrays are allocated in shared memory, so another process can map them without copying
+    (see SharedArrayReader.read_store).
+    The timestamps and values of an allocation share one block, the values (Fortran order) follow the timestamps.
+    Blocks that are replaced (growing, discarding, clearing) are unlinked immediately, views that were handed out
+    before stay valid and the block is closed when they are gone.
+    """
+    def __init__(self, chunk_length, num_columns=None):
+        """
+        Initializes the store.
+        :param chunk_length: Initial capacity (number of samples).
+        :param num_columns: Number of values per sample, if None it is determined by the first appended sample.
+        """
+        super().__init__(chunk_length, num_columns)
+        self.segment = None
+
+    @staticmethod
+    def view(segment, capacity, num_columns):
+        """
+        Creates the arrays of a store in a shared memory block.
+        :param segment: Shared memory block.
+        :param capacity: Number of samples.
+        :param num_columns: Number of values per sample.
+        :return: Timestamp array and values array.
+        """
+        timestamps = np.ndarray((capacity,), buffer=segment.buf)
+        values = np.ndarray((capacity, num_columns), buffer=segment.buf, offset=timestamps.nbytes, order='F')
+        return timestamps, values
+
+    def allocate(self, capacity):
+        """
+        Allocates new (uninitialized) arrays for timestamps and values in a new shared memory block.
+        :param capacity: Number of samples.
+        :return: Timestamp array and values array.
+        """
+        self.retire()
+        self.segment = shared_memory.SharedMemory(create=True, size=capacity * (1 + self.num_columns) * np.dtype(float).itemsize)
+        return SharedTimeSeriesStore.view(self.segment, capacity, self.num_columns)
+
+    def clear(self):
+        """
+        Removes all samples, the shared memory block is released.
+        """
+        super().clear()
+        self.retire()
+
+    def describe(self):
+        """
+        Describes the store, so another process can map it.
+        :return: Descriptor of the store for SharedArrayReader.read_store.
+        """
+        return {
+            'name': None if self.segment is None else self.segment.name,
+            'capacity': self.capacity,
+            'num_columns': self.num_columns,
+            'length': self.length,
+            'offset': self.offset,
+            'min_timestamp': self.min_timestamp,
+            'max_timestamp': self.max_timestamp
+        }
+
+    def retire(self):
+        """
+        Unlinks the current block, it is closed as soon as it is not used anymore.
+        """
+        if self.segment is not None:
+            self.segment.unlink()
+            release([self.segment])
+            self.segment = None
@@ -0,0 +1,38 @@
+from collections.abc import Sequence
+
+
+class SnapshotList(Sequence):
+    """
+    Read-only snapshot of a list that is only appended to: the first `length` elements of the list, followed by a
+    (short) copied tail of elements that may still change.
+    Elements that are appended to the list later are not part of the snapshot, so publishing a growing list costs O(1)
+    instead of a copy of the whole list (see ListPublisher).
+    """
+    def __init__(self, items, length, tail=()):
+        """
+        Initializes the snapshot.
+        :param items: List that is only appended to.
+        :param length: Number of elements of the list that belong to the snapshot.
+        :param tail: Elements after them.
+        """
+        self.items = items
+        self.length = length
+        self.tail = list(tail)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1 and stop <= self.length:
+                return self.items[start:stop]
+            return [self[i] for i in range(start, stop, step)]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("SnapshotList index out of range")
+        return self.items[index] if index < self.length else self.tail[index - self.length]
+
+    def __len__(self):
+        return self.length + len(self.tail)
+
+    def __repr__(self):
+        return repr(list(self))
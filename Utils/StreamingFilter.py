@@ -0,0 +1,58 @@
+import numpy as np
+import scipy.ndimage
+
+from Utils.TimeSeriesStore import TimeSeriesStore
+
+
+class StreamingGaussianFilter:
+    """
+    Gaussian filter for a signal that grows at the end, equivalent to scipy.ndimage.gaussian_filter1d (mode 'reflect').
+    An output value only depends on the input values within the kernel radius, so it is final as soon as the input
+    values up to one radius after it are available. Only final values are filtered, so the filtered signal lags
+    radius values behind the signal and filtered values are never changed afterwards (views that were returned before,
+    e.g. in published decoder values, stay valid).
+    New values are computed from the input starting one radius before them, so every value sees exactly the same
+    input values as the batch filter of the complete signal and the output is numerically identical.
+    The filtered signal is kept between calls, when the beginning of the input is evicted, it is evicted as well.
+    """
+    def __init__(self, sigma, chunk_length, truncate=4.0):
+        """
+        Initializes the filter.
+        :param sigma: Standard deviation of the Gaussian kernel (in samples).
+        :param chunk_length: Initial capacity of the filtered signal.
+        :param truncate: Truncate the kernel at this many standard deviations.
+        """
+        self.sigma = sigma
+        self.truncate = truncate
+        self.radius = int(truncate * sigma + 0.5)
+        self.chunk_length = chunk_length
+        self.output = TimeSeriesStore(chunk_length, 1)
+
+    def clear(self):
+        """
+        Resets the filter.
+        """
+        self.output = TimeSeriesStore(self.chunk_length, 1)
+
+    def update(self, timestamps, signal, offset=0):
+        """
+        Filters the new values of the signal that are final (see above).
+        :param timestamps: Timestamps of the (retained) signal.
+        :param signal: Complete (retained) signal, values that were filtered before must not have changed.
+        :param offset: Absolute index of the first value of the signal, i.e., number of evicted values.
+        :return: Filtered signal, without the last radius values of the signal.
+        """
+        self.output.discard(offset - self.output.offset)
+        if self.output.length == 0:
+            # New or reset filter (or everything was evicted), the output starts at the first retained value
+            self.output.offset = offset
+
+        length = self.output.length
+        end = len(signal) - self.radius
+        if end > length:
+            segment_start = max(length - self.radius, 0)
+            filtered = scipy.ndimage.gaussian_filter1d(signal[segment_start:], self.sigma, truncate=self.truncate)
+            self.output.extend(timestamps[length:end], filtered[length - segment_start:end - segment_start].reshape(-1, 1))
+        if self.output.length == 0:
+            return np.empty((0,))
+        return self.output.column(0)
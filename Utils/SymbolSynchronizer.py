@@ -0,0 +1,138 @@
+import numpy as np
+
+
+class SymbolSynchronizer:
+    """
+    Incremental symbol synchronization based on the first peak of a transmission.
+    The synchronization consists of three phases:
+        - Calibration: The variation of the signal during the first calibration_duration seconds (no transmission yet)
+          is used to determine the detection threshold.
+        - Detection: The signal is searched for the first value that passes the threshold. The first peak (maximum, or
+          minimum for negative detection) within one symbol duration after the threshold pass is centered in the first
+          symbol interval.
+        - Tracking: Afterwards, a new symbol interval edge is emitted every symbol duration.
+    The state is kept between calls and every sample is only scanned once (except for the peak search, which is
+    limited to one symbol duration), so the cost per call only depends on the number of new samples.
+    """
+    def __init__(self, symbol_duration, threshold_factor, negative=False, threshold_offset=0.0, calibration_duration=2.0):
+        """
+        Initializes the synchronizer.
+        :param symbol_duration: Symbol duration in seconds.
+        :param threshold_factor: Threshold (relative to the variation during calibration).
+        :param negative: True if symbols are downward peaks, otherwise upward peaks.
+        :param threshold_offset: Added to the threshold factor for the detection threshold.
+        :param calibration_duration: Duration (in seconds) at the beginning that is used for calibration.
+        """
+        self.symbol_duration = symbol_duration
+        self.threshold_factor = threshold_factor
+        self.negative = negative
+        self.threshold_offset = threshold_offset
+        self.calibration_duration = calibration_duration
+        self.clear()
+
+    def clear(self):
+        """
+        Resets the synchronizer.
+        """
+        self.first_timestamp = None
+        self.max_timestamp = -np.inf
+        self.calibration_min = np.inf
+        self.calibration_max = -np.inf
+        self.variation = 0
+        self.threshold = None
+        self.threshold_pass = None
+        self.first_symbol_edge = None
+        self.last_edge = None
+        # Absolute index of the first sample that has not been scanned yet
+        self.position = 0
+
+    def update(self, timestamps, signal, offset=0):
+        """
+        Processes new samples and emits all symbol interval edges that are due.
+        :param timestamps: Timestamps of the (retained) signal, must be sorted.
+        :param signal: Complete (retained) signal, dimensions (time).
+        :param offset: Absolute index of the first value of the signal, i.e., number of evicted values.
+        :return: List of new symbol interval edges.
+        """
+        length = len(timestamps)
+        start = max(self.position - offset, 0)
+        if length == 0 or start >= length:
+            return []
+        if self.first_timestamp is None:
+            self.first_timestamp = timestamps[0]
+        self.max_timestamp = max(self.max_timestamp, np.max(timestamps[start:]))
+
+        if self.threshold is None:
+            self.calibrate(timestamps[start:], signal[start:])
+            if self.threshold is None:
+                self.position = offset + length
+                return []
+            # The detection also considers the calibration samples (except for the very first one)
+            start = max(1 - offset, 0)
+
+        edges = []
+        if self.first_symbol_edge is None:
+            self.detect(timestamps, signal, offset, start)
+            if self.first_symbol_edge is None:
+                return []
+            edges.append(self.first_symbol_edge)
+
+        while self.max_timestamp > self.last_edge + self.symbol_duration:
+            self.last_edge = self.last_edge + self.symbol_duration
+            edges.append(self.last_edge)
+        self.position = offset + length
+        return edges
+
+    def calibrate(self, timestamps, signal):
+        """
+        Updates the signal extrema of the calibration period and determines the threshold once it is over.
+        :param timestamps: New timestamps.
+        :param signal: New values.
+        """
+        calibration = signal[timestamps <= self.first_timestamp + self.calibration_duration]
+        if len(calibration) > 0:
+            self.calibration_min = min(self.calibration_min, np.min(calibration))
+            self.calibration_max = max(self.calibration_max, np.max(calibration))
+
+        if self.max_timestamp - self.first_timestamp < self.calibration_duration:
+            # We have to wait for enough samples
+            return
+
+        self.variation = self.calibration_max - self.calibration_min
+        if self.negative:
+            self.threshold = self.calibration_max - self.variation * (self.threshold_factor + self.threshold_offset)
+        else:
+            self.threshold = self.calibration_min + self.variation * (self.threshold_factor + self.threshold_offset)
+
+    def detect(self, timestamps, signal, offset, start):
+        """
+        Searches new samples for the first threshold pass and the first peak after it.
+        :param timestamps: Timestamps of the (retained) signal.
+        :param signal: Complete (retained) signal.
+        :param offset: Absolute index of the first value of the signal.
+        :param start: Index of the first sample that has not been scanned yet.
+        """
+        length = len(timestamps)
+        if self.threshold_pass is None:
+            passed = signal[start:] < self.threshold if self.negative else signal[start:] > self.threshold
+            if not np.any(passed):
+                self.position = offset + length
+                return
+            self.threshold_pass = offset + start + int(np.argmax(passed))
+            start = self.threshold_pass - offset
+
+        threshold_pass = self.threshold_pass - offset
+        end_limit = timestamps[threshold_pass] + self.symbol_duration
+        after_peak = timestamps[start:] > end_limit
+        if not np.any(after_peak):
+            # The symbol after the threshold pass is not complete yet
+            self.position = offset + length
+            return
+        first_peak_end = start + int(np.argmax(after_peak))
+
+        peak_signal = signal[threshold_pass:first_peak_end]
+        first_peak = np.argmin(peak_signal) if self.negative else np.argmax(peak_signal)
+
+        # Center first peak in first symbol interval
+        self.first_symbol_edge = timestamps[threshold_pass + first_peak] - self.symbol_duration / 2
+        self.last_edge = self.first_symbol_edge
@@ -0,0 +1,165 @@
+import numpy as np
+
+
+class TimeSeriesStore:
+    """
+    Column-oriented storage for timestamped measurement values of a single receiver or transmitter.
+    Timestamps are kept in their own column and the values are stored column by column (Fortran order), so the
+    data of every sensor/channel is contiguous in memory.
+    The capacity grows geometrically, therefore appending n samples copies O(n) values in total instead of copying the
+    whole history every time a fixed-size chunk is full.
+    The filled part of the store is exposed as zero-copy views of exactly `length` samples.
+    The smallest and largest timestamp are tracked while samples are appended, so they are available without scanning.
+    The oldest samples can be discarded (e.g. for a rolling retention window), offset counts how many samples were
+    discarded, i.e., it is the absolute index of the first retained sample.
+    """
+    GROWTH_FACTOR = 2
+
+    def __init__(self, chunk_length, num_columns=None):
+        """
+        Initializes the store.
+        :param chunk_length: Initial capacity (number of samples).
+        :param num_columns: Number of values per sample, if None it is determined by the first appended sample.
+        """
+        self.chunk_length = max(int(chunk_length), 1)
+        self.num_columns = num_columns
+
+        self.length = 0
+        self.offset = 0
+        self.min_timestamp = None
+        self.max_timestamp = None
+        self._timestamps = None
+        self._values = None
+
+    @property
+    def capacity(self):
+        """
+        Number of samples that fit into the currently allocated arrays.
+        """
+        return 0 if self._timestamps is None else len(self._timestamps)
+
+    @property
+    def timestamps(self):
+        """
+        View of the filled part of the timestamp column, None if the store is empty.
+        """
+        return self._timestamps[:self.length] if self.length > 0 else None
+
+    @property
+    def values(self):
+        """
+        View of the filled part of the values, dimensions (time, columns), None if the store is empty.
+        """
+        return self._values[:self.length] if self.length > 0 else None
+
+    def allocate(self, capacity):
+        """
+        Allocates new (uninitialized) arrays for timestamps and values.
+        :param capacity: Number of samples.
+        :return: Timestamp array and values array.
+        """
+        return np.empty((capacity,)), np.empty((capacity, self.num_columns), order='F')
+
+    def append(self, timestamp, values):
+        """
+        Appends a single sample.
+        :param timestamp: Timestamp of the sample.
+        :param values: Values of the sample, one per column.
+        """
+        if self.num_columns is None:
+            self.num_columns = len(values)
+        self.reserve(1)
+        self._timestamps[self.length] = timestamp
+        self._values[self.length] = values
+        self.length += 1
+        self.update_timestamp_range(timestamp, timestamp)
+
+    def clear(self):
+        """
+        Removes all samples, the allocated memory is released.
+        """
+        self.length = 0
+        self.offset = 0
+        self.min_timestamp = None
+        self.max_timestamp = None
+        self._timestamps = None
+        self._values = None
+
+    def column(self, column_index):
+        """
+        View of the filled part of a single value column.
+        :param column_index: Index of the column.
+        :return: Values of the column, None if the store is empty.
+        """
+        return self._values[:self.length, column_index] if self.length > 0 else None
+
+    def discard(self, count):
+        """
+        Removes the oldest samples, the remaining samples are copied to the front of newly allocated arrays.
+        Like when growing, the old arrays are not modified, so views that were handed out before stay valid.
+        The timestamp extrema are recomputed from the remaining samples.
+        :param count: Number of samples to be removed.
+        """
+        count = min(count, self.length)
+        if count <= 0:
+            return
+        remaining = self.length - count
+        timestamps, values = self.allocate(self.capacity)
+        timestamps[:remaining] = self._timestamps[count:self.length]
+        values[:remaining] = self._values[count:self.length]
+        self._timestamps, self._values = timestamps, values
+        self.length = remaining
+        self.offset += count
+
+        self.min_timestamp = None
+        self.max_timestamp = None
+        if remaining > 0:
+            self.update_timestamp_range(np.min(self.timestamps), np.max(self.timestamps))
+
+    def extend(self, timestamps, values):
+        """
+        Appends a block of samples with a single slice assignment.
+        :param timestamps: Timestamps of the samples, dimensions (k).
+        :param values: Values of the samples, dimensions (k, columns).
+        """
+        count = len(timestamps)
+        if count == 0:
+            return
+        if self.num_columns is None:
+            self.num_columns = values.shape[1]
+        self.reserve(count)
+        self._timestamps[self.length:self.length + count] = timestamps
+        self._values[self.length:self.length + count] = values
+        self.length += count
+        self.update_timestamp_range(np.min(timestamps), np.max(timestamps))
+
+    def reserve(self, count):
+        """
+        Makes sure that at least count more samples fit into the store, grows the arrays geometrically if necessary.
+        :param count: Number of samples to be appended.
+        """
+        required = self.length + count
+        if required <= self.capacity:
+            return
+
+        capacity = max(self.chunk_length, self.capacity)
+        while capacity < required:
+            capacity *= TimeSeriesStore.GROWTH_FACTOR
+
+        timestamps, values = self.allocate(capacity)
+        if self.length > 0:
+            timestamps[:self.length] = self._timestamps[:self.length]
+            values[:self.length] = self._values[:self.length]
+        self._timestamps, self._values = timestamps, values
+
+    def update_timestamp_range(self, min_timestamp, max_timestamp):
+        """
+        Updates the running timestamp extrema with the extrema of newly appended samples.
+        Timestamps do not have to arrive in order.
+        :param min_timestamp: Smallest new timestamp.
+        :param max_timestamp: Largest new timestamp.
+        """
+        if self.min_timestamp is None or min_timestamp < self.min_timestamp:
+            self.min_timestamp = min_timestamp
+        if self.max_timestamp is None or max_timestamp > self.max_timestamp:
+            self.max_timestamp = max_timestamp
@@ -28,6 +28,9 @@ class DecoderView(QWidget):
 
         self.view = view
 
+        self.sequence_generation = None
+        self.symbol_values_generation = None
+
         self.resize(225, self.height())
 
         self.layout = QVBoxLayout()
@@ -109,6 +112,8 @@ class DecoderView(QWidget):
         """
         parameter_values = decoder_info['parameter_values']
         self.has_parameters = True if parameter_values else False
+        self.sequence_generation = None
+        self.symbol_values_generation = None
         self.label_subtitle.setText(decoder_info['type'])
 
         if self.has_parameters:
@@ -303,9 +308,14 @@ class DecoderView(QWidget):
         Updates the decoder view based on new information from the decoder.
         :param decoded: New decoder information.
         """
-        symbol_values, sequence = decoded['symbol_values'], decoded['sequence']
-        self.update_symbol_values(symbol_values)
-        self.update_sequence(sequence)
+        symbol_values, sequence, generations = decoded['symbol_values'], decoded['sequence'], decoded['generations']
+        # The texts are only set again if they changed
+        if generations['symbol_values'] != self.symbol_values_generation:
+            self.update_symbol_values(symbol_values)
+            self.symbol_values_generation = generations['symbol_values']
+        if generations['sequence'] != self.sequence_generation:
+            self.update_sequence(sequence)
+            self.sequence_generation = generations['sequence']
 
     def update_sequence(self, sequence):
         """
@@ -0,0 +1,114 @@
+from PyQt5.QtCore import *
+from PyQt5.QtGui import *
+from PyQt5.QtWidgets import *
+import pyqtgraph as pg
+import numpy as np
+
+
+class MultiLineItem(pg.GraphicsObject):
+    """
+    Draws several datalines of a receiver (e.g. all its sensors) as a single item.
+    The datalines of the receiver stay in the plot without data, they provide the pens and the legend entries.
+    Lines with the same pen are drawn as one path that is broken between the lines, so usually only a few paths are
+    built. The paths are built when they are painted, so changed pens only regroup the lines.
+    """
+    def __init__(self, datalines):
+        """
+        Initializes the item.
+        :param datalines: Datalines (PlotDataItem) of the receiver, one per sensor.
+        """
+        super().__init__()
+        self.datalines = datalines
+        self.bounds = None
+        self.channels = []
+        self.num_points = 0
+        self.x = None
+        self.y = None
+        # Paths of the groups of lines that share a pen, keys are the line indices
+        self.paths = {}
+
+    def boundingRect(self):
+        if self.bounds is None:
+            return QRectF()
+        (x_min, x_max), (y_min, y_max) = self.bounds
+        return QRectF(x_min, y_min, x_max - x_min, y_max - y_min)
+
+    def build_path(self, lines):
+        """
+        Builds a single path of several lines.
+        :param lines: Indices of the lines.
+        :return: Path (QPainterPath).
+        """
+        num_points = self.num_points
+        if len(lines) == len(self.channels):
+            x, y = self.x, self.y
+        else:
+            indices = (np.reshape(lines, (-1, 1)) * num_points + np.arange(num_points)).ravel()
+            x, y = self.x[indices], self.y[indices]
+        # The last point of every line is not connected to the first point of the next line
+        connect = np.ones(len(x), dtype=np.int32)
+        connect[num_points - 1::num_points] = 0
+        return pg.arrayToQPath(x, y, connect=connect)
+
+    def clear(self):
+        """
+        Removes all lines.
+        """
+        self.prepareGeometryChange()
+        self.bounds = None
+        self.channels = []
+        self.num_points = 0
+        self.x = None
+        self.y = None
+        self.paths = {}
+        self.informViewBoundsChanged()
+        self.update()
+
+    def dataBounds(self, ax, frac=1.0, orthoRange=None):
+        # Used by the auto range of the view box
+        if self.bounds is None:
+            return None, None
+        return self.bounds[ax]
+
+    def paint(self, painter, *args):
+        groups = []
+        for line_index, channel in enumerate(self.channels):
+            pen = pg.mkPen(self.datalines[channel].opts['pen'])
+            for group_pen, lines in groups:
+                if group_pen == pen:
+                    lines.append(line_index)
+                    break
+            else:
+                groups.append((pen, [line_index]))
+
+        for pen, lines in groups:
+            key = tuple(lines)
+            if key not in self.paths:
+                self.paths[key] = self.build_path(lines)
+            painter.setPen(pen)
+            painter.drawPath(self.paths[key])
+
+    def setData(self, x, y, channels):
+        """
+        Sets the values of the lines.
+        :param x: X values (e.g. timestamps), dimensions (points) if shared by all lines or (points, lines).
+        :param y: Y values, dimensions (points, lines).
+        :param channels: Indices of the datalines (pens) of the lines.
+        """
+        num_points = len(y)
+        if num_points == 0:
+            self.clear()
+            return
+        # Lines one after another, so every line is a contiguous part
+        x = np.ascontiguousarray(np.broadcast_to(x.reshape(num_points, -1), y.shape).T, dtype=float).ravel()
+        y = np.ascontiguousarray(y.T, dtype=float).ravel()
+
+        self.prepareGeometryChange()
+        self.bounds = ((np.nanmin(x), np.nanmax(x)), (np.nanmin(y), np.nanmax(y)))
+        self.channels = list(channels)
+        self.num_points = num_points
+        self.x = x
+        self.y = y
+        self.paths = {}
+        self.informViewBoundsChanged()
+        self.update()
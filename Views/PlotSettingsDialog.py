@@ -70,6 +70,18 @@ class PlotSettingsDialog(QDialog):
         self.spinbox_step_size.valueChanged.connect(self.plot_view.set_step_size)
         self.layout_datalines.addRow(QLabel("Step size"), self.spinbox_step_size)
 
+        # Min/max decimation
+        self.checkbox_decimation = QCheckBox()
+        self.checkbox_decimation.setChecked(True)
+        self.checkbox_decimation.clicked.connect(self.plot_view.toggle_decimation)
+        self.layout_datalines.addRow(QLabel("Min/max decimation"), self.checkbox_decimation)
+
+        # Batched datalines
+        self.checkbox_batched_datalines = QCheckBox()
+        self.checkbox_batched_datalines.setChecked(False)
+        self.checkbox_batched_datalines.clicked.connect(self.plot_view.toggle_batched_datalines)
+        self.layout_datalines.addRow(QLabel("Batched receiver datalines"), self.checkbox_batched_datalines)
+
         self.checkboxes_datalines_widget = QWidget()
         self.checkboxes_datalines_layout = QVBoxLayout()
         self.checkboxes_datalines_widget.setLayout(self.checkboxes_datalines_layout)
@@ -417,6 +429,8 @@ class PlotSettingsDialog(QDialog):
         self.combobox_show_grid.setCurrentText(self.plot_view.settings_general['show_grid'])
         # Datalines
         self.spinbox_step_size.setValue(self.plot_view.settings_general['step_size'])
+        self.checkbox_decimation.setChecked(self.plot_view.settings_general['decimation'])
+        self.checkbox_batched_datalines.setChecked(self.plot_view.settings_general['batched_datalines'])
         self.spinbox_datalines_width.setValue(self.plot_view.settings_general['datalines_width'])
 
         # Additional datalines
@@ -484,6 +498,8 @@ class PlotSettingsDialog(QDialog):
         self.combobox_show_grid.setCurrentText(self.plot_view.settings_general['show_grid'])
         # Datalines
         self.spinbox_step_size.setValue(self.plot_view.settings_general['step_size'])
+        self.checkbox_decimation.setChecked(self.plot_view.settings_general['decimation'])
+        self.checkbox_batched_datalines.setChecked(self.plot_view.settings_general['batched_datalines'])
         self.spinbox_datalines_width.setValue(self.plot_view.settings_general['datalines_width'])
 
     def encoder_removed(self):
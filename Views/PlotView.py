@@ -151,6 +151,8 @@ class PlotView(QWidget):
             self.init_plot()
         else:
             self.settings_object.load_file_default_settings_decoder(decoder_info)
+        self.plot_widget.set_symbol_intervals_pen()
+        self.plot_widget.set_symbol_values_size()
 
         self.add_datalines_receiver(decoder_info['receivers'])
         self.add_additional_datalines(decoder_info['additional_datalines'])
@@ -349,6 +351,7 @@ class PlotView(QWidget):
     def set_step_size(self, step_size):
         """
         Sets the step size for values to be shown in the live plot.
+        With decimation, this is the width (in pixels) of a decimation bucket, otherwise every step_size-th value is shown.
         :param step_size: New step size.
         """
         self.settings_general['step_size'] = step_size
@@ -648,6 +651,21 @@ class PlotView(QWidget):
 
         self.plot_widget.update_legend()
 
+    def toggle_batched_datalines(self, state):
+        """
+        Enables/disables drawing all datalines of a receiver as a single item.
+        :param state: True -> Enable; False -> Disable.
+        """
+        self.settings_general['batched_datalines'] = state
+        self.plot_widget.clear_datalines_received()
+
+    def toggle_decimation(self, state):
+        """
+        Enables/disables the min/max decimation of the datalines.
+        :param state: True -> Enable; False -> Disable.
+        """
+        self.settings_general['decimation'] = state
+
     def toggle_symbol_intervals(self, state):
         """
         Shows/hides symbol intervals (vertical lines).
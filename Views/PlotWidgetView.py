@@ -7,8 +7,14 @@ from datetime import datetime
 import numpy as np
 import time
 
+from Utils import Decimation, MinMaxPyramid
 from Utils.Settings import SettingsStore
+from Views.MultiLineItem import MultiLineItem
+from Views.SymbolIntervalsItem import SymbolIntervalsItem
+from Views.SymbolValuesItem import SymbolValuesItem
 
+# Data outside of the visible X range that is still drawn, relative to the width of the X range
+VISIBLE_WINDOW_MARGIN = 0.05
 
 class PlotWidgetView(pg.PlotWidget):
     def __init__(self, plot_view):
@@ -43,11 +49,23 @@ class PlotWidgetView(pg.PlotWidget):
         self.legend.setParentItem(self.getPlotItem())
 
         self.additional_datalines = []
+        # Time span of a decimation bucket in the current view (see get_bucket_duration)
+        self.bucket_duration = None
         self.datalines_received = []
         self.datalines_sent = []
+        # Generation, step size, bucket duration and visible window each plot element was drawn with, unchanged elements
+        # are not redrawn
+        self.drawn = {}
         self.landmarks = []
-        self.text_items = []
-        self.vertical_lines = []
+        # One item per receiver that draws all its datalines if batched datalines are enabled
+        self.multilines_received = []
+        # All symbol intervals and symbol values are drawn by one item each, pen and font are set when a decoder is added
+        self.symbol_intervals_item = SymbolIntervalsItem(pg.mkPen())
+        self.addItem(self.symbol_intervals_item, ignoreBounds=True)
+        self.symbol_values_item = SymbolValuesItem(QFont('MS Shell Dlg 2'))
+        self.addItem(self.symbol_values_item, ignoreBounds=True)
+        # Time span of the datalines that is drawn (see get_visible_window)
+        self.visible_window = None
 
     def is_autoscroll_enabled(self):
         # return self.getViewBox().getState()['autoRange'][0] or self.p_right.getState()['autoRange'][0]
@@ -84,6 +102,9 @@ class PlotWidgetView(pg.PlotWidget):
                 if self.plot_view.settings_decoder['datalines_active'][receiver_index][sensor_index]:
                     self.legend.addItem(data_line, data_line.name())
             self.datalines_received.append(datalines_)
+            multiline = MultiLineItem(datalines_)
+            self.addItem(multiline)
+            self.multilines_received.append(multiline)
 
     def add_datalines_transmitter(self, transmitter_info):
         """
@@ -125,11 +146,12 @@ class PlotWidgetView(pg.PlotWidget):
 
     def clear_(self):
         """
-        Clears all data lines and landmark, removes all text items (symbol values) and vertical lines (symbol intervals).
+        Clears all data lines and landmark, symbol values and symbol intervals.
         """
         for i in range(len(self.datalines_received)):
             for j in range(len(self.datalines_received[i])):
                 self.datalines_received[i][j].clear()
+            self.multilines_received[i].clear()
         for i in range(len(self.datalines_sent)):
             for j in range(len(self.datalines_sent[i])):
                 self.datalines_sent[i][j].clear()
@@ -137,6 +159,7 @@ class PlotWidgetView(pg.PlotWidget):
             self.additional_datalines[i].clear()
         for i in range(len(self.landmarks)):
             self.landmarks[i].clear()
+        self.drawn = {}
         self.clear_symbol_intervals()
         self.clear_symbol_values()
         self.repaint_plot()
@@ -147,6 +170,7 @@ class PlotWidgetView(pg.PlotWidget):
         :param dataline_index: Index of the additional dataline to be cleared.
         """
         self.additional_datalines[dataline_index].clear()
+        self.drawn.pop(('additional_datalines', dataline_index), None)
         self.repaint_plot()
 
     def clear_dataline_receiver(self, receiver_index, sensor_index):
@@ -156,6 +180,22 @@ class PlotWidgetView(pg.PlotWidget):
         :param sensor_index: Sensor index of the dataline to be cleared.
         """
         self.datalines_received[receiver_index][sensor_index].clear()
+        self.drawn.pop(('received', receiver_index, sensor_index), None)
+        # The other datalines of the receiver are drawn again without it
+        self.multilines_received[receiver_index].clear()
+        self.drawn.pop(('received', receiver_index), None)
+        self.repaint_plot()
+
+    def clear_datalines_received(self):
+        """
+        Clears the datalines of all receivers, e.g. when switching between single and batched datalines.
+        """
+        for receiver_index in range(len(self.datalines_received)):
+            for sensor_index in range(len(self.datalines_received[receiver_index])):
+                self.datalines_received[receiver_index][sensor_index].clear()
+                self.drawn.pop(('received', receiver_index, sensor_index), None)
+            self.multilines_received[receiver_index].clear()
+            self.drawn.pop(('received', receiver_index), None)
         self.repaint_plot()
 
     def clear_dataline_transmitter(self, transmitter_index, channel_index):
@@ -165,6 +205,7 @@ class PlotWidgetView(pg.PlotWidget):
         :param channel_index: Channel index of the dataline to be cleared.
         """
         self.datalines_sent[transmitter_index][channel_index].clear()
+        self.drawn.pop(('transmitted', transmitter_index, channel_index), None)
         self.repaint_plot()
 
     def clear_landmark(self, landmark_index):
@@ -173,23 +214,20 @@ class PlotWidgetView(pg.PlotWidget):
         :param landmark_index: Index of the landmark to be cleared.
         """
         self.landmarks[landmark_index].clear()
+        self.drawn.pop(('landmarks', landmark_index), None)
         self.repaint_plot()
 
     def clear_symbol_intervals(self):
         """
         Clears all symbol intervals (vertical lines) from the plot.
         """
-        for i in self.vertical_lines:
-            self.removeItem(i)
-        self.vertical_lines = []
+        self.symbol_intervals_item.clear()
 
     def clear_symbol_values(self):
         """
         Clears all symbol values from the plot.
         """
-        for text_item in self.text_items:
-            self.removeItem(text_item)
-        self.text_items = []
+        self.symbol_values_item.clear()
 
     def decoder_started(self):
         """
@@ -198,6 +236,64 @@ class PlotWidgetView(pg.PlotWidget):
         self.enableAutoRange()
         self.auto_scroll_enabled = True
 
+    def clip(self, x, y):
+        """
+        Cuts a dataline to the visible window, including the first point on either side so the line reaches the edges.
+        :param x: Timestamps (ascending).
+        :param y: Values.
+        :return: Visible timestamps and values, the dataline itself if there is no visible window.
+        """
+        if self.visible_window is None:
+            return x, y
+        start, end = Decimation.get_slice(x, *self.visible_window)
+        return x[start:end], y[start:end]
+
+    def decimate(self, x, y):
+        """
+        Reduces the points of a dataline before it is plotted.
+        With decimation enabled, the minimum and maximum of every bucket (see get_bucket_duration) are kept, so narrow
+        peaks stay visible. Otherwise, only every step_size-th point is kept.
+        :param x: Timestamps.
+        :param y: Values, dimensions (time) or (time, lines).
+        :return: Reduced timestamps and values.
+        """
+        if self.bucket_duration is None or len(x) == 0:
+            step_size = self.plot_view.settings_general['step_size']
+            return x[::step_size], y[::step_size]
+        num_buckets = int((x[-1] - x[0]) / self.bucket_duration) + 1
+        return Decimation.min_max(x, y, num_buckets)
+
+    def decimate_received(self, timestamps, values, levels, offset, sensor_index):
+        """
+        Reduces the points of receiver datalines before they are plotted.
+        With decimation enabled, the coarsest level of the min/max pyramid of the receiver that still has one bucket per
+        decimation bucket is used, so long captures are not scanned on every frame. Only the samples after the last
+        bucket of that level are decimated from the received values.
+        :param timestamps: Timestamps.
+        :param values: Values of the receiver, dimensions (time, sensors).
+        :param levels: Levels of the min/max pyramid of the receiver (see MinMaxPyramid.snapshot).
+        :param offset: Absolute index of the first received value.
+        :param sensor_index: Index of the sensor, or list of sensor indices (the values get the dimensions (time, sensors)).
+        :return: Reduced timestamps and values.
+        """
+        duration = timestamps[-1] - timestamps[0]
+        if self.bucket_duration is None or duration <= 0:
+            x, y = self.clip(timestamps, values)
+            return self.decimate(x, y[:, sensor_index])
+        samples_per_bucket = self.bucket_duration * (len(timestamps) - 1) / duration
+        start_time, end_time = (None, None) if self.visible_window is None else self.visible_window
+        line = MinMaxPyramid.get_line(levels, samples_per_bucket, sensor_index, start_time, end_time)
+        if line is None:
+            x, y = self.clip(timestamps, values)
+            return self.decimate(x, y[:, sensor_index])
+        x, y, level = line
+        start = max(level['end'] - offset, 0)
+        x_tail, y_tail = self.clip(timestamps[start:], values[start:])
+        x_tail, y_tail = self.decimate(x_tail, y_tail[:, sensor_index])
+        if x_tail.ndim > x.ndim:
+            x = np.broadcast_to(x.reshape(-1, 1), y.shape)
+        return np.concatenate((x, x_tail)), np.concatenate((y, y_tail))
+
     def encoder_started_recording(self):
         """
         Do stuff when encoder recording is (re-)started.
@@ -220,6 +316,45 @@ class PlotWidgetView(pg.PlotWidget):
         self.e = exportDialog.ExportDialog(self.plotItem.scene())
         self.e.show(self.plotItem)
 
+    def get_bucket_duration(self):
+        """
+        Gets the time span of a decimation bucket, a bucket covers step_size pixels of the current view.
+        :return: Bucket duration in seconds, None if decimation is disabled.
+        """
+        if not self.plot_view.settings_general['decimation']:
+            return None
+        x_min, x_max = self.viewRange()[0]
+        width = self.plotItem.getViewBox().width()
+        if width <= 0 or x_max <= x_min:
+            return None
+        return self.plot_view.settings_general['step_size'] * (x_max - x_min) / width
+
+    def get_visible_window(self):
+        """
+        Gets the time span of the datalines that is drawn: the visible X range plus VISIBLE_WINDOW_MARGIN on either
+        side, so the rendering cost does not grow with the length of the capture.
+        :return: Start and end of the window, None if everything is drawn (the X range follows the data).
+        """
+        if not self.is_autoscroll_enabled() and self.getViewBox().autoRangeEnabled()[0]:
+            return None
+        x_min, x_max = self.viewRange()[0]
+        return Decimation.get_window(x_min, x_max, VISIBLE_WINDOW_MARGIN)
+
+    def is_outdated(self, key, generation):
+        """
+        Checks whether a plot element has to be redrawn, i.e., its data has a new generation or the step size, the
+        decimation or the visible window changed since it was drawn the last time. The element is then marked as drawn
+        with the current state.
+        :param key: Key of the plot element.
+        :param generation: Generation of the data of the element, None if unknown (always redrawn).
+        :return: True if the element has to be redrawn.
+        """
+        state = (generation, self.plot_view.settings_general['step_size'], self.bucket_duration, self.visible_window)
+        if generation is not None and self.drawn.get(key) == state:
+            return False
+        self.drawn[key] = state
+        return True
+
     def repaint_plot(self):
         """
         Repaints the plot.
@@ -241,6 +376,9 @@ class PlotWidgetView(pg.PlotWidget):
             for j in range(len(self.datalines_received[i])):
                 self.legend.removeItem(self.datalines_received[i][j])
         self.datalines_received = []
+        for multiline in self.multilines_received:
+            self.removeItem(multiline)
+        self.multilines_received = []
         for i in range(len(self.datalines_sent)):
             for j in range(len(self.datalines_sent[i])):
                 self.legend.removeItem(self.datalines_sent[i][j])
@@ -305,6 +443,7 @@ class PlotWidgetView(pg.PlotWidget):
 
         if is_decoder:
             self.datalines_received[object_index][channel_index].setPen(pen)
+            self.multilines_received[object_index].update()
         else:
             self.datalines_sent[object_index][channel_index].setPen(pen)
 
@@ -326,16 +465,14 @@ class PlotWidgetView(pg.PlotWidget):
         Updates the pen for the symbol intervals.
         """
         pen = pg.mkPen(color=self.plot_view.settings_decoder['symbol_intervals_color'], width=self.plot_view.settings_decoder['symbol_intervals_width'])
-        for vertical_line in self.vertical_lines:
-            vertical_line.setPen(pen)
+        self.symbol_intervals_item.setPen(pen)
 
     def set_symbol_values_size(self):
         """
-        Updates the size of the symbol value text items.
+        Updates the font size of the symbol values.
         """
         font = QFont('MS Shell Dlg 2', self.plot_view.settings_decoder['symbol_values_size'])
-        for text_item in self.text_items:
-            text_item.setFont(font)
+        self.symbol_values_item.setFont(font)
 
     def settings_updated(self):
         """
@@ -346,6 +483,7 @@ class PlotWidgetView(pg.PlotWidget):
         self.set_dataline_pens(False)
         self.set_landmark_pens()
         self.set_symbol_intervals_pen()
+        self.set_symbol_values_size()
         self.update_legend()
 
     def set_xrange_limits(self, maxXRange=None, xMin=None):
@@ -383,78 +521,103 @@ class PlotWidgetView(pg.PlotWidget):
             pos = max(int(round(SettingsStore.settings['SCROLLBAR_GRANULARITY'] * diff)), 0)
             self.plot_view.scrollbar.setSliderPosition(pos)
 
+        self.bucket_duration = self.get_bucket_duration()
+        self.visible_window = self.get_visible_window()
+
         # Encoded data
         if encoded is not None:
             transmitted = encoded['transmitted']
+            transmitted_generations = encoded['generations']['transmitted']
         else:
-            transmitted = None
+            transmitted, transmitted_generations = None, None
 
         # Decoded data
         if decoded is not None:
             received = decoded['received']
+            generations = decoded['generations']
         else:
-            received = None
-        self.update_datalines(received, transmitted)
+            received, generations = None, None
+        self.update_datalines(received, transmitted, None if generations is None else generations['received'], transmitted_generations)
 
         if decoded is not None:
             additional_datalines = decoded['additional_datalines']
             landmarks = decoded['landmarks']
             symbol_intervals = decoded['symbol_intervals']
             symbol_values = decoded['symbol_values']
-            self.update_additional_datalines(additional_datalines)
-            self.update_landmarks(landmarks)
+            self.update_additional_datalines(additional_datalines, generations['additional_datalines'])
+            self.update_landmarks(landmarks, generations['landmarks'])
             self.update_symbol_intervals(symbol_intervals)
-            self.update_symbol_values(received, symbol_intervals, symbol_values)
+            self.update_symbol_values(received, symbol_intervals, symbol_values, decoded['symbol_boundaries'], decoded['symbol_aggregates'])
 
-    def update_additional_datalines(self, additional_datalines):
+    def update_additional_datalines(self, additional_datalines, generations=None):
         """
         Updates the additional datalines with new values from the decoder.
         :param additional_datalines: List of additional datalines.
+        :param generations: Generations of the additional datalines, unchanged datalines are skipped.
         """
         for data_line_index in range(len(additional_datalines)):
             data_line = additional_datalines[data_line_index]
-            if data_line is not None and self.plot_view.settings_decoder['additional_datalines_active'][data_line_index]:
+            generation = None if generations is None else generations[data_line_index]
+            if data_line is not None and self.plot_view.settings_decoder['additional_datalines_active'][data_line_index] \
+                    and self.is_outdated(('additional_datalines', data_line_index), generation):
                 length = data_line['length']
                 if length > 0:
-                    timestamps = data_line['timestamps'][:length:self.plot_view.settings_general['step_size']]
-                    values = data_line['values'][:length:self.plot_view.settings_general['step_size']]
+                    timestamps, values = self.decimate(*self.clip(data_line['timestamps'][:length], data_line['values'][:length]))
                     self.additional_datalines[data_line_index].setData(timestamps, values)
 
-    def update_datalines(self, received, transmitted):
+    def update_datalines(self, received, transmitted, received_generations=None, transmitted_generations=None):
         """
         Updates the datalines with new values from the decoder and encoder.
         :param received: Measurement values from the receivers.
         :param transmitted: Set values from the transmitters.
+        :param received_generations: Generations of the receiver values, unchanged datalines are skipped.
+        :param transmitted_generations: Generations of the transmitter values, unchanged datalines are skipped.
         """
         if received is not None:
             lengths, timestamps, values = received['lengths'], received['timestamps'], received['values']
+            offsets, pyramids = received['offsets'], received['pyramids']
             for receiver_index in range(len(values)):
                 if lengths[receiver_index] > 0:
+                    generation = None if received_generations is None else received_generations[receiver_index]
+                    length = lengths[receiver_index]
+                    if self.plot_view.settings_general['batched_datalines']:
+                        # All active datalines of the receiver at once
+                        active = self.plot_view.settings_decoder['datalines_active'][receiver_index]
+                        sensor_indices = [sensor_index for sensor_index in range(len(active)) if active[sensor_index]]
+                        if sensor_indices and self.is_outdated(('received', receiver_index), None if generation is None else (generation, tuple(sensor_indices))):
+                            x, y = self.decimate_received(timestamps[receiver_index][:length], values[receiver_index][:length],
+                                                          pyramids[receiver_index], offsets[receiver_index], sensor_indices)
+                            self.multilines_received[receiver_index].setData(x, y, sensor_indices)
+                        continue
                     for sensor_index in range(values[receiver_index].shape[1]):
-                        if self.plot_view.settings_decoder['datalines_active'][receiver_index][sensor_index]:
-                            length = lengths[receiver_index]
-                            x = timestamps[receiver_index][:length:self.plot_view.settings_general['step_size']]
-                            y = values[receiver_index][:length:self.plot_view.settings_general['step_size'], sensor_index]
+                        if self.plot_view.settings_decoder['datalines_active'][receiver_index][sensor_index] \
+                                and self.is_outdated(('received', receiver_index, sensor_index), generation):
+                            x, y = self.decimate_received(timestamps[receiver_index][:length], values[receiver_index][:length],
+                                                          pyramids[receiver_index], offsets[receiver_index], sensor_index)
                             self.datalines_received[receiver_index][sensor_index].setData(x, y)
 
         if transmitted is not None:
             lengths, timestamps, values = transmitted['lengths'], transmitted['timestamps'], transmitted['values']
             for transmitter_index in range(len(values)):
                 if lengths[transmitter_index] > 0:
+                    generation = None if transmitted_generations is None else transmitted_generations[transmitter_index]
                     for channel_index in range(values[transmitter_index].shape[1]):
-                        if self.plot_view.settings_encoder['datalines_active'][transmitter_index][channel_index]:
+                        if self.plot_view.settings_encoder['datalines_active'][transmitter_index][channel_index] \
+                                and self.is_outdated(('transmitted', transmitter_index, channel_index), generation):
                             length = lengths[transmitter_index]
-                            x = timestamps[transmitter_index][:length:self.plot_view.settings_general['step_size']]
-                            y = values[transmitter_index][:length:self.plot_view.settings_general['step_size'], channel_index]
+                            x, y = self.decimate(*self.clip(timestamps[transmitter_index][:length], values[transmitter_index][:length, channel_index]))
                             self.datalines_sent[transmitter_index][channel_index].setData(x, y)
 
-    def update_landmarks(self, landmarks):
+    def update_landmarks(self, landmarks, generations=None):
         """
         Updates the landmarks with new values from the decoder.
         :param landmarks: Landmark coordinates.
+        :param generations: Generations of the landmarks, unchanged landmarks are skipped.
         """
         for landmark_index in range(len(landmarks)):
-            if landmarks[landmark_index] is not None and self.plot_view.settings_decoder['landmarks_active'][landmark_index]:
+            generation = None if generations is None else generations[landmark_index]
+            if landmarks[landmark_index] is not None and self.plot_view.settings_decoder['landmarks_active'][landmark_index] \
+                    and self.is_outdated(('landmarks', landmark_index), generation):
                 x, y = landmarks[landmark_index]['x'], landmarks[landmark_index]['y']
                 self.landmarks[landmark_index].setData(x, y)
 
@@ -486,47 +649,66 @@ class PlotWidgetView(pg.PlotWidget):
         :param symbol_intervals: Symbol interval positions.
         """
         if self.plot_view.settings_decoder['symbol_intervals']:
-            for timestamp in symbol_intervals[len(self.vertical_lines):]:
-                #print("1")
-                pen = pg.mkPen(color=self.plot_view.settings_decoder['symbol_intervals_color'],
-                               width=self.plot_view.settings_decoder['symbol_intervals_width'])
-                vertical = pg.InfiniteLine(pos=timestamp, angle=90, movable=False, pen=pen)
-                self.addItem(vertical)
-                self.vertical_lines.append(vertical)
+            # The symbol intervals were replaced (e.g. the decoder was cleared)
+            if len(symbol_intervals) < len(self.symbol_intervals_item):
+                self.symbol_intervals_item.clear()
+            if len(symbol_intervals) > len(self.symbol_intervals_item):
+                self.symbol_intervals_item.append(symbol_intervals[len(self.symbol_intervals_item):])
 
-    def update_symbol_values(self, vals, symbol_intervals, symbol_values):
+    def update_symbol_values(self, vals, symbol_intervals, symbol_values, symbol_boundaries=None, symbol_aggregates=None):
         """
         Updates the symbol values with new values from the decoder.
         :param vals: Measurement values from the receivers (relevant for the y-position of the symbol values).
         :param symbol_intervals: Symbol interval positions (relevant for the x-position of the symbol values).
         :param symbol_values: Symbol values.
+        :param symbol_boundaries: Absolute sample indices of the symbol intervals for every receiver (see IntervalIndex).
+        :param symbol_aggregates: Aggregates of the closed symbol intervals for every receiver (see IntervalIndex).
         """
         # This is necessary (for now), because symbol_values/symbol_intervals are not updated atomically
         symbol_values = symbol_values[:len(symbol_intervals) - 1]
 
         if self.plot_view.settings_decoder['symbol_values']:
-            for i in range(len(self.text_items), len(symbol_values)):
+            # The symbol values were replaced (e.g. the decoder was cleared)
+            if len(symbol_values) < len(self.symbol_values_item):
+                self.symbol_values_item.clear()
+            x_positions, y_positions, texts = [], [], []
+            for i in range(len(self.symbol_values_item), len(symbol_values)):
                 x_pos = 0.5 * (symbol_intervals[i] + symbol_intervals[i+1])
 
                 if self.plot_view.settings_decoder['symbol_values_position'] in ['Above', 'Below']:
                     timestamps, values = vals['timestamps'], vals['values']
+                    lengths, offsets = vals['lengths'], vals['offsets']
                     minimum_values, maximum_values = [], []
                     for receiver_index in range(len(timestamps)):
+                        if lengths[receiver_index] == 0:
+                            continue
+
+                        # The decoder already reduced closed intervals
+                        if symbol_aggregates is not None and len(symbol_aggregates[receiver_index]) > i:
+                            aggregates = symbol_aggregates[receiver_index][i]
+                            if aggregates['count'] > 0:
+                                maximum_values.append(np.max(aggregates['max']))
+                                minimum_values.append(np.min(aggregates['min']))
+                                continue
+
+                        if symbol_boundaries is not None and len(symbol_boundaries[receiver_index]) > i + 1:
+                            boundaries, offset = symbol_boundaries[receiver_index], offsets[receiver_index]
+                            start_index = max(boundaries[i] - offset, 0)
+                            end_index = max(boundaries[i+1] - offset, 0)
+                        else:
+                            start_index, end_index = np.searchsorted(timestamps[receiver_index], symbol_intervals[i:i+2], side='right')
+                        start_index = min(start_index, lengths[receiver_index] - 1)
 
-                        start_time = symbol_intervals[i]
-                        end_time = symbol_intervals[i+1]
-
-                        start_index = np.argmax(timestamps[receiver_index] > start_time)
-                        end_index = np.argmax(timestamps[receiver_index] > end_time)
-
-                        if start_index == end_index:
-                            max_tmp = values[receiver_index][start_index]
-                            min_tmp = values[receiver_index][start_index]
+                        if start_index >= end_index:
+                            max_tmp = np.max(values[receiver_index][start_index])
+                            min_tmp = np.min(values[receiver_index][start_index])
                         else:
                             max_tmp = np.max(values[receiver_index][start_index:end_index])
                             min_tmp = np.min(values[receiver_index][start_index:end_index])
                         maximum_values.append(max_tmp)
                         minimum_values.append(min_tmp)
+                    if not maximum_values:
+                        break
                     maximum_interval_value = max(maximum_values)
                     minimum_interval_value = min(minimum_values)
 
@@ -536,11 +718,11 @@ class PlotWidgetView(pg.PlotWidget):
                         y_pos = minimum_interval_value - (0.1 + 0.001 * self.plot_view.settings_decoder['symbol_values_size']) #* np.abs(minimum_interval_value)
                 else:
                     y_pos = self.plot_view.settings_decoder['symbol_values_fixed_height']
-                text = pg.TextItem(str(symbol_values[i]), color='k')
-                text.setPos(x_pos, y_pos)
-                text.setFont(QFont('MS Shell Dlg 2', self.plot_view.settings_decoder['symbol_values_size']))
-                self.addItem(text)
-                self.text_items.append(text)
+                x_positions.append(x_pos)
+                y_positions.append(y_pos)
+                texts.append(str(symbol_values[i]))
+            if texts:
+                self.symbol_values_item.append(x_positions, y_positions, texts)
 
     def update_views(self):
         """
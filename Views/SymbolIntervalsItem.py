@@ -0,0 +1,66 @@
+from PyQt5.QtCore import *
+from PyQt5.QtGui import *
+from PyQt5.QtWidgets import *
+import pyqtgraph as pg
+import numpy as np
+
+
+class SymbolIntervalsItem(pg.GraphicsObject):
+    """
+    Draws all symbol intervals as vertical lines over the whole height of the view.
+    The lines are a single path with connected pairs of points that is built from the visible intervals only, so
+    thousands of intervals do not add thousands of items to the scene.
+    """
+    def __init__(self, pen):
+        """
+        Initializes the item.
+        :param pen: Pen of the lines.
+        """
+        super().__init__()
+        self.pen = pen
+        self.timestamps = np.empty((0,))
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def append(self, timestamps):
+        """
+        Adds new symbol intervals.
+        :param timestamps: Timestamps of the new symbol intervals (ascending).
+        """
+        self.timestamps = np.concatenate((self.timestamps, timestamps))
+        self.update()
+
+    def boundingRect(self):
+        # The lines span the whole view
+        return self.viewRect() or QRectF()
+
+    def clear(self):
+        """
+        Removes all symbol intervals.
+        """
+        self.timestamps = np.empty((0,))
+        self.update()
+
+    def paint(self, painter, *args):
+        view_rect = self.viewRect()
+        if view_rect is None or len(self.timestamps) == 0:
+            return
+        start, end = np.searchsorted(self.timestamps, [view_rect.left(), view_rect.right()])
+        if start == end:
+            return
+        x = np.repeat(self.timestamps[start:end], 2)
+        y = np.tile([view_rect.top(), view_rect.bottom()], end - start)
+        painter.setPen(self.pen)
+        painter.drawPath(pg.arrayToQPath(x, y, connect='pairs'))
+
+    def setPen(self, pen):
+        """
+        Sets the pen of the lines.
+        :param pen: New pen.
+        """
+        self.pen = pen
+        self.update()
+
+    def viewRangeChanged(self):
+        self.prepareGeometryChange()
@@ -0,0 +1,118 @@
+from PyQt5.QtCore import *
+from PyQt5.QtGui import *
+from PyQt5.QtWidgets import *
+import pyqtgraph as pg
+import numpy as np
+
+# Minimum horizontal distance (in pixels) between two labels
+LABEL_SPACING = 5
+
+
+def select_labels(indices, x, widths):
+    """
+    Selects the labels that are painted: all labels, or every n-th label (by index) if they would overlap.
+    :param indices: Indices of the labels.
+    :param x: X positions of the labels in pixels (ascending).
+    :param widths: Widths of the labels in pixels.
+    :return: Mask of the painted labels.
+    """
+    visible = np.ones(len(indices), dtype=bool)
+    if len(indices) > 1:
+        spacing = np.median(np.diff(x))
+        if spacing > 0:
+            step = int(np.ceil((np.max(widths) + LABEL_SPACING) / spacing))
+            visible = np.asarray(indices) % step == 0
+    return visible
+
+
+class SymbolValuesItem(pg.GraphicsObject):
+    """
+    Draws all symbol values as text labels (top left corner at the position of the label) with a fixed font size.
+    Only the visible labels are painted. When the labels would overlap at the current zoom, only every n-th label is
+    painted, n is chosen from the typical distance between the labels and aligned to the label index, so the shown
+    labels do not change while scrolling.
+    """
+    def __init__(self, font):
+        """
+        Initializes the item.
+        :param font: Font of the labels.
+        """
+        super().__init__()
+        self.font = font
+        self.texts = []
+        self.widths = np.empty((0,))
+        self.x = np.empty((0,))
+        self.y = np.empty((0,))
+
+    def __len__(self):
+        return len(self.texts)
+
+    def append(self, x, y, texts):
+        """
+        Adds new labels.
+        :param x: X positions of the new labels (ascending).
+        :param y: Y positions of the new labels.
+        :param texts: Texts of the new labels.
+        """
+        self.x = np.concatenate((self.x, x))
+        self.y = np.concatenate((self.y, y))
+        self.texts.extend(texts)
+        metrics = QFontMetricsF(self.font)
+        self.widths = np.concatenate((self.widths, [metrics.horizontalAdvance(text) for text in texts]))
+        self.update()
+
+    def boundingRect(self):
+        # Labels are painted wherever they are visible
+        return self.viewRect() or QRectF()
+
+    def clear(self):
+        """
+        Removes all labels.
+        """
+        self.texts = []
+        self.widths = np.empty((0,))
+        self.x = np.empty((0,))
+        self.y = np.empty((0,))
+        self.update()
+
+    def paint(self, painter, *args):
+        view_rect = self.viewRect()
+        if view_rect is None or len(self.texts) == 0:
+            return
+        # Labels that start left of the view may still reach into it
+        start, end = np.searchsorted(self.x, [view_rect.left(), view_rect.right()])
+        start = max(start - 1, 0)
+        if start == end:
+            return
+
+        # Map to device coordinates (pixels), the view is neither rotated nor sheared
+        transform = painter.transform()
+        x = transform.m11() * self.x[start:end] + transform.m31()
+        y = transform.m22() * self.y[start:end] + transform.m32()
+
+        indices = np.arange(start, end)
+        visible = select_labels(indices, x, self.widths[start:end])
+        indices, x, y = indices[visible], x[visible], y[visible]
+
+        # drawText expects the baseline, the labels are positioned by their top
+        y += QFontMetricsF(self.font).ascent()
+        painter.save()
+        painter.resetTransform()
+        painter.setFont(self.font)
+        painter.setPen(QColor('black'))
+        for index, label_x, label_y in zip(indices, x, y):
+            painter.drawText(QPointF(label_x, label_y), self.texts[index])
+        painter.restore()
+
+    def setFont(self, font):
+        """
+        Sets the font of the labels.
+        :param font: New font.
+        """
+        self.font = font
+        metrics = QFontMetricsF(font)
+        self.widths = np.array([metrics.horizontalAdvance(text) for text in self.texts], dtype=float)
+        self.update()
+
+    def viewRangeChanged(self):
+        self.prepareGeometryChange()
@@ -8,7 +8,9 @@ class TableView(QTableWidget):
     def __init__(self, column_names):
         super().__init__()
 
+        self.generation = None
         self.old_length = 0
+        self.old_offset = 0
         self.num_columns = len(column_names) + 1
 
         # Row count
@@ -23,10 +25,29 @@ class TableView(QTableWidget):
         self.horizontalHeader().setStretchLastSection(True)
         self.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
 
-    def update_table(self, length, timestamps, values):
+    def clear_table(self):
+        self.setRowCount(0)
+        self.generation = None
+        self.old_length = 0
+        self.old_offset = 0
+
+    def update_table(self, length, timestamps, values, offset=0):
+        """
+        Shows the values that are currently retained by the decoder, only rows for new values are created.
+        :param length: Number of retained values.
+        :param timestamps: Timestamps of the retained values.
+        :param values: Retained values.
+        :param offset: Absolute index of the first retained value, rows of evicted values are removed.
+        """
+        evicted = min(offset - self.old_offset, self.rowCount())
+        if evicted > 0:
+            self.model().removeRows(0, evicted)
+        start = max(self.old_offset + self.old_length - offset, 0)
+
         self.setRowCount(length)
-        for i in range(self.old_length, length):
+        for i in range(start, length):
             self.setItem(i, 0, QTableWidgetItem(str(datetime.fromtimestamp(timestamps[i]))))
             for sensor_index in range(0, values.shape[1]):
                 self.setItem(i, sensor_index+1, QTableWidgetItem(str(values[i, sensor_index])))
-        self.old_length = length
\ No newline at end of file
+        self.old_length = length
+        self.old_offset = offset
\ No newline at end of file
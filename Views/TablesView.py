@@ -42,7 +42,7 @@ class TablesView(QWidget):
         Clears tables.
         """
         for table in self.tables:
-            table.setRowCount(0)
+            table.clear_table()
 
     def decoder_removed(self):
         """
@@ -58,7 +58,10 @@ class TablesView(QWidget):
         :param decoded: Decoder value updates.
         """
         received = decoded['received']
-        lengths, timestamps, values = received['lengths'], received['timestamps'], received['values']
+        lengths, offsets, timestamps, values = received['lengths'], received['offsets'], received['timestamps'], received['values']
+        generations = decoded['generations']['received']
         for i in range(len(timestamps)):
-            if timestamps[i] is not None:
-                self.tables[i].update_table(lengths[i], timestamps[i], values[i])
\ No newline at end of file
+            # Tables of receivers without new values are skipped
+            if timestamps[i] is not None and generations[i] != self.tables[i].generation:
+                self.tables[i].update_table(lengths[i], timestamps[i], values[i], offsets[i])
+                self.tables[i].generation = generations[i]
\ No newline at end of file